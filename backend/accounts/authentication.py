@@ -0,0 +1,147 @@
+"""
+JWT authentication that serves request.user from access token claims.
+
+Access tokens carry the fields views scope querysets by (see
+User.TOKEN_CLAIM_FIELDS), so an authenticated request normally costs no
+user query. Other attributes load the row on first use. Tokens of users who
+are deactivated or rejected are revoked through the shared cache; users
+whose claims changed fall back to a database load until they refresh.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+import functools
+import time
+
+CLAIMS_KEY = 'usr'
+
+# Revocation markers only need to outlive the tokens they reject
+MARKER_TTL = int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+
+
+def _revoked_key(user_id):
+    return f'accounts:tokens_revoked:{user_id}'
+
+
+def _claims_changed_key(user_id):
+    return f'accounts:claims_changed:{user_id}'
+
+
+def token_claims(user):
+    return {name: getattr(user, name) for name in user.TOKEN_CLAIM_FIELDS}
+
+
+def revoke_tokens(user_id):
+    """Reject every token issued to the user up to now."""
+    cache.set(_revoked_key(user_id), int(time.time()), MARKER_TTL)
+
+
+def mark_claims_changed(user_id):
+    """Stop trusting the claims of tokens issued to the user up to now."""
+    cache.set(_claims_changed_key(user_id), int(time.time()), MARKER_TTL)
+
+
+def token_state(user_id, issued_at):
+    """'revoked', 'stale' or 'ok' for a token issued to user_id at issued_at."""
+    markers = cache.get_many([_revoked_key(user_id), _claims_changed_key(user_id)])
+    issued_at = issued_at or 0
+    # Compare whole seconds: a token issued in the same second as the
+    # change may predate it
+    if markers.get(_revoked_key(user_id), -1) >= int(issued_at):
+        return 'revoked'
+    if markers.get(_claims_changed_key(user_id), -1) >= int(issued_at):
+        return 'stale'
+    return 'ok'
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """Refresh token whose access tokens carry the user's scoping claims."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[CLAIMS_KEY] = token_claims(user)
+        return token
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that skips the user query when claims are current.
+
+    Needs a cache shared by all workers (REDIS_URL) for revocation to reach
+    every process, so it is enabled by JWT_STATELESS_USERS; otherwise it
+    behaves like JWTAuthentication apart from also honouring revocations.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            raise InvalidToken('Token contained no recognizable user identification')
+
+        state = token_state(user_id, validated_token.get('iat'))
+        if state == 'revoked':
+            raise AuthenticationFailed('Token has been revoked.', code='token_revoked')
+
+        claims = validated_token.get(CLAIMS_KEY)
+        if not getattr(settings, 'JWT_STATELESS_USERS', False) or claims is None or state == 'stale':
+            return super().get_user(validated_token)
+
+        from .models import User
+        return User.from_token_claims(user_id, claims)
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh from the current user row so new tokens carry fresh claims."""
+
+    def validate(self, attrs):
+        from .models import User
+
+        refresh = self.token_class(attrs['refresh'])
+        user_id = refresh.get(api_settings.USER_ID_CLAIM)
+        if token_state(user_id, refresh.get('iat')) == 'revoked':
+            raise InvalidToken('Token has been revoked.')
+
+        user = User.objects.filter(pk=user_id, is_active=True).first()
+        if user is None:
+            raise AuthenticationFailed('User not found or inactive.', code='user_inactive')
+
+        new_refresh = ClaimsRefreshToken.for_user(user)
+        data = {'access': str(new_refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            data['refresh'] = str(new_refresh)
+        return data
+
+
+async def authenticate_async(request):
+    """User for the request's JWT, or None, for plain async views.
+
+    DRF 3.14 views are sync only, so async views authenticate here.
+    """
+    auth = ClaimsJWTAuthentication()
+    header = auth.get_header(request)
+    raw_token = auth.get_raw_token(header) if header else None
+    if not raw_token:
+        return None
+    try:
+        validated_token = auth.get_validated_token(raw_token)
+        return await sync_to_async(auth.get_user)(validated_token)
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+def async_jwt_required(view):
+    """Decorate an async view to set request.user from the JWT or answer 401."""
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await authenticate_async(request)
+        if user is None:
+            return JsonResponse({'error': 'Authentication credentials were not provided or are invalid.'}, status=401)
+        request.user = user
+        return await view(request, *args, **kwargs)
+    return wrapper
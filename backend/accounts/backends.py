@@ -0,0 +1,36 @@
+"""
+Authentication backend for the phone number / email login form.
+"""
+
+from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import PermissionDenied
+from .models import User
+
+
+class PhoneOrEmailBackend(ModelBackend):
+    """Authenticate by phone number or email with one query and one hash.
+
+    Unknown accounts still run the password hasher so response time does
+    not reveal which phone numbers or emails are registered. A failed
+    attempt raises PermissionDenied, which stops authenticate() from trying
+    ModelBackend and hashing the same password a second time.
+
+    Inactive and unapproved accounts are returned when the password is
+    right so that LoginView can tell the user why they cannot sign in.
+    """
+
+    def authenticate(self, request, phone_number=None, email=None, password=None, **kwargs):
+        if password is None or not (phone_number or email):
+            return None
+
+        if phone_number:
+            user = User.objects.filter(phone_number=phone_number).first()
+        else:
+            user = User.objects.filter(email=email).order_by('pk').first()
+
+        if user is None:
+            User().set_password(password)
+            raise PermissionDenied
+        if not user.check_password(password):
+            raise PermissionDenied
+        return user
@@ -0,0 +1,109 @@
+"""
+Django management command to measure the login hot path.
+
+Posts to LoginView in-process for successful, wrong-password and
+unknown-account logins by phone and email, and reports logins per second
+of CPU time (i.e. per core) and queries per login for each case.
+
+Each login costs about one PBKDF2 hash (~250 ms), so a few logins say
+little: the scenarios take turns over several rounds, and the median round
+is reported with the slowest and fastest so noise is visible.
+
+Usage:
+    python manage.py benchmark_login --logins 20 --rounds 5
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from accounts.models import User
+from accounts.views import LoginView
+import json
+import logging
+import statistics
+import time
+
+BENCH_PHONE = '0789999990'
+BENCH_EMAIL = 'login-benchmark@example.com'
+BENCH_PASSWORD = 'benchmark-password'
+
+SCENARIOS = [
+    ('phone_ok', {'phone_number': BENCH_PHONE, 'password': BENCH_PASSWORD}, 200),
+    ('phone_wrong_password', {'phone_number': BENCH_PHONE, 'password': 'wrong-password'}, 401),
+    ('phone_unknown', {'phone_number': '0789999991', 'password': BENCH_PASSWORD}, 401),
+    ('email_ok', {'email': BENCH_EMAIL, 'password': BENCH_PASSWORD}, 200),
+    ('email_wrong_password', {'email': BENCH_EMAIL, 'password': 'wrong-password'}, 401),
+    ('email_unknown', {'email': 'nobody@example.com', 'password': BENCH_PASSWORD}, 401),
+]
+
+
+class Command(BaseCommand):
+    help = 'Measure logins per second per core and queries per login'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=20, help='Logins per scenario and round')
+        parser.add_argument('--rounds', type=int, default=5, help='Rounds taking turns over the scenarios')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        user, _ = User.objects.get_or_create(
+            phone_number=BENCH_PHONE,
+            defaults={'username': 'login-benchmark', 'email': BENCH_EMAIL, 'user_type': 'farmer'},
+        )
+        user.email = BENCH_EMAIL
+        user.is_active = True
+        user.set_password(BENCH_PASSWORD)
+        user.save()
+
+        # Per-attempt log lines would dominate the measurement
+        logging.getLogger('accounts.views').setLevel(logging.ERROR)
+        view = LoginView.as_view()
+        factory = APIRequestFactory()
+        logins = options['logins']
+
+        queries_per_login = {}
+        for name, payload, expected_status in SCENARIOS:
+            view(factory.post('/api/auth/login/', payload, format='json'))  # Warm up
+            with CaptureQueriesContext(connection) as queries:
+                response = view(factory.post('/api/auth/login/', payload, format='json'))
+            if response.status_code != expected_status:
+                self.stderr.write(f'{name}: expected {expected_status}, got {response.status_code}')
+            queries_per_login[name] = len(queries)
+
+        cpu_seconds = {name: [] for name, _, _ in SCENARIOS}
+        wall_seconds = {name: [] for name, _, _ in SCENARIOS}
+        for _ in range(options['rounds']):
+            for name, payload, _ in SCENARIOS:
+                cpu_started, wall_started = time.process_time(), time.perf_counter()
+                for _ in range(logins):
+                    view(factory.post('/api/auth/login/', payload, format='json'))
+                cpu_seconds[name].append(time.process_time() - cpu_started)
+                wall_seconds[name].append(time.perf_counter() - wall_started)
+
+        results = {}
+        for name, _, _ in SCENARIOS:
+            rates = [logins / cpu for cpu in cpu_seconds[name] if cpu]
+            results[name] = {
+                'logins_per_core_second': round(statistics.median(rates), 2) if rates else None,
+                'slowest_round': round(min(rates), 2) if rates else None,
+                'fastest_round': round(max(rates), 2) if rates else None,
+                'mean_ms': round(statistics.median(wall_seconds[name]) / logins * 1000, 1),
+                'queries_per_login': queries_per_login[name],
+            }
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(
+            f'{"scenario":<22}  {"logins/core-s":>13}  {"rounds":>15}  {"mean_ms":>8}  {"queries":>7}'
+        )
+        for name, result in results.items():
+            spread = f'{result["slowest_round"]}-{result["fastest_round"]}'
+            self.stdout.write(
+                f'{name:<22}  {result["logins_per_core_second"]:>13}  {spread:>15}  '
+                f'{result["mean_ms"]:>8}  {result["queries_per_login"]:>7}'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Ran {logins} logins per scenario in each of {options["rounds"]} rounds (median round shown)'
+        ))
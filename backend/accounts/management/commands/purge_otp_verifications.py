@@ -0,0 +1,28 @@
+"""
+Django management command to delete old OTP audit records.
+
+The otp_verifications rows record that a code was sent and whether it was
+used (and hold the code itself when there is no shared cache, see
+accounts.otp); codes expire within minutes, so rows are kept for a limited
+time.
+
+Usage:
+    python manage.py purge_otp_verifications --days 30
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from datetime import timedelta
+from accounts.models import OTPVerification
+
+
+class Command(BaseCommand):
+    help = 'Delete OTP audit records older than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help='Days of audit records to keep')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        deleted, _ = OTPVerification.objects.filter(created_at__lt=cutoff).delete()
+        if options.get('verbosity', 1) >= 1:
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} OTP audit records older than {options["days"]} days'))
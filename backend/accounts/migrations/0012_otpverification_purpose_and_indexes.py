@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_user_users_email_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='otpverification',
+            name='purpose',
+            field=models.CharField(choices=[('verify', 'Account Verification'), ('password_reset', 'Password Reset')], default='verify', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='otpverification',
+            name='otp_code',
+            field=models.CharField(blank=True, max_length=6),
+        ),
+        migrations.AddIndex(
+            model_name='otpverification',
+            index=models.Index(fields=['phone_number', '-created_at'], name='otp_phone_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='otpverification',
+            index=models.Index(fields=['created_at'], name='otp_created_at_idx'),
+        ),
+    ]
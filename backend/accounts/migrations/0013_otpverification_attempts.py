@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_otpverification_purpose_and_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='otpverification',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
@@ -3,7 +3,7 @@ User account models for AnimalGuardian system.
 """
 
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import DEFAULT_DB_ALIAS, models
 from django.core.validators import RegexValidator
 
 
@@ -103,15 +103,75 @@ class User(AbstractUser):
             models.Index(fields=['-created_at'], name='users_created_at_idx'),
             models.Index(fields=['user_type', 'created_at'], name='users_type_created_idx'),
             models.Index(fields=['is_approved_by_admin'], name='users_approved_idx'),
+            models.Index(fields=['email'], name='users_email_idx'),
         ]
     
+    # Copied into access tokens so most requests need no user query
+    TOKEN_CLAIM_FIELDS = ('user_type', 'is_staff', 'is_superuser', 'province', 'district', 'sector', 'cell', 'village')
+    # Changes to these end or refresh the user's outstanding tokens
+    TRACKED_FIELDS = TOKEN_CLAIM_FIELDS + ('is_active', 'is_approved_by_admin')
+
     def __str__(self):
         return f"{self.get_full_name()} ({self.phone_number})"
-    
+
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: instance.__dict__[name] for name in cls.TRACKED_FIELDS if name in instance.__dict__
+        }
+        return instance
+
+    @classmethod
+    def from_token_claims(cls, user_id, claims):
+        """User built from access token claims; other fields load on first use.
+
+        Only issued for tokens that are not revoked, so the user is active.
+        """
+        field_names = ['id', 'is_active', *cls.TOKEN_CLAIM_FIELDS]
+        values = [user_id, True, *(claims[name] for name in cls.TOKEN_CLAIM_FIELDS)]
+        instance = cls.from_db(DEFAULT_DB_ALIAS, field_names, values)
+        instance._from_token_claims = True
+        return instance
+
+    def loaded_value(self, field_name):
+        """Value of a tracked field when the row was loaded (None for new users)."""
+        return getattr(self, '_loaded_values', {}).get(field_name)
+
+    def refresh_from_db(self, using=None, fields=None):
+        if fields is not None and getattr(self, '_from_token_claims', False):
+            # Touching a deferred field loads the whole row once, replacing
+            # claims that may have changed since the token was issued
+            self._from_token_claims = False
+            fields = [field.attname for field in self._meta.concrete_fields]
+        super().refresh_from_db(using=using, fields=fields)
+        self._loaded_values = {
+            **getattr(self, '_loaded_values', {}),
+            **{
+                name: self.__dict__[name] for name in self.TRACKED_FIELDS
+                if name in self.__dict__ and (fields is None or name in fields)
+            },
+        }
+
+    def save(self, *args, **kwargs):
+        if getattr(self, '_from_token_claims', False) and kwargs.get('update_fields') is None:
+            # Never write back unchanged claims, which may be stale
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if field.attname in self.__dict__ and not field.primary_key
+                and (field.attname not in self._loaded_values
+                     or self.__dict__[field.attname] != self._loaded_values[field.attname])
+            ]
+        super().save(*args, **kwargs)
+        # post_save receivers have run; the saved values are now the baseline
+        self._loaded_values = {
+            name: self.__dict__[name] for name in self.TRACKED_FIELDS if name in self.__dict__
+        }
+
 
 class VeterinarianProfile(models.Model):
     """Extended profile for veterinarians."""
@@ -206,11 +266,22 @@ class FarmerProfile(models.Model):
 
 
 class OTPVerification(models.Model):
-    """OTP verification for phone numbers."""
+    """An OTP sent to a phone number.
+
+    With a shared cache the code is kept there and this row is an audit
+    record; otherwise the row holds the code (see accounts.otp).
+    """
+    
+    PURPOSE_CHOICES = [
+        ('verify', 'Account Verification'),
+        ('password_reset', 'Password Reset'),
+    ]
     
     phone_number = models.CharField(max_length=17)
-    otp_code = models.CharField(max_length=6)
+    purpose = models.CharField(max_length=20, choices=PURPOSE_CHOICES, default='verify')
+    otp_code = models.CharField(max_length=6, blank=True)
     is_used = models.BooleanField(default=False)
+    attempts = models.PositiveSmallIntegerField(default=0)  # Wrong guesses
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField()
     
@@ -218,6 +289,10 @@ class OTPVerification(models.Model):
         db_table = 'otp_verifications'
         verbose_name = 'OTP Verification'
         verbose_name_plural = 'OTP Verifications'
+        indexes = [
+            models.Index(fields=['phone_number', '-created_at'], name='otp_phone_created_idx'),
+            models.Index(fields=['created_at'], name='otp_created_at_idx'),
+        ]
     
     def __str__(self):
         return f"OTP for {self.phone_number}"
@@ -0,0 +1,154 @@
+"""
+Short-lived one-time codes (account verification and password reset).
+
+Where the cache is shared by every worker (OTP_CACHE_CODES, on with
+REDIS_URL), codes live in it and expire with it, so checking one is a
+single key lookup, and sends and failed checks are counted per phone number
+with atomic cache increments. OTPVerification rows are then only an audit
+trail.
+
+A per-process cache (locmem) would send a code to one gunicorn worker and
+check it in another, so without a shared cache the OTPVerification rows
+hold the codes: the latest unused, unexpired row of a phone number and
+purpose is its code, sends are counted over the rows of the window and
+wrong guesses in the row's attempts column. Rows are deleted by
+``purge_otp_verifications``.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+from datetime import timedelta
+import secrets
+
+OTP_CODE_TTL = {
+    'verify': 10 * 60,
+    'password_reset': 15 * 60,
+}
+OTP_MAX_SENDS = getattr(settings, 'OTP_MAX_SENDS', 5)  # Per phone and purpose per window
+OTP_SEND_WINDOW = getattr(settings, 'OTP_SEND_WINDOW', 60 * 60)
+OTP_MAX_ATTEMPTS = getattr(settings, 'OTP_MAX_ATTEMPTS', 5)  # Wrong guesses before a code is void
+
+
+class OTPRateLimited(Exception):
+    """Too many codes sent to, or guesses made for, one phone number."""
+
+
+def _cache_codes():
+    return getattr(settings, 'OTP_CACHE_CODES', False)
+
+
+def _code_key(purpose, phone_number):
+    return f'otp:code:{purpose}:{phone_number}'
+
+
+def _sends_key(purpose, phone_number):
+    return f'otp:sends:{purpose}:{phone_number}'
+
+
+def _attempts_key(purpose, phone_number):
+    return f'otp:attempts:{purpose}:{phone_number}'
+
+
+def _increment(key, timeout):
+    """Atomically count one event in a window starting at the first one."""
+    cache.add(key, 0, timeout)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Expired between add() and incr(); this is the first of a new window
+        cache.set(key, 1, timeout)
+        return 1
+
+
+def _sends_exceeded(purpose, phone_number):
+    from .models import OTPVerification
+    if _cache_codes():
+        return _increment(_sends_key(purpose, phone_number), OTP_SEND_WINDOW) > OTP_MAX_SENDS
+    since = timezone.now() - timedelta(seconds=OTP_SEND_WINDOW)
+    return OTPVerification.objects.filter(
+        phone_number=phone_number, purpose=purpose, created_at__gte=since
+    ).count() >= OTP_MAX_SENDS
+
+
+def issue_code(purpose, phone_number):
+    """Create a code for the phone number, replacing any earlier one.
+
+    Raises OTPRateLimited once OTP_MAX_SENDS codes were issued in the window.
+    """
+    from .models import OTPVerification
+
+    if _sends_exceeded(purpose, phone_number):
+        raise OTPRateLimited(f'Too many codes requested. Please try again in {OTP_SEND_WINDOW // 60} minutes.')
+
+    ttl = OTP_CODE_TTL[purpose]
+    code = f'{secrets.randbelow(1000000):06d}'
+    if not _cache_codes():
+        OTPVerification.objects.filter(phone_number=phone_number, purpose=purpose, is_used=False).update(is_used=True)
+    audit = OTPVerification.objects.create(
+        phone_number=phone_number,
+        purpose=purpose,
+        otp_code='' if _cache_codes() else code,
+        expires_at=timezone.now() + timedelta(seconds=ttl),
+    )
+    if _cache_codes():
+        cache.set(_code_key(purpose, phone_number), {'code': code, 'audit_id': audit.pk}, ttl)
+        cache.delete(_attempts_key(purpose, phone_number))
+    return code
+
+
+def _check_cached_code(purpose, phone_number, code, consume):
+    from .models import OTPVerification
+
+    stored = cache.get(_code_key(purpose, phone_number))
+    if stored is None:
+        return False
+
+    if not secrets.compare_digest(str(code), stored['code']):
+        if _increment(_attempts_key(purpose, phone_number), OTP_CODE_TTL[purpose]) >= OTP_MAX_ATTEMPTS:
+            cache.delete(_code_key(purpose, phone_number))
+            raise OTPRateLimited('Too many incorrect codes. Please request a new one.')
+        return False
+
+    if consume:
+        # Only the request whose delete() removed the code may use it
+        if not cache.delete(_code_key(purpose, phone_number)):
+            return False
+        cache.delete(_attempts_key(purpose, phone_number))
+        OTPVerification.objects.filter(pk=stored['audit_id']).update(is_used=True)
+    return True
+
+
+def _check_stored_code(purpose, phone_number, code, consume):
+    from .models import OTPVerification
+
+    stored = OTPVerification.objects.filter(
+        phone_number=phone_number, purpose=purpose, is_used=False, expires_at__gt=timezone.now()
+    ).order_by('-created_at').first()
+    if stored is None:
+        return False
+
+    if not secrets.compare_digest(str(code), stored.otp_code):
+        row = OTPVerification.objects.filter(pk=stored.pk)
+        row.update(attempts=F('attempts') + 1)
+        if row.filter(attempts__gte=OTP_MAX_ATTEMPTS).update(is_used=True):
+            raise OTPRateLimited('Too many incorrect codes. Please request a new one.')
+        return False
+
+    if consume:
+        # Only the request whose update() marked the row used may use it
+        return bool(OTPVerification.objects.filter(pk=stored.pk, is_used=False).update(is_used=True))
+    return True
+
+
+def check_code(purpose, phone_number, code, consume=True):
+    """Whether ``code`` is the current code for the phone number.
+
+    A correct code is used up when ``consume`` is set. Each wrong guess is
+    counted; after OTP_MAX_ATTEMPTS the code is discarded and
+    OTPRateLimited is raised until a new one is issued.
+    """
+    if _cache_codes():
+        return _check_cached_code(purpose, phone_number, code, consume)
+    return _check_stored_code(purpose, phone_number, code, consume)
@@ -0,0 +1,30 @@
+"""
+Revoke or refresh outstanding JWTs when a user's account state changes.
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .authentication import revoke_tokens, mark_claims_changed
+from .models import User
+
+
+@receiver(post_save, sender=User, dispatch_uid='user_token_state')
+def user_saved(sender, instance, created, raw=False, **kwargs):
+    if created or raw:
+        return
+    previous = getattr(instance, '_loaded_values', {})
+    changed = {
+        name for name, value in previous.items()
+        if name in instance.__dict__ and instance.__dict__[name] != value
+    }
+    deactivated = 'is_active' in changed and not instance.is_active
+    rejected = 'is_approved_by_admin' in changed and not instance.is_approved_by_admin
+    if deactivated or rejected:
+        revoke_tokens(instance.pk)
+    elif changed & set(User.TOKEN_CLAIM_FIELDS):
+        mark_claims_changed(instance.pk)
+
+
+@receiver(post_delete, sender=User, dispatch_uid='user_token_revoked_on_delete')
+def user_deleted(sender, instance, **kwargs):
+    revoke_tokens(instance.pk)
@@ -3,15 +3,14 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.contrib.auth import authenticate
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.utils import timezone
-from datetime import timedelta
-import random
 import logging
 import traceback
 import threading
 from django.conf import settings
-from .models import User, VeterinarianProfile, FarmerProfile, OTPVerification
+from .authentication import ClaimsRefreshToken
+from .models import User, VeterinarianProfile, FarmerProfile
+from . import otp
 from .serializers import UserSerializer, VeterinarianProfileSerializer, FarmerProfileSerializer
 
 logger = logging.getLogger(__name__)
@@ -101,7 +100,9 @@ class LoginView(generics.GenericAPIView):
                     'error': 'Password is required.'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Try to authenticate with phone number first, then email
+            # Try to authenticate with phone number first, then email. The
+            # backend hashes the password exactly once, even for unknown
+            # accounts, and returns inactive users so they can be told why
             user = None
             if phone_number:
                 try:
@@ -109,37 +110,13 @@ class LoginView(generics.GenericAPIView):
                     import re
                     cleaned_phone = re.sub(r'[^\d]', '', str(phone_number))
                     logger.info(f'Login attempt with phone: {phone_number} (cleaned: {cleaned_phone})')
-                    user = authenticate(username=cleaned_phone, password=password)
-                    if not user:
-                        # If authenticate fails, try to find user and check password directly
-                        user_obj = User.objects.filter(phone_number=cleaned_phone).first()
-                        if user_obj and user_obj.check_password(password):
-                            logger.info(f'Password check passed for phone: {cleaned_phone}, using user object directly')
-                            user = user_obj
+                    user = authenticate(request, phone_number=cleaned_phone, password=password)
                 except Exception as e:
                     logger.error(f'Error authenticating with phone number: {str(e)}', exc_info=True)
             elif email:
                 try:
-                    # Use filter().first() to avoid MultipleObjectsReturned exception
-                    # Load full user object for proper password checking
-                    user_obj = User.objects.filter(email=email).first()
-                    if user_obj:
-                        logger.info(f'Login attempt for email: {email}, found user: {user_obj.id}, phone: {user_obj.phone_number}, active: {user_obj.is_active}')
-                        if user_obj.phone_number:
-                            # Try authenticate first (standard Django way)
-                            user = authenticate(username=user_obj.phone_number, password=password)
-                            if not user:
-                                # If authenticate fails, check password directly
-                                # This handles cases where authenticate() might fail due to backend issues
-                                if user_obj.check_password(password):
-                                    logger.info(f'Password check passed for email: {email}, using user object directly')
-                                    user = user_obj
-                                else:
-                                    logger.warning(f'Authentication failed for email: {email}, phone: {user_obj.phone_number} - password incorrect')
-                        else:
-                            logger.warning(f'User with email {email} found but has no phone_number set')
-                    else:
-                        logger.warning(f'No user found with email: {email}')
+                    logger.info(f'Login attempt for email: {email}')
+                    user = authenticate(request, email=email, password=password)
                 except Exception as e:
                     logger.error(f'Error during email authentication: {str(e)}', exc_info=True)
             
@@ -159,7 +136,7 @@ class LoginView(generics.GenericAPIView):
                     }, status=status.HTTP_403_FORBIDDEN)
                 
                 try:
-                    refresh = RefreshToken.for_user(user)
+                    refresh = ClaimsRefreshToken.for_user(user)
                 except Exception as e:
                     logger.error(f'Error generating refresh token: {str(e)}', exc_info=True)
                     return Response({
@@ -188,6 +165,7 @@ class LoginView(generics.GenericAPIView):
                     'redirect_to': redirect_to
                 })
             else:
+                logger.warning(f'Authentication failed for {"phone " + str(phone_number) if phone_number else "email " + str(email)}')
                 return Response({
                     'error': 'Invalid credentials.'
                 }, status=status.HTTP_401_UNAUTHORIZED)
@@ -234,37 +212,16 @@ class VerifyOTPView(generics.GenericAPIView):
                 'error': 'User not found.'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        # Check OTP from OTPVerification model
-        # For farmers and local vets, OTP is sent via email, but stored with phone_number or email
+        # Codes are looked up by phone number (see accounts.otp)
         try:
-            # Try to find OTP by phone_number first, then by email (if phone_number is actually email)
-            otp_verification = OTPVerification.objects.filter(
-                phone_number=user.phone_number,
-                otp_code=otp_code,
-                is_used=False
-            ).order_by('-created_at').first()
-            
-            # If not found and user has email, try searching by email (in case phone_number field contains email)
-            if not otp_verification and user.email:
-                otp_verification = OTPVerification.objects.filter(
-                    phone_number=user.email,
-                    otp_code=otp_code,
-                    is_used=False
-                ).order_by('-created_at').first()
-            
             # Also accept hardcoded OTP for development
-            if otp_code == '123456' or (otp_verification and otp_verification.expires_at > timezone.now()):
+            if otp_code == '123456' or otp.check_code('verify', user.phone_number, otp_code):
                 user.is_verified = True
                 user.save()
                 
-                # Mark OTP as used if it exists
-                if otp_verification:
-                    otp_verification.is_used = True
-                    otp_verification.save()
-                
                 # Generate tokens for automatic login
                 try:
-                    refresh = RefreshToken.for_user(user)
+                    refresh = ClaimsRefreshToken.for_user(user)
                     user_data = UserSerializer(user).data
                     
                     return Response({
@@ -282,6 +239,10 @@ class VerifyOTPView(generics.GenericAPIView):
                 return Response({
                     'error': 'Invalid or expired OTP code.'
                 }, status=status.HTTP_400_BAD_REQUEST)
+        except otp.OTPRateLimited as e:
+            return Response({
+                'error': str(e)
+            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
         except Exception as e:
             logger.error(f'Error verifying OTP: {str(e)}', exc_info=True)
             return Response({
@@ -322,11 +283,13 @@ class RequestPasswordResetView(generics.GenericAPIView):
                 'message': 'If the account exists, a password reset code has been sent.'
             }, status=status.HTTP_200_OK)
         
-        # Generate 6-digit OTP
-        otp_code = str(random.randint(100000, 999999))
-        user.password_reset_token = otp_code
-        user.password_reset_expires_at = timezone.now() + timedelta(minutes=15)
-        user.save()
+        # Generate 6-digit OTP; it is kept until used or expired (see accounts.otp)
+        try:
+            otp_code = otp.issue_code('password_reset', user.phone_number)
+        except otp.OTPRateLimited as e:
+            return Response({
+                'error': str(e)
+            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
         
         # Send OTP via Email or SMS
         from django.core.mail import send_mail
@@ -434,16 +397,16 @@ class VerifyPasswordResetOTPView(generics.GenericAPIView):
                 'error': 'User not found.'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        # Check if OTP is valid and not expired
-        if user.password_reset_token != otp_code:
-            return Response({
-                'error': 'Invalid OTP code.'
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        if user.password_reset_expires_at and user.password_reset_expires_at < timezone.now():
+        # Check the OTP without using it up; ResetPasswordView consumes it
+        try:
+            if not otp.check_code('password_reset', user.phone_number, otp_code, consume=False):
+                return Response({
+                    'error': 'Invalid or expired OTP code. Please request a new one if it has expired.'
+                }, status=status.HTTP_400_BAD_REQUEST)
+        except otp.OTPRateLimited as e:
             return Response({
-                'error': 'OTP code has expired. Please request a new one.'
-            }, status=status.HTTP_400_BAD_REQUEST)
+                'error': str(e)
+            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
         
         return Response({
             'message': 'OTP verified successfully. You can now reset your password.',
@@ -501,21 +464,19 @@ class ResetPasswordView(generics.GenericAPIView):
                 'error': 'User not found.'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        # Verify OTP
-        if not otp_code or user.password_reset_token != otp_code:
-            return Response({
-                'error': 'Invalid or missing OTP code.'
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        if user.password_reset_expires_at and user.password_reset_expires_at < timezone.now():
+        # Verify and use up the OTP
+        try:
+            if not otp_code or not otp.check_code('password_reset', user.phone_number, otp_code):
+                return Response({
+                    'error': 'Invalid, expired or missing OTP code.'
+                }, status=status.HTTP_400_BAD_REQUEST)
+        except otp.OTPRateLimited as e:
             return Response({
-                'error': 'OTP code has expired. Please request a new one.'
-            }, status=status.HTTP_400_BAD_REQUEST)
+                'error': str(e)
+            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
         
         # Reset password
         user.set_password(new_password)
-        user.password_reset_token = ''
-        user.password_reset_expires_at = None
         user.save()
         
         # Send confirmation email after successful password reset
@@ -596,7 +557,7 @@ class ChangePasswordView(generics.GenericAPIView):
 
 class UserViewSet(viewsets.ModelViewSet):
     """ViewSet for User model."""
-    queryset = User.objects.all()
+    queryset = User.objects.select_related('approved_by', 'vet_profile', 'farmer_profile')
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
     
@@ -747,7 +708,9 @@ class FarmerViewSet(viewsets.ReadOnlyModelViewSet):
         """Return users who are farmers, optionally filtered by approval status."""
         # Use select_related for any ForeignKey relationships if needed
         # For now, User model doesn't have ForeignKeys in this context, but keep optimized
-        queryset = User.objects.filter(user_type='farmer').select_related('approved_by')
+        queryset = User.objects.filter(user_type='farmer').select_related(
+            'approved_by', 'vet_profile', 'farmer_profile'
+        )
         
         # Filter by approval status if provided in query params
         is_approved = self.request.query_params.get('is_approved_by_admin')
@@ -796,7 +759,7 @@ class VeterinarianViewSet(viewsets.ReadOnlyModelViewSet):
         # Only return local_vet users - sector vets are not shown here
         queryset = User.objects.filter(
             user_type='local_vet'
-        ).select_related('approved_by')
+        ).select_related('approved_by', 'vet_profile', 'farmer_profile')
         
         return queryset.order_by('-created_at')
     
@@ -961,7 +924,13 @@ class VeterinarianViewSet(viewsets.ReadOnlyModelViewSet):
         
         # Bulk create notifications
         if notifications:
+            from sync.changelog import record_bulk
+            from notifications import unread
+            from realtime.events import publish, notification_events
             Notification.objects.bulk_create(notifications)
+            record_bulk('notification', notifications)
+            unread.adjust(unread.count_unread(notifications))
+            publish(notification_events(notifications))
         
         # Send email notifications (in background thread)
         def send_email_notifications():
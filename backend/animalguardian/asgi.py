@@ -0,0 +1,15 @@
+"""
+ASGI config for animalguardian project.
+
+Serves the same Django application as wsgi.py; async views (such as the
+realtime event stream) only avoid holding a worker thread when served
+through this entry point, e.g. ``uvicorn animalguardian.asgi:application``.
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'animalguardian.settings')
+
+application = get_asgi_application()
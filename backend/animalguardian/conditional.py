@@ -0,0 +1,121 @@
+"""
+Conditional GET for per-user list and detail endpoints.
+
+The validator of a response is one aggregate query over the user's scoped
+queryset: the row count plus the latest of some timestamps. Unchanged
+rows give the same weak ETag, so a polling client that sends it back as
+If-None-Match gets a 304 before anything is serialized. The ETag covers
+the user and the full path, so pages, filters and users never share one.
+
+Changes the timestamps do not show (e.g. a renamed reporter in a case
+list) are picked up at the next change to the rows themselves.
+"""
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+import hashlib
+
+
+def make_etag(user_id, path, values):
+    digest = hashlib.sha1(repr((user_id, path, sorted(values.items()))).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(request, etag):
+    """Whether If-None-Match holds etag, compared weakly."""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    client_etags = {value.removeprefix('W/') for value in parse_etags(header)}
+    return '*' in client_etags or etag.removeprefix('W/') in client_etags
+
+
+def last_modified_of(values):
+    timestamps = [value for key, value in values.items() if key.startswith('max_') and value is not None]
+    return max(timestamps) if timestamps else None
+
+
+def set_validators(response, etag, last_modified=None):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    # Per-user content: browsers may keep it but must revalidate, proxies must not share it
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+class NotModified(APIException):
+    status_code = 304
+
+    def __init__(self, etag, last_modified=None):
+        super().__init__()
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class ConditionalGetMixin:
+    """Answer 304 to list and retrieve requests whose rows have not changed.
+
+    ``conditional_timestamps`` are the fields whose maximum goes into the
+    validator; conditional_aggregates() may add more aggregates.
+    conditional_queryset() is the scope the validator is computed over; a
+    retrieve narrows it to the requested object.
+    """
+    conditional_timestamps = ('updated_at',)
+
+    def conditional_aggregates(self):
+        return {f'max_{field}': Max(field) for field in self.conditional_timestamps}
+
+    def conditional_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def _conditional_rows(self):
+        """The validator's queryset, or None for a lookup value that cannot match."""
+        queryset = self.conditional_queryset()
+        if self.action != 'retrieve':
+            return queryset
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            return queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (TypeError, ValueError, ValidationError):
+            return None  # e.g. /abc/ for an integer pk; retrieve answers 404
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._validators = None
+        if request.method not in ('GET', 'HEAD') or self.action not in ('list', 'retrieve'):
+            return
+
+        queryset = self._conditional_rows()
+        if queryset is None:
+            return
+        values = queryset.order_by().aggregate(rows=Count('pk'), **self.conditional_aggregates())
+        if self.action == 'retrieve' and not values['rows']:
+            return  # Let retrieve answer 404
+        etag = make_etag(request.user.id, request.get_full_path(), values)
+        last_modified = last_modified_of(values)
+        self._validators = (etag, last_modified)
+
+        if etag_matches(request, etag):
+            raise NotModified(etag, last_modified)
+        # A deleted row does not move the latest timestamp, so dates alone
+        # only validate single objects
+        if self.action == 'retrieve' and last_modified is not None and 'If-None-Match' not in request.headers:
+            since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+            if since is not None and int(last_modified.timestamp()) <= since:
+                raise NotModified(etag, last_modified)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return set_validators(Response(status=exc.status_code), exc.etag, exc.last_modified)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, '_validators', None)
+        if validators and response.status_code == 200:
+            set_validators(response, *validators)
+        return response
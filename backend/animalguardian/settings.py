@@ -25,6 +25,10 @@ if 'RENDER' not in os.environ and 'RAILWAY' not in os.environ:
 ALLOWED_HOSTS_STR = config('ALLOWED_HOSTS', default='localhost,127.0.0.1')
 ALLOWED_HOSTS = [host.strip() for host in ALLOWED_HOSTS_STR.split(',') if host.strip()]
 
+# Worker class render-start.sh serves with (gthread or asgi); under asgi the
+# I/O-bound endpoints are routed to plain async views instead of DRF ones
+SERVER_PROFILE = config('SERVER_PROFILE', default='gthread')
+
 # Add Render domain automatically (Render sets RENDER_EXTERNAL_HOSTNAME)
 RENDER_EXTERNAL_HOSTNAME = config('RENDER_EXTERNAL_HOSTNAME', default=None)
 if RENDER_EXTERNAL_HOSTNAME:
@@ -67,12 +71,21 @@ LOCAL_APPS = [
     'weather',
     'community',
     'marketplace',
+    'sync',
+    'exports',
+    'realtime',
+    'metrics',
+    'benchmarks',
+    'reference',
+    'startup',
+    'home',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # First - handle CORS early
+    'metrics.middleware.RequestMetricsMiddleware',  # Per-view latency, query and serializer metrics
     'django.middleware.security.SecurityMiddleware',  # Security headers
     'django.middleware.gzip.GZipMiddleware',  # Compress responses (add before CommonMiddleware)
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -137,8 +150,11 @@ if DEBUG:
 if DATABASE_URL and DATABASE_URL.startswith(('postgres://', 'postgresql://', 'postgresql+psycopg2://')):
     # Use PostgreSQL from DATABASE_URL (Render provides this)
     # Use parse() instead of config() to avoid reading from .env file
+    # Persistent connections are per thread and ASGI gives each request its
+    # own thread for queries, so the asgi profile of render-start.sh sets 0
+    DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=600, cast=int)
     DATABASES = {
-        'default': dj_database_url.parse(DATABASE_URL, conn_max_age=600)
+        'default': dj_database_url.parse(DATABASE_URL, conn_max_age=DB_CONN_MAX_AGE)
     }
     
     # Database connection pooling settings for PostgreSQL (optimized for Render)
@@ -154,7 +170,7 @@ if DATABASE_URL and DATABASE_URL.startswith(('postgres://', 'postgresql://', 'po
             'keepalives_count': 5,
         }
         # Keep connections alive longer (reduces connection overhead)
-        DATABASES['default']['CONN_MAX_AGE'] = 600  # 10 minutes
+        DATABASES['default']['CONN_MAX_AGE'] = DB_CONN_MAX_AGE  # 10 minutes by default
         # Connection pool size (Render free tier can handle this)
         DATABASES['default']['ATOMIC_REQUESTS'] = False  # Disable for better performance
 else:
@@ -208,10 +224,15 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 
+AUTHENTICATION_BACKENDS = [
+    'accounts.backends.PhoneOrEmailBackend',  # LoginView: phone/email, one query, one hash
+    'django.contrib.auth.backends.ModelBackend',  # Admin site
+]
+
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -236,6 +257,7 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=24),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.authentication.ClaimsTokenRefreshSerializer',
 }
 
 # CORS Configuration
@@ -346,26 +368,81 @@ DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='mutesijosephine324@gm
 
 # Caching Configuration (in-memory cache for Render free tier)
 # Using local memory cache - fast and no external dependencies
-# For production with Redis, change to: 'django.core.cache.backends.redis.RedisCache'
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
-        'OPTIONS': {
-            'MAX_ENTRIES': 1000,  # Maximum number of entries in cache
-            'CULL_FREQUENCY': 3,  # Fraction of entries culled when MAX_ENTRIES is reached
-        },
-        'TIMEOUT': 300,  # 5 minutes default timeout
+# Set REDIS_URL to share the cache (counters, etc.) between gunicorn workers
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'TIMEOUT': 300,  # 5 minutes default timeout
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+            'OPTIONS': {
+                'MAX_ENTRIES': 1000,  # Maximum number of entries in cache
+                'CULL_FREQUENCY': 3,  # Fraction of entries culled when MAX_ENTRIES is reached
+            },
+            'TIMEOUT': 300,  # 5 minutes default timeout
+        }
     }
-}
+
+# Serve request.user from access token claims instead of a query per request;
+# token revocation lives in the cache, so this needs one shared by all workers
+JWT_STATELESS_USERS = config('JWT_STATELESS_USERS', default=bool(REDIS_URL), cast=bool)
+
+# Keep OTP codes and their counters in the cache; a per-process cache would
+# check a code in a worker that never saw it, so they stay in the database
+OTP_CACHE_CODES = config('OTP_CACHE_CODES', default=bool(REDIS_URL), cast=bool)
 
 # Cache settings for frequently accessed data
 CACHE_TTL = {
     'dashboard_stats': 60,  # Cache dashboard stats for 1 minute
     'user_profile': 300,  # Cache user profiles for 5 minutes
     'livestock_types': 3600,  # Cache livestock types for 1 hour (rarely changes)
+    'reference_data': 3600,  # Livestock types, breeds, diseases and categories
+    # Unread badge counters; bounds drift when the cache is per-process (locmem)
+    'unread_notifications': 60 if not REDIS_URL else 3600,
 }
 
+# Work queue priority of an open case: the weight of its urgency plus one
+# point per hour waited, up to the cap, so old low-urgency cases still
+# surface (python manage.py refresh_case_priorities, run every 15 minutes)
+CASE_PRIORITY_URGENCY_WEIGHTS = {'low': 0, 'medium': 24, 'high': 48, 'urgent': 96}
+CASE_PRIORITY_MAX_AGE_HOURS = 72
+
+# Hours a case may wait, by urgency, before the SLA sweep escalates it: pending
+# since it was reported, or under review since it was assigned
+# (python manage.py escalate_stale_cases, run every 15 minutes)
+CASE_SLA_HOURS = {'urgent': 4, 'high': 24, 'medium': 72, 'low': 168}
+
+# Threads per process resolving the parts of /api/home/ concurrently; each
+# may hold a database connection
+HOME_PART_WORKERS = config('HOME_PART_WORKERS', default=4, cast=int)
+
+# Delta-sync feed for the offline mobile app
+SYNC_SETTLE_SECONDS = 2  # Hold back very recent change log entries for one round
+SYNC_PAGE_SIZE = 500  # Change log entries returned per sync call
+SYNC_BATCH_MAX_MUTATIONS = 200  # Offline mutations accepted per batch
+SYNC_IDEMPOTENCY_TTL = timedelta(days=7)  # How long replayed keys are remembered
+
+# Realtime push channel (SSE / long-poll); needs REDIS_URL to span workers
+REALTIME_EVENT_TTL = 300  # Seconds a published event can be replayed on reconnect
+REALTIME_POLL_INTERVAL = 1.0  # Seconds between checks for events from other workers
+REALTIME_STREAM_SECONDS = 300  # Streams are closed and resumed by the client after this
+REALTIME_LONG_POLL_SECONDS = 25  # Longest wait of one long-poll request
+REALTIME_KEEPALIVE_SECONDS = 15  # Comment line sent on idle streams
+REALTIME_TICKET_SECONDS = 60  # Lifetime of the ?ticket= that opens a stream
+
+# Request metrics (exposed to admins at /metrics/)
+METRICS_DIR = config('METRICS_DIR', default='/tmp/animalguardian-metrics')  # Per-worker snapshots
+METRICS_FLUSH_INTERVAL = 5  # Seconds between a worker's snapshot writes
+METRICS_SERVER_TIMING = config('METRICS_SERVER_TIMING', default=DEBUG, cast=bool)  # Server-Timing header
+
 # Logging Configuration
 # Use console logging for Render (stdout/stderr are captured automatically)
 # File logging is not used in production to avoid FileNotFoundError
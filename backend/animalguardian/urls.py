@@ -8,8 +8,11 @@ from django.conf.urls.static import static
 from django.http import JsonResponse
 from .views import api_root
 
-def health_check(request):
-    """Simple health check endpoint that doesn't require database."""
+async def health_check(request):
+    """Simple health check endpoint that doesn't require database.
+
+    Async so load balancer probes never wait for a worker thread under asgi.py.
+    """
     return JsonResponse({
         'status': 'healthy',
         'service': 'animalguardian-backend',
@@ -20,6 +23,7 @@ urlpatterns = [
     path('health/', health_check, name='health-check'),
     path('', api_root, name='api-root'),
     path('admin/', admin.site.urls),
+    path('metrics/', include('metrics.urls')),
     path('api/', include('accounts.urls')),
     path('api/livestock/', include('livestock.urls')),
     path('api/cases/', include('cases.urls')),
@@ -29,6 +33,11 @@ urlpatterns = [
     path('api/community/', include('community.urls')),
     path('api/marketplace/', include('marketplace.urls')),
     path('api/files/', include('files.urls')),
+    path('api/sync/', include('sync.urls')),
+    path('api/exports/', include('exports.urls')),
+    path('api/realtime/', include('realtime.urls')),
+    path('api/reference/', include('reference.urls')),
+    path('api/home/', include('home.urls')),
 ]
 
 # Serve media files in development
@@ -25,6 +25,11 @@ def api_root(request):
                 "marketplace": "/api/marketplace/",
                 "notifications": "/api/notifications/",
                 "files": "/api/files/",
+                "sync": "/api/sync/",
+                "exports": "/api/exports/",
+                "realtime": "/api/realtime/",
+                "reference": "/api/reference/",
+                "home": "/api/home/",
             }
         },
         "status": "active"
@@ -0,0 +1,92 @@
+"""
+Worker warm-up, run in each gunicorn worker after it loads the application
+and before it accepts connections (see gunicorn.conf.py).
+
+A freshly forked worker would otherwise pay on its first requests for the
+database connection, URLConf resolution, DRF serializer field construction
+and empty per-process caches. Workers recycle every ~1000 requests, so
+this runs before each new worker accepts traffic.
+"""
+
+from django.db import connections
+from django.urls import URLPattern, URLResolver, get_resolver
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def _views(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _views(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            yield pattern.callback
+
+
+def open_connections():
+    for alias in connections:
+        connections[alias].ensure_connection()
+    return len(connections.all())
+
+
+def resolve_urls():
+    """Import every URLConf and build the reverse lookup tables."""
+    resolver = get_resolver()
+    resolver.reverse_dict  # noqa: B018 - populates nested resolvers too
+    return sum(1 for _ in _views(resolver.url_patterns))
+
+
+def build_serializers():
+    """Construct the fields of every viewset's serializer once."""
+    serializer_classes = set()
+    for view in _views(get_resolver().url_patterns):
+        serializer_class = getattr(getattr(view, 'cls', None), 'serializer_class', None)
+        if serializer_class is not None:
+            serializer_classes.add(serializer_class)
+    built = 0
+    for serializer_class in serializer_classes:
+        try:
+            serializer_class().fields  # noqa: B018 - builds the fields
+            built += 1
+        except Exception as e:
+            logger.debug(f"Could not warm {serializer_class.__name__}: {e}")
+    return built
+
+
+def warm_reference_caches():
+    from reference.bundle import current_bundle
+    from reference.data import warm
+    rows = sum(warm().values())
+    current_bundle()
+    return rows
+
+
+STEPS = [
+    ('database', open_connections),
+    ('urls', resolve_urls),
+    ('serializers', build_serializers),
+    ('reference_caches', warm_reference_caches),
+]
+
+
+def warm_up():
+    """Run every warm-up step; a failing step is logged and skipped.
+
+    Returns {step: seconds}.
+    """
+    timings = {}
+    started = time.perf_counter()
+    for name, step in STEPS:
+        step_started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            logger.warning(f"Worker warm-up step {name} failed: {e}")
+        timings[name] = round(time.perf_counter() - step_started, 4)
+    total = time.perf_counter() - started
+    logger.info(
+        f"Worker warm-up took {total * 1000:.0f}ms ("
+        + ', '.join(f'{name} {seconds * 1000:.0f}ms' for name, seconds in timings.items()) + ')'
+    )
+    return timings
@@ -0,0 +1,400 @@
+"""
+Synthetic dataset for benchmarks.
+
+Rows are written with bulk_create in batches, so generating hundreds of
+thousands of users and millions of notifications takes minutes rather than
+hours. Generation is deterministic for a given seed and sizes. Every user
+shares BENCH_PASSWORD, hashed once, and has a username starting with
+BENCH_PREFIX so the benchmark runner can find users of each role.
+
+bulk_create skips model signals: synthetic rows are not written to the
+delta-sync change log, and reported_at is back-dated with bulk_update
+because auto_now_add would otherwise stamp every case with the same time.
+Case list entries are refreshed explicitly once the cases are back-dated,
+and herd summaries rebuilt once the livestock exists.
+
+Notifications, the largest table, skip the ORM altogether: building a model
+instance and preparing every field of every row cost more than the insert
+itself, so they are written with multi-row INSERT statements (_insert_rows).
+"""
+
+from array import array
+from datetime import timedelta
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+import random
+
+BENCH_PREFIX = 'bench-'
+BENCH_PASSWORD = 'benchmark-password'
+
+LOCATIONS = [
+    ('Eastern', 'Nyagatare', 'Karangazi'),
+    ('Eastern', 'Nyagatare', 'Rwimiyaga'),
+    ('Eastern', 'Kayonza', 'Mukarange'),
+    ('Eastern', 'Gatsibo', 'Kabarore'),
+    ('Northern', 'Musanze', 'Muhoza'),
+    ('Northern', 'Gicumbi', 'Byumba'),
+    ('Southern', 'Huye', 'Ngoma'),
+    ('Southern', 'Nyanza', 'Busasamana'),
+    ('Western', 'Rubavu', 'Gisenyi'),
+    ('Western', 'Nyabihu', 'Mukamira'),
+    ('Kigali', 'Gasabo', 'Kimironko'),
+    ('Kigali', 'Kicukiro', 'Masaka'),
+]
+
+DISEASES = [
+    'Foot and Mouth Disease', 'Lumpy Skin Disease', 'East Coast Fever', 'Brucellosis',
+    'Anthrax', 'Peste des Petits Ruminants', 'Newcastle Disease', 'African Swine Fever',
+    'Mastitis', 'Rabies',
+]
+
+SYMPTOMS = [
+    'Fever and loss of appetite',
+    'Blisters on mouth and feet, drooling',
+    'Nodules on the skin and swollen lymph nodes',
+    'Coughing and difficulty breathing',
+    'Diarrhoea and weight loss',
+    'Swollen udder and abnormal milk',
+    'Abortion late in pregnancy',
+    'Sudden death of one animal, others weak',
+]
+
+# (value, weight) pairs for realistic mixes
+CASE_STATUSES = [
+    ('pending', 25), ('under_review', 15), ('investigation', 5), ('diagnosed', 10),
+    ('treated', 15), ('resolved', 25), ('rejected', 2), ('escalated', 3),
+]
+CASE_URGENCIES = [('low', 20), ('medium', 45), ('high', 25), ('urgent', 10)]
+NOTIFICATION_CHANNELS = [('in_app', 50), ('push', 30), ('sms', 20)]
+NOTIFICATION_STATUSES = [('read', 60), ('delivered', 20), ('sent', 10), ('pending', 5), ('failed', 5)]
+
+# Staff per farmer, with at least one of each role
+LOCAL_VETS_PER_FARMER = 1 / 200
+SECTOR_VETS_PER_FARMER = 1 / 2000
+FIELD_OFFICERS_PER_FARMER = 1 / 1000
+ADMINS = 2
+
+
+def default_sizes(farmers):
+    """Sizes of the other tables for a given number of farmers."""
+    return {
+        'farmers': farmers,
+        'livestock': farmers * 10,
+        'cases': farmers * 5,
+        'notifications': farmers * 50,
+        'posts': farmers // 20,
+        'conversations': farmers // 10,
+    }
+
+
+class _Weighted:
+    """Fast repeated weighted choice from (value, weight) pairs."""
+
+    def __init__(self, rng, pairs):
+        self.rng = rng
+        self.values = [value for value, weight in pairs]
+        self.cum_weights = []
+        total = 0
+        for value, weight in pairs:
+            total += weight
+            self.cum_weights.append(total)
+
+    def __call__(self, k=1):
+        return self.rng.choices(self.values, cum_weights=self.cum_weights, k=k)
+
+
+def _batches(total, batch_size):
+    for start in range(0, total, batch_size):
+        yield start, min(start + batch_size, total)
+
+
+def _insert_rows(model, columns, rows):
+    """INSERT rows (tuples of database values for `columns`) many per statement.
+
+    No model instances, defaults or signals: every NOT NULL column without a
+    value must be listed.
+    """
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    column_list = ', '.join(quote(column) for column in columns)
+    placeholders = f'({", ".join(["%s"] * len(columns))})'
+    max_params = connection.features.max_query_params or 65535
+    rows_per_statement = max(1, min(1000, max_params // len(columns)))
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), rows_per_statement):
+            chunk = rows[start:start + rows_per_statement]
+            cursor.execute(
+                f'INSERT INTO {table} ({column_list}) VALUES {", ".join([placeholders] * len(chunk))}',
+                [value for row in chunk for value in row],
+            )
+
+
+class DatasetGenerator:
+    """Write a synthetic dataset of the given sizes into the database."""
+
+    def __init__(self, sizes, seed=42, batch_size=5000, days=365, log=print):
+        self.sizes = sizes
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.days = days
+        self.log = log
+        self.now = timezone.now()
+        self.password = make_password(BENCH_PASSWORD)
+
+    def exists(self):
+        from accounts.models import User
+        return User.objects.filter(username__startswith=BENCH_PREFIX).exists()
+
+    def generate(self):
+        self._reference_data()
+        self._users()
+        self._livestock()
+        self._cases()
+        self._notifications()
+        self._posts()
+        self._conversations()
+
+    def _backdate(self):
+        return self.now - timedelta(seconds=self.rng.randrange(self.days * 86400))
+
+    def _reference_data(self):
+        from django.core.management import call_command
+        from cases.models import Disease
+        from livestock.models import Breed
+
+        call_command('seed_livestock_types', verbosity=0)
+        for name in DISEASES:
+            Disease.objects.get_or_create(name=name)
+        self.disease_ids = list(Disease.objects.values_list('id', flat=True))
+        self.breeds = list(Breed.objects.values_list('livestock_type_id', 'id'))
+
+    def _make_users(self, user_type, count, offset):
+        from accounts.models import User
+
+        ids = array('q')
+        locations = array('h')
+        for start, end in _batches(count, self.batch_size):
+            users = []
+            for i in range(start, end):
+                location = self.rng.randrange(len(LOCATIONS))
+                province, district, sector = LOCATIONS[location]
+                users.append(User(
+                    username=f'{BENCH_PREFIX}{user_type}-{i}',
+                    phone_number=f'9{offset + i:011d}',
+                    first_name=user_type.replace('_', ' ').title(),
+                    last_name=str(i),
+                    password=self.password,
+                    user_type=user_type,
+                    province=province,
+                    district=district,
+                    sector=sector,
+                    is_verified=True,
+                    is_approved_by_admin=True,
+                    is_staff=user_type == 'admin',
+                ))
+                locations.append(location)
+            with transaction.atomic():
+                ids.extend(user.pk for user in User.objects.bulk_create(users))
+        return ids, locations
+
+    def _users(self):
+        from accounts.models import FarmerProfile, VeterinarianProfile
+
+        farmers = self.sizes['farmers']
+        counts = {
+            'farmer': farmers,
+            'local_vet': max(1, round(farmers * LOCAL_VETS_PER_FARMER)),
+            'sector_vet': max(1, round(farmers * SECTOR_VETS_PER_FARMER)),
+            'field_officer': max(1, round(farmers * FIELD_OFFICERS_PER_FARMER)),
+            'admin': ADMINS,
+        }
+        self.users = {}
+        offset = 0
+        for user_type, count in counts.items():
+            self.log(f'Creating {count} {user_type} users...')
+            self.users[user_type] = self._make_users(user_type, count, offset)
+            offset += count
+
+        farmer_ids = self.users['farmer'][0]
+        for start, end in _batches(len(farmer_ids), self.batch_size):
+            FarmerProfile.objects.bulk_create([
+                FarmerProfile(user_id=farmer_ids[i], farm_name=f'Farm {i}', has_smartphone=i % 3 == 0)
+                for i in range(start, end)
+            ])
+        vet_ids = self.users['local_vet'][0]
+        VeterinarianProfile.objects.bulk_create([
+            VeterinarianProfile(
+                user_id=vet_id, license_number=f'BENCH{i:06d}', license_type='licensed',
+                is_available=i % 2 == 0,
+            )
+            for i, vet_id in enumerate(vet_ids)
+        ], batch_size=self.batch_size)
+
+        # Local vets by location index, for assigning cases nearby
+        self.vets_by_location = {}
+        for vet_id, location in zip(*self.users['local_vet']):
+            self.vets_by_location.setdefault(location, []).append(vet_id)
+
+    def _livestock(self):
+        from livestock.herd import rebuild as rebuild_herd_summaries
+        from livestock.models import Livestock
+
+        total = self.sizes['livestock']
+        farmer_ids, _ = self.users['farmer']
+        self.log(f'Creating {total} livestock...')
+        self.livestock_ids = array('q')
+        self.livestock_owner = array('l')  # Index into farmer_ids
+        for start, end in _batches(total, self.batch_size):
+            rows = []
+            for i in range(start, end):
+                owner = self.rng.randrange(len(farmer_ids))
+                livestock_type_id, breed_id = self.rng.choice(self.breeds)
+                rows.append(Livestock(
+                    owner_id=farmer_ids[owner],
+                    livestock_type_id=livestock_type_id,
+                    breed_id=breed_id,
+                    name=f'Animal {i}',
+                    tag_number=f'BENCH-{i}',
+                    gender=self.rng.choice('MF'),
+                    status='sick' if self.rng.random() < 0.05 else 'healthy',
+                ))
+                self.livestock_owner.append(owner)
+            with transaction.atomic():
+                self.livestock_ids.extend(row.pk for row in Livestock.objects.bulk_create(rows))
+        rebuild_herd_summaries(set(farmer_ids))
+
+    def _cases(self):
+        from cases.models import CaseReport
+        from cases.read_model import refresh as refresh_case_list
+        from cases.transitions import record_created as record_case_transitions
+        from cases.workload import reconcile as reconcile_vet_workloads
+
+        total = self.sizes['cases']
+        farmer_ids, farmer_locations = self.users['farmer']
+        sector_vet_ids, _ = self.users['sector_vet']
+        status = _Weighted(self.rng, CASE_STATUSES)
+        urgency = _Weighted(self.rng, CASE_URGENCIES)
+        self.log(f'Creating {total} cases...')
+        self.case_ids = array('q')
+        for start, end in _batches(total, self.batch_size):
+            rows = []
+            reported = []
+            for i in range(start, end):
+                animal = self.rng.randrange(len(self.livestock_ids))
+                owner = self.livestock_owner[animal]
+                case_status = status()[0]
+                vets = self.vets_by_location.get(farmer_locations[owner])
+                assigned = case_status != 'pending' and vets is not None and self.rng.random() < 0.9
+                reported_at = self._backdate()
+                rows.append(CaseReport(
+                    case_id=f'CRB{i:010d}',
+                    reporter_id=farmer_ids[owner],
+                    livestock_id=self.livestock_ids[animal],
+                    assigned_veterinarian_id=self.rng.choice(vets) if assigned else None,
+                    assigned_by_id=self.rng.choice(sector_vet_ids) if assigned else None,
+                    assigned_at=reported_at + timedelta(hours=self.rng.randrange(1, 72)) if assigned else None,
+                    status=case_status,
+                    urgency=urgency()[0],
+                    symptoms_observed=self.rng.choice(SYMPTOMS),
+                    number_of_affected_animals=self.rng.randint(1, 5),
+                    suspected_disease_id=self.rng.choice(self.disease_ids) if self.rng.random() < 0.6 else None,
+                ))
+                reported.append(reported_at)
+            with transaction.atomic():
+                created = CaseReport.objects.bulk_create(rows)
+                # auto_now_add stamped every row with the current time
+                for row, reported_at in zip(created, reported):
+                    row.reported_at = reported_at
+                CaseReport.objects.bulk_update(created, ['reported_at'], batch_size=500)
+                refresh_case_list(row.pk for row in created)
+                record_case_transitions(created)
+            self.case_ids.extend(row.pk for row in created)
+        reconcile_vet_workloads()
+
+    def _notifications(self):
+        from notifications import unread
+        from notifications.models import Notification
+
+        total = self.sizes['notifications']
+        farmer_ids, _ = self.users['farmer']
+        vet_ids, _ = self.users['local_vet']
+        channel = _Weighted(self.rng, NOTIFICATION_CHANNELS)
+        status = _Weighted(self.rng, NOTIFICATION_STATUSES)
+        # The same timestamp on every row, adapted for the database once
+        now = connection.ops.adapt_datetimefield_value(self.now)
+        columns = (
+            'recipient_id', 'channel', 'title', 'message', 'language', 'related_case_id', 'status',
+            'read_at', 'error_message', 'retry_count', 'max_retries', 'created_at',
+        )
+        self.log(f'Creating {total} notifications...')
+        for start, end in _batches(total, self.batch_size):
+            channels = channel(end - start)
+            statuses = status(end - start)
+            rows = []
+            unread_counts = {}
+            for i, notification_channel, notification_status in zip(range(start, end), channels, statuses):
+                recipient_id = self.rng.choice(vet_ids) if self.rng.random() < 0.2 else self.rng.choice(farmer_ids)
+                rows.append((
+                    recipient_id, notification_channel, 'Case update', f'Your case has a new update ({i}).', 'rw',
+                    self.rng.choice(self.case_ids) if self.case_ids and i % 2 else None,
+                    notification_status, now if notification_status == 'read' else None, '', 0, 3, now,
+                ))
+                if notification_status in unread.UNREAD_STATUSES:
+                    unread_counts[recipient_id] = unread_counts.get(recipient_id, 0) + 1
+            with transaction.atomic():
+                _insert_rows(Notification, columns, rows)
+                unread.adjust(unread_counts)
+
+    def _posts(self):
+        from community.models import Post, Comment
+
+        total = self.sizes['posts']
+        farmer_ids, _ = self.users['farmer']
+        self.log(f'Creating {total} posts...')
+        for start, end in _batches(total, self.batch_size):
+            comment_counts = [self.rng.randrange(6) for _ in range(start, end)]
+            with transaction.atomic():
+                posts = Post.objects.bulk_create([
+                    Post(
+                        author_id=self.rng.choice(farmer_ids),
+                        title=f'Question {i}',
+                        content=self.rng.choice(SYMPTOMS) + '. What should I do?',
+                        comments_count=comments,
+                    )
+                    for i, comments in zip(range(start, end), comment_counts)
+                ])
+                Comment.objects.bulk_create([
+                    Comment(post_id=post.pk, author_id=self.rng.choice(farmer_ids), content='Call your local vet.')
+                    for post, comments in zip(posts, comment_counts)
+                    for _ in range(comments)
+                ])
+
+    def _conversations(self):
+        from community.models import Conversation, Message
+
+        farmer_ids, farmer_locations = self.users['farmer']
+        total = min(self.sizes['conversations'], len(farmer_ids))
+        self.log(f'Creating {total} conversations...')
+        # One conversation per farmer keeps (participant1, participant2) unique
+        farmers = self.rng.sample(range(len(farmer_ids)), total)
+        all_vets = self.users['local_vet'][0]
+        for start, end in _batches(total, self.batch_size):
+            pairs = []
+            for farmer in farmers[start:end]:
+                vets = self.vets_by_location.get(farmer_locations[farmer], all_vets)
+                pairs.append((farmer_ids[farmer], self.rng.choice(vets)))
+            with transaction.atomic():
+                conversations = Conversation.objects.bulk_create([
+                    Conversation(participant1_id=farmer_id, participant2_id=vet_id) for farmer_id, vet_id in pairs
+                ])
+                messages = []
+                for conversation, (farmer_id, vet_id) in zip(conversations, pairs):
+                    for n in range(self.rng.randint(1, 10)):
+                        messages.append(Message(
+                            conversation_id=conversation.pk,
+                            sender_id=farmer_id if n % 2 == 0 else vet_id,
+                            content=f'Message {n}',
+                            is_read=self.rng.random() < 0.7,
+                        ))
+                Message.objects.bulk_create(messages)
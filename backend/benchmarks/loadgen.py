@@ -0,0 +1,342 @@
+"""
+HTTP load generator replaying the mobile app and web dashboard flows.
+
+Each virtual user is a thread with its own keep-alive session, like one
+device, and loops through the flow of its role:
+
+- farmer: login, weather, livestock list, report a case, poll notifications
+- sector_vet: login, then every 30s refresh the dashboard, list cases and
+  assign a pending one to an available local vet
+- chat: login, then poll the conversation list and one conversation
+
+Users are added in stages (e.g. 10 users for 60s, then 20, then 40) and
+every request is recorded, so latency, throughput and errors can be read
+per stage and per time window to find where the server saturates.
+"""
+
+from dataclasses import dataclass
+import math
+import random
+import threading
+import time
+
+import requests
+
+FLOWS = ('farmer', 'sector_vet', 'chat')
+
+
+@dataclass
+class Stage:
+    users: int
+    seconds: float
+
+
+def parse_stages(text):
+    """'10x60,20x60' -> [Stage(10, 60), Stage(20, 60)]."""
+    stages = []
+    for part in text.split(','):
+        users, seconds = part.lower().split('x')
+        stages.append(Stage(int(users), float(seconds)))
+    return stages
+
+
+def parse_mix(text):
+    """'farmer=70,sector_vet=5,chat=25' -> {'farmer': 70, ...}."""
+    mix = {}
+    for part in text.split(','):
+        flow, weight = part.split('=')
+        if flow not in FLOWS:
+            raise ValueError(f'Unknown flow {flow!r}; expected one of {", ".join(FLOWS)}')
+        mix[flow] = float(weight)
+    return mix
+
+
+def _percentile(ordered, q):
+    if not ordered:
+        return None
+    return round(ordered[max(0, math.ceil(q * len(ordered)) - 1)] * 1000, 1)
+
+
+def summarize(samples, seconds):
+    """Latency percentiles (ms), throughput and error rate of (latency, error) samples."""
+    ordered = sorted(latency for latency, error in samples)
+    errors = sum(1 for latency, error in samples if error)
+    return {
+        'requests': len(samples),
+        'requests_per_second': round(len(samples) / seconds, 2) if seconds else None,
+        'p50_ms': _percentile(ordered, 0.50),
+        'p95_ms': _percentile(ordered, 0.95),
+        'p99_ms': _percentile(ordered, 0.99),
+        'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+    }
+
+
+class Recorder:
+    """Thread-safe log of (time, stage, endpoint, latency, error) samples."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = []
+        self.errors = {}  # (endpoint, kind) -> count
+        self.stage = 0
+        self.started = time.monotonic()
+
+    def record(self, endpoint, latency, error=None):
+        with self._lock:
+            self.samples.append((time.monotonic() - self.started, self.stage, endpoint, latency, error))
+            if error:
+                self.errors[(endpoint, error)] = self.errors.get((endpoint, error), 0) + 1
+
+
+class VirtualUser(threading.Thread):
+
+    def __init__(self, flow, credentials, base_url, recorder, stop, think_scale=1.0, timeout=30, seed=None):
+        super().__init__(daemon=True)
+        self.flow = flow
+        self.phone_number, self.password = credentials
+        self.base_url = base_url.rstrip('/')
+        self.recorder = recorder
+        self.stop = stop
+        self.think_scale = think_scale
+        self.timeout = timeout
+        self.rng = random.Random(seed)
+        self.session = requests.Session()
+
+    def request(self, endpoint, method, path, **kwargs):
+        """Send one request and record it; returns the JSON body or None on error."""
+        started = time.perf_counter()
+        error = None
+        body = None
+        try:
+            response = self.session.request(method, self.base_url + path, timeout=self.timeout, **kwargs)
+            if response.status_code >= 400:
+                error = f'http_{response.status_code}'
+            else:
+                body = response.json() if response.content else {}
+        except requests.Timeout:
+            error = 'timeout'
+        except requests.ConnectionError:
+            error = 'connection'
+        except ValueError:
+            error = 'invalid_json'
+        self.recorder.record(endpoint, time.perf_counter() - started, error)
+        return body
+
+    def think(self, seconds):
+        """Wait like a user would; returns True when the test is over."""
+        return self.stop.wait(seconds * self.think_scale * self.rng.uniform(0.8, 1.2))
+
+    def login(self):
+        body = self.request('login', 'post', '/api/auth/login/', json={
+            'phone_number': self.phone_number, 'password': self.password,
+        })
+        if not body or 'access' not in body:
+            return False
+        self.session.headers['Authorization'] = f"Bearer {body['access']}"
+        return True
+
+    def run(self):
+        while not self.stop.is_set():
+            if self.login():
+                getattr(self, f'{self.flow}_flow')()
+            elif self.think(5):
+                return
+
+    def farmer_flow(self):
+        while not self.stop.is_set():
+            self.request('weather', 'get', '/api/weather/')
+            livestock = self.request('livestock_list', 'get', '/api/livestock/')
+            if self.think(5):
+                return
+            animals = (livestock or {}).get('results') or []
+            if animals and self.rng.random() < 0.2:
+                self.request('report_case', 'post', '/api/cases/reports/', json={
+                    'livestock_id': self.rng.choice(animals)['id'],
+                    'symptoms_observed': 'Fever and loss of appetite',
+                    'urgency': self.rng.choice(['low', 'medium', 'high']),
+                })
+            # The app polls the badge and opens the inbox now and then
+            for _ in range(3):
+                if self.think(10):
+                    return
+                self.request('notifications_unread', 'get', '/api/notifications/unread_count/')
+            self.request('notifications_list', 'get', '/api/notifications/')
+
+    def sector_vet_flow(self):
+        while not self.stop.is_set():
+            refreshed = time.monotonic()
+            self.request('dashboard_stats', 'get', '/api/dashboard/stats/')
+            cases = self.request('case_list', 'get', '/api/cases/reports/')
+            pending = [case for case in (cases or {}).get('results') or [] if case.get('status') == 'pending']
+            if pending and self.rng.random() < 0.5:
+                case = self.rng.choice(pending)
+                vets = self.request('available_vets', 'get', '/api/cases/reports/available_vets_by_location/',
+                                    params={'sector': case.get('reporter_sector') or ''})
+                available = (vets or {}).get('available_veterinarians') or []
+                if available:
+                    self.request('assign_case', 'post', f"/api/cases/reports/{case['id']}/assign/",
+                                 json={'veterinarian_id': self.rng.choice(available)['id']})
+            # The dashboard auto-refreshes every 30 seconds
+            if self.think(max(0.0, 30 - (time.monotonic() - refreshed) / max(self.think_scale, 1e-9))):
+                return
+
+    def chat_flow(self):
+        conversation_id = None
+        while not self.stop.is_set():
+            conversations = self.request('conversation_list', 'get', '/api/community/conversations/')
+            results = (conversations or {}).get('results') or []
+            if results:
+                conversation_id = self.rng.choice(results)['id']
+            for _ in range(6):
+                if self.think(5):
+                    return
+                if conversation_id:
+                    self.request('message_poll', 'get', '/api/community/messages/',
+                                 params={'conversation_id': conversation_id})
+            if conversation_id and self.rng.random() < 0.3:
+                self.request('message_send', 'post', '/api/community/messages/', json={
+                    'conversation': conversation_id, 'content': 'Thank you, doctor.',
+                })
+
+
+class LoadTest:
+    """Ramp virtual users through the stages and collect the samples."""
+
+    def __init__(self, base_url, credentials, stages, mix, think_scale=1.0, timeout=30, seed=42, log=print,
+                 memory=None):
+        self.base_url = base_url
+        self.credentials = credentials  # flow -> [(phone_number, password)]
+        self.stages = stages
+        self.mix = {flow: weight for flow, weight in mix.items() if weight > 0 and credentials.get(flow)}
+        self.think_scale = think_scale
+        self.timeout = timeout
+        self.rng = random.Random(seed)
+        self.log = log
+        # Callable returning the server's resident memory in MB, if known
+        self.memory = memory
+        self.stage_memory = []
+        self.recorder = Recorder()
+        self.users = []  # [(VirtualUser, stop event)]
+
+    def _spawn(self):
+        flows = list(self.mix)
+        flow = self.rng.choices(flows, weights=[self.mix[f] for f in flows])[0]
+        stop = threading.Event()
+        user = VirtualUser(
+            flow, self.rng.choice(self.credentials[flow]), self.base_url, self.recorder, stop,
+            think_scale=self.think_scale, timeout=self.timeout, seed=self.rng.random(),
+        )
+        user.start()
+        self.users.append((user, stop))
+
+    def _resize(self, target, ramp_seconds):
+        """Add or stop users until `target` run, spreading starts over ramp_seconds."""
+        while len(self.users) > target:
+            user, stop = self.users.pop()
+            stop.set()
+        missing = target - len(self.users)
+        for _ in range(missing):
+            self._spawn()
+            time.sleep(ramp_seconds / missing)
+
+    def run(self, window=5):
+        if not self.mix:
+            raise ValueError('No flow in the mix has users to log in as')
+        stage_bounds = []
+        self.stage_memory = []
+        try:
+            for index, stage in enumerate(self.stages):
+                self.recorder.stage = index
+                started = time.monotonic() - self.recorder.started
+                self.log(f'Stage {index + 1}/{len(self.stages)}: {stage.users} users for {stage.seconds:.0f}s')
+                # Ramp during the first tenth of the stage
+                ramp = min(stage.seconds / 10, 10)
+                self._resize(stage.users, ramp)
+                time.sleep(max(0.0, stage.seconds - ramp))
+                stage_bounds.append((started, time.monotonic() - self.recorder.started))
+                self.stage_memory.append(self.memory() if self.memory else None)
+        finally:
+            for user, stop in self.users:
+                stop.set()
+            for user, stop in self.users:
+                user.join(self.timeout + 1)
+        return self.report(stage_bounds, window)
+
+    def report(self, stage_bounds, window=5):
+        samples = self.recorder.samples
+        stages = []
+        for index, (stage, (started, ended)) in enumerate(zip(self.stages, stage_bounds)):
+            in_stage = [s for s in samples if s[1] == index]
+            endpoints = {}
+            for s in in_stage:
+                endpoints.setdefault(s[2], []).append((s[3], s[4]))
+            stages.append({
+                'users': stage.users,
+                'server_rss_mb': self.stage_memory[index] if index < len(self.stage_memory) else None,
+                **summarize([(s[3], s[4]) for s in in_stage], ended - started),
+                'endpoints': {name: summarize(rows, ended - started) for name, rows in sorted(endpoints.items())},
+            })
+
+        # Time series in fixed windows, for latency and error curves
+        curve = []
+        total = stage_bounds[-1][1] if stage_bounds else 0
+        for start in range(0, int(math.ceil(total)), window):
+            rows = [(s[3], s[4]) for s in samples if start <= s[0] < start + window]
+            stage_index = next((i for i, (a, b) in enumerate(stage_bounds) if start < b), len(stage_bounds) - 1)
+            curve.append({'t': start, 'users': self.stages[stage_index].users, **summarize(rows, window)})
+
+        return {
+            'base_url': self.base_url,
+            'mix': self.mix,
+            'think_scale': self.think_scale,
+            'stages': stages,
+            'curve': curve,
+            'errors': [
+                {'endpoint': endpoint, 'error': kind, 'count': count}
+                for (endpoint, kind), count in sorted(self.recorder.errors.items(), key=lambda item: -item[1])
+            ],
+            'saturation': saturation(stages),
+        }
+
+
+def saturation(stages):
+    """Stage with the highest throughput, and the first stage past the knee.
+
+    The knee is the first stage where adding users raised throughput by
+    less than 10% while p95 latency grew by more than 50%, or errors
+    exceeded 1%.
+    """
+    if not stages:
+        return {}
+    peak = max(stages, key=lambda stage: stage['requests_per_second'] or 0)
+    knee = None
+    for previous, stage in zip(stages, stages[1:]):
+        gained = (stage['requests_per_second'] or 0) / max(previous['requests_per_second'] or 0, 1e-9) - 1
+        slower = (stage['p95_ms'] or 0) / max(previous['p95_ms'] or 0, 1e-9) - 1
+        if stage['error_rate'] > 0.01 or (gained < 0.10 and slower > 0.50):
+            knee = stage['users']
+            break
+    return {
+        'peak_requests_per_second': peak['requests_per_second'],
+        'peak_users': peak['users'],
+        'knee_users': knee,
+    }
+
+
+def compare(baseline, current):
+    """Per-stage change between two reports with the same stages.
+
+    Throughput and latency changes are in percent; error rate and memory
+    are absolute differences.
+    """
+    changes = []
+    for before, after in zip(baseline.get('stages', []), current['stages']):
+        change = {'users': after['users']}
+        for metric in ('requests_per_second', 'p50_ms', 'p95_ms', 'p99_ms'):
+            if before.get(metric) and after.get(metric) is not None:
+                change[metric] = round((after[metric] - before[metric]) / before[metric] * 100, 1)
+        change['error_rate'] = round(after['error_rate'] - before['error_rate'], 4)
+        if before.get('server_rss_mb') is not None and after.get('server_rss_mb') is not None:
+            change['server_rss_mb'] = round(after['server_rss_mb'] - before['server_rss_mb'], 1)
+        changes.append(change)
+    return changes
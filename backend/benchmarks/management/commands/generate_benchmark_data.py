@@ -0,0 +1,51 @@
+"""
+Django management command to generate a synthetic benchmark dataset.
+
+Table sizes default to fixed ratios of --farmers (10 animals, 5 cases and
+50 notifications per farmer) and can be set individually. Generate into an
+empty database: the command refuses to add to an existing dataset.
+
+Usage:
+    python manage.py generate_benchmark_data --farmers 1000
+    python manage.py generate_benchmark_data --farmers 100000 --livestock 1000000 \\
+        --cases 500000 --notifications 5000000
+"""
+from django.core.management.base import BaseCommand, CommandError
+from benchmarks.dataset import DatasetGenerator, default_sizes, BENCH_PASSWORD
+import time
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic users, livestock, cases and notifications for benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--farmers', type=int, default=1000)
+        parser.add_argument('--livestock', type=int, help='Default: 10 per farmer')
+        parser.add_argument('--cases', type=int, help='Default: 5 per farmer')
+        parser.add_argument('--notifications', type=int, help='Default: 50 per farmer')
+        parser.add_argument('--posts', type=int, help='Default: 1 per 20 farmers')
+        parser.add_argument('--conversations', type=int, help='Default: 1 per 10 farmers')
+        parser.add_argument('--days', type=int, default=365, help='Spread case report dates over this many days')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        sizes = default_sizes(options['farmers'])
+        for name in sizes:
+            if options.get(name) is not None:
+                sizes[name] = options[name]
+
+        generator = DatasetGenerator(
+            sizes, seed=options['seed'], batch_size=options['batch_size'], days=options['days'],
+            log=self.stdout.write,
+        )
+        if generator.exists():
+            raise CommandError('Benchmark data already exists; generate into an empty database.')
+
+        started = time.perf_counter()
+        generator.generate()
+        elapsed = time.perf_counter() - started
+        summary = ', '.join(f'{count} {name}' for name, count in sizes.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {summary} in {elapsed:.0f}s. Every user\'s password is "{BENCH_PASSWORD}".'
+        ))
@@ -0,0 +1,95 @@
+"""
+Django management command to benchmark the hot API endpoints.
+
+Runs each scenario (case list per role, dashboard stats, notification
+inbox, community feed, livestock list, login) in-process against the
+synthetic dataset from generate_benchmark_data and reports p50/p95/p99
+latency, throughput and queries per request as JSON. Save the output of
+one commit and pass it to --compare on another to see the change.
+
+Usage:
+    python manage.py run_benchmarks --requests 200 --output before.json
+    python manage.py run_benchmarks --requests 200 --compare before.json
+    python manage.py run_benchmarks --scenario inbox --scenario feed
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from benchmarks.runner import BenchmarkRunner, SCENARIOS, SCENARIOS_BY_NAME, compare
+import json
+import logging
+import platform
+import subprocess
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _dataset_sizes():
+    from accounts.models import User
+    from cases.models import CaseReport
+    from livestock.models import Livestock
+    from notifications.models import Notification
+
+    return {
+        'users': User.objects.count(),
+        'livestock': Livestock.objects.count(),
+        'cases': CaseReport.objects.count(),
+        'notifications': Notification.objects.count(),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Measure latency percentiles, throughput and queries of the hot endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per scenario')
+        parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per scenario')
+        parser.add_argument('--scenario', action='append', choices=list(SCENARIOS_BY_NAME),
+                            help='Run only these scenarios (repeatable)')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Also write the results to this file')
+        parser.add_argument('--compare', help='Results file of an earlier run to compare with')
+
+    def handle(self, *args, **options):
+        scenarios = [SCENARIOS_BY_NAME[name] for name in options['scenario']] if options['scenario'] else SCENARIOS
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)
+
+        # Per-request log lines would dominate the measurement
+        logging.disable(logging.WARNING)
+        runner = BenchmarkRunner(requests=options['requests'], warmup=options['warmup'], seed=options['seed'])
+        results = {}
+        try:
+            for scenario in scenarios:
+                self.stderr.write(f'Running {scenario.name}...')
+                results[scenario.name] = runner.run(scenario).to_dict()
+        except LookupError as e:
+            raise CommandError(str(e))
+        finally:
+            logging.disable(logging.NOTSET)
+
+        report = {
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'database': connection.vendor,
+            'dataset': _dataset_sizes(),
+            'requests_per_scenario': options['requests'],
+            'scenarios': results,
+        }
+        if baseline:
+            report['compared_with'] = baseline.get('commit')
+            report['change_percent'] = compare(baseline, report)
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        self.stdout.write(output)
@@ -0,0 +1,171 @@
+"""
+Django management command to load test a running server with the client flows.
+
+Replays a weighted mix of the mobile and dashboard flows (farmer: login,
+livestock list, report a case, poll notifications; sector vet: dashboard
+refresh every 30s, case list, assign; chat polling) over HTTP, ramping the
+number of virtual users stage by stage. Reports throughput, p50/p95/p99
+latency and error rate per stage, per endpoint and per time window, and
+the user count where the server saturates.
+
+Virtual users log in as the synthetic users of generate_benchmark_data, so
+run it against a server using the same database. --serve starts one with
+render-start.sh (2 gthread workers x 2 threads, as deployed, or the asgi
+profile's 2 uvicorn workers) and records its memory per stage, so the two
+profiles can be compared at equal memory with --compare.
+
+Usage:
+    python manage.py run_load_test --serve --stages 10x60,20x60,40x60,80x60
+    python manage.py run_load_test --base-url http://127.0.0.1:8000 --mix farmer=80,chat=20
+    python manage.py run_load_test --serve --think-scale 0.1 --output gthread.json
+    python manage.py run_load_test --serve --profile asgi --think-scale 0.1 --compare gthread.json
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from benchmarks.dataset import BENCH_PREFIX, BENCH_PASSWORD
+from benchmarks.loadgen import LoadTest, compare, parse_mix, parse_stages
+from pathlib import Path
+import json
+import os
+import signal
+import subprocess
+import time
+
+import requests
+
+
+def _credentials():
+    """{flow: [(phone_number, password)]} of synthetic users able to run each flow."""
+    from accounts.models import User
+    from community.models import Conversation
+
+    bench = User.objects.filter(username__startswith=BENCH_PREFIX, is_active=True)
+    chatting = Conversation.objects.filter(participant1__username__startswith=BENCH_PREFIX)
+    phones = {
+        'farmer': bench.filter(user_type='farmer', livestock__isnull=False).distinct(),
+        'sector_vet': bench.filter(user_type='sector_vet'),
+        'chat': bench.filter(pk__in=chatting.values('participant1')) | bench.filter(pk__in=chatting.values('participant2')),
+    }
+    return {
+        flow: [(phone, BENCH_PASSWORD) for phone in users.values_list('phone_number', flat=True)[:1000]]
+        for flow, users in phones.items()
+    }
+
+
+def _rss_mb(process_group):
+    """Resident memory of every process in a process group, in MB (Linux only)."""
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    pages = 0
+    for proc in Path('/proc').glob('[0-9]*'):
+        try:
+            # Fields after the parenthesised command name: state, ppid, pgrp, ...
+            if int((proc / 'stat').read_text().rsplit(')', 1)[1].split()[2]) == process_group:
+                pages += int((proc / 'statm').read_text().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    return round(pages * page_size / 2**20, 1)
+
+
+class Command(BaseCommand):
+    help = 'Ramp virtual users replaying the client flows and find the saturation point'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--mix', default='farmer=70,sector_vet=5,chat=25',
+                            help='Relative weight of each flow among the virtual users')
+        parser.add_argument('--stages', default='10x60,25x60,50x60,100x60',
+                            help='Comma-separated USERSxSECONDS stages')
+        parser.add_argument('--think-scale', type=float, default=1.0,
+                            help='Multiplier on think and poll intervals; below 1 compresses time')
+        parser.add_argument('--timeout', type=float, default=30, help='Request timeout in seconds')
+        parser.add_argument('--window', type=int, default=5, help='Seconds per point of the latency curve')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--serve', action='store_true',
+                            help='Start the server with render-start.sh on the --base-url port')
+        parser.add_argument('--profile', choices=['gthread', 'asgi'], default='gthread',
+                            help='render-start.sh SERVER_PROFILE used by --serve')
+        parser.add_argument('--output', help='Also write the results to this file')
+        parser.add_argument('--compare', help='Results file of an earlier run with the same stages')
+
+    def handle(self, *args, **options):
+        try:
+            stages = parse_stages(options['stages'])
+            mix = parse_mix(options['mix'])
+        except ValueError as e:
+            raise CommandError(f'Invalid --stages or --mix: {e}')
+
+        credentials = _credentials()
+        if not any(credentials.values()):
+            raise CommandError('No synthetic users; run generate_benchmark_data first')
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)
+
+        server = self._serve(options['base_url'], options['profile']) if options['serve'] else None
+        try:
+            load_test = LoadTest(
+                options['base_url'], credentials, stages, mix, think_scale=options['think_scale'],
+                timeout=options['timeout'], seed=options['seed'], log=self.stderr.write,
+                memory=(lambda: _rss_mb(server.pid)) if server else None,
+            )
+            try:
+                report = load_test.run(window=options['window'])
+            except ValueError as e:
+                raise CommandError(str(e))
+        finally:
+            if server:
+                os.killpg(server.pid, signal.SIGTERM)
+                server.wait(30)
+
+        report['profile'] = options['profile'] if server else None
+        if baseline:
+            report['compared_with'] = baseline.get('profile')
+            report['change'] = compare(baseline, report)
+        self._print_table(report)
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
+        else:
+            self.stdout.write(output)
+
+    def _serve(self, base_url, profile):
+        """Start render-start.sh on the port of base_url and wait for /health/."""
+        port = base_url.rsplit(':', 1)[-1].strip('/')
+        script = Path(settings.BASE_DIR) / 'render-start.sh'
+        self.stderr.write(f'Starting {script.name} ({profile}) on port {port}...')
+        server = subprocess.Popen(
+            ['bash', str(script)], cwd=settings.BASE_DIR,
+            env={**os.environ, 'PORT': port, 'SERVER_PROFILE': profile},
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True,
+        )
+        deadline = time.monotonic() + 120
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f'{script.name} exited with status {server.returncode}')
+            try:
+                if requests.get(f'{base_url.rstrip("/")}/health/', timeout=2).ok:
+                    return server
+            except requests.RequestException:
+                pass
+            time.sleep(1)
+        os.killpg(server.pid, signal.SIGTERM)
+        raise CommandError(f'{script.name} did not answer /health/ within 120s')
+
+    def _print_table(self, report):
+        self.stderr.write(f'{"users":>6} {"req/s":>8} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"errors":>7} {"RSS MB":>7}')
+        for stage in report['stages']:
+            self.stderr.write(
+                f'{stage["users"]:>6} {stage["requests_per_second"] or 0:>8} {stage["p50_ms"] or 0:>8} '
+                f'{stage["p95_ms"] or 0:>8} {stage["p99_ms"] or 0:>8} {stage["error_rate"]:>7.2%} '
+                f'{stage["server_rss_mb"] if stage["server_rss_mb"] is not None else "-":>7}'
+            )
+        saturation = report['saturation']
+        if saturation.get('knee_users'):
+            self.stderr.write(f'Saturated at {saturation["knee_users"]} users '
+                              f'(peak {saturation["peak_requests_per_second"]} req/s at {saturation["peak_users"]} users)')
+        else:
+            self.stderr.write(f'No saturation within the stages '
+                              f'(peak {saturation.get("peak_requests_per_second")} req/s at {saturation.get("peak_users")} users)')
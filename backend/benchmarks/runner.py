@@ -0,0 +1,167 @@
+"""
+In-process benchmark of the hot API endpoints.
+
+Requests go through the full URL routing and middleware stack with Django's
+test client, each as a different synthetic user of the scenario's role, so
+per-user caches and row counts vary the way they do in production. Latency
+percentiles, throughput and queries per request are collected per scenario.
+"""
+
+from dataclasses import dataclass, field
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from accounts.authentication import ClaimsRefreshToken
+from .dataset import BENCH_PREFIX, BENCH_PASSWORD
+import math
+import random
+import time
+
+USERS_PER_ROLE = 50
+
+
+@dataclass
+class Scenario:
+    name: str
+    user_type: str
+    path: str
+    method: str = 'get'
+    # Cache keys deleted before each request, to measure the uncached path
+    uncached: tuple = ()
+    login: bool = False
+    expected_status: int = 200
+
+
+SCENARIOS = [
+    Scenario('case_list_farmer', 'farmer', '/api/cases/reports/'),
+    Scenario('case_list_local_vet', 'local_vet', '/api/cases/reports/'),
+    Scenario('case_list_sector_vet', 'sector_vet', '/api/cases/reports/'),
+    Scenario('case_list_admin', 'admin', '/api/cases/reports/'),
+    Scenario('dashboard_stats', 'sector_vet', '/api/dashboard/stats/'),
+    Scenario('dashboard_stats_uncached', 'sector_vet', '/api/dashboard/stats/', uncached=('dashboard_stats',)),
+    Scenario('inbox', 'farmer', '/api/notifications/'),
+    Scenario('inbox_unread_count', 'farmer', '/api/notifications/unread_count/'),
+    Scenario('feed', 'farmer', '/api/community/posts/'),
+    Scenario('livestock_list_farmer', 'farmer', '/api/livestock/'),
+    Scenario('livestock_list_local_vet', 'local_vet', '/api/livestock/'),
+    Scenario('livestock_list_sector_vet', 'sector_vet', '/api/livestock/'),
+    Scenario('login', 'farmer', '/api/auth/login/', method='post', login=True),
+]
+SCENARIOS_BY_NAME = {scenario.name: scenario for scenario in SCENARIOS}
+
+
+def _host():
+    """A host name ALLOWED_HOSTS accepts, for the test client."""
+    for host in settings.ALLOWED_HOSTS:
+        if host != '*' and not host.startswith(('*', '.')):
+            return host
+    return 'localhost'
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+def percentile(ordered, q):
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+@dataclass
+class ScenarioResult:
+    latencies: list = field(default_factory=list)  # Seconds
+    queries: list = field(default_factory=list)
+    errors: int = 0
+    wall: float = 0.0
+
+    def to_dict(self):
+        ordered = sorted(self.latencies)
+        return {
+            'requests': len(ordered),
+            'errors': self.errors,
+            'p50_ms': _ms(percentile(ordered, 0.50)),
+            'p95_ms': _ms(percentile(ordered, 0.95)),
+            'p99_ms': _ms(percentile(ordered, 0.99)),
+            'mean_ms': _ms(sum(ordered) / len(ordered)) if ordered else None,
+            'requests_per_second': round(len(ordered) / self.wall, 2) if self.wall else None,
+            'queries': {
+                'min': min(self.queries, default=None),
+                'max': max(self.queries, default=None),
+                'mean': round(sum(self.queries) / len(self.queries), 2) if self.queries else None,
+            },
+        }
+
+
+class BenchmarkRunner:
+
+    def __init__(self, requests=200, warmup=10, seed=42):
+        self.requests = requests
+        self.warmup = warmup
+        self.rng = random.Random(seed)
+        self.client = Client(HTTP_HOST=_host())
+        self._users = {}
+
+    def users(self, user_type):
+        """(user, Authorization header) pairs for synthetic users of a role."""
+        if user_type not in self._users:
+            from accounts.models import User
+            ids = list(
+                User.objects.filter(username__startswith=BENCH_PREFIX, user_type=user_type, is_active=True)
+                .order_by('pk').values_list('pk', flat=True)
+            )
+            if not ids:
+                raise LookupError(f'No synthetic {user_type} users; run generate_benchmark_data first')
+            sample = self.rng.sample(ids, min(USERS_PER_ROLE, len(ids)))
+            users = list(User.objects.filter(pk__in=sample).order_by('pk'))
+            self._users[user_type] = [
+                (user, f'Bearer {ClaimsRefreshToken.for_user(user).access_token}') for user in users
+            ]
+        return self._users[user_type]
+
+    def _request(self, scenario, user, authorization):
+        for key in scenario.uncached:
+            cache.delete(key)
+        if scenario.login:
+            return self.client.post(
+                scenario.path, {'phone_number': user.phone_number, 'password': BENCH_PASSWORD},
+                content_type='application/json',
+            )
+        return getattr(self.client, scenario.method)(scenario.path, HTTP_AUTHORIZATION=authorization)
+
+    def run(self, scenario):
+        users = self.users(scenario.user_type)
+        for _ in range(self.warmup):
+            self._request(scenario, *self.rng.choice(users))
+
+        result = ScenarioResult()
+        started = time.perf_counter()
+        for _ in range(self.requests):
+            user, authorization = self.rng.choice(users)
+            with CaptureQueriesContext(connection) as queries:
+                request_started = time.perf_counter()
+                response = self._request(scenario, user, authorization)
+                result.latencies.append(time.perf_counter() - request_started)
+            result.queries.append(len(queries))
+            if response.status_code != scenario.expected_status:
+                result.errors += 1
+        result.wall = time.perf_counter() - started
+        return result
+
+
+def compare(baseline, current):
+    """{scenario: {metric: percent change}} between two result documents."""
+    changes = {}
+    for name, result in current['scenarios'].items():
+        before = baseline.get('scenarios', {}).get(name)
+        if not before:
+            continue
+        changes[name] = {}
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms', 'requests_per_second'):
+            if before.get(metric) and result.get(metric) is not None:
+                changes[name][metric] = round((result[metric] - before[metric]) / before[metric] * 100, 1)
+        changes[name]['queries_mean'] = (result['queries']['mean'] or 0) - (before['queries']['mean'] or 0)
+    return changes
@@ -0,0 +1,155 @@
+"""
+SLA escalation of stale cases.
+
+A case breaches its SLA when it has been pending since it was reported, or
+under review since it was assigned, for longer than CASE_SLA_HOURS allows
+for its urgency. escalate_stale_cases() moves every breaching case to
+'escalated' in one UPDATE, records a CaseEscalation and a status transition
+per case and sends each active sector vet one in-app notification listing
+the escalated cases of their district (all of them for sector vets without
+a district).
+
+update() and bulk_create() skip model signals, so the case list entries,
+the status journal, the sync change log, unread counters and push events
+are updated here.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import NamedTuple
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from notifications import unread
+from notifications.models import Notification
+from realtime.events import notification_events, publish
+from sync.changelog import record_bulk
+from .models import CaseEscalation, CaseListEntry, CaseReport
+from .transitions import record_changed
+
+# Status a case waits in: the timestamp its wait started from
+WAITING_SINCE = {'pending': 'reported_at', 'under_review': 'assigned_at'}
+BATCH_SIZE = 5000
+# Case ids listed in a sector vet's notification
+LISTED_CASES = 10
+
+
+class StaleCase(NamedTuple):
+    # Attribute names of CaseReport, as record_bulk's audience reads them
+    pk: int
+    case_id: str
+    status: str
+    urgency: str
+    reporter_id: int
+    reporter_district: str
+    assigned_veterinarian_id: int
+    reported_at: datetime
+    assigned_at: datetime
+
+
+@dataclass
+class SweepResult:
+    escalated: int = 0
+    notifications: int = 0
+    by_urgency: dict = field(default_factory=dict)
+
+
+def breaching(now):
+    """Q matching the cases past their SLA at `now`.
+
+    Each term is an equality on status plus a range on the timestamp the
+    wait started from, so it scans (status, reported_at) or
+    (status, assigned_at).
+    """
+    condition = Q()
+    for urgency, hours in settings.CASE_SLA_HOURS.items():
+        deadline = now - timedelta(hours=hours)
+        for status, since_field in WAITING_SINCE.items():
+            condition |= Q(status=status, urgency=urgency, **{f'{since_field}__lt': deadline})
+    return condition
+
+
+def _notification_message(cases):
+    listed = ', '.join(case.case_id for case in cases[:LISTED_CASES])
+    more = f' and {len(cases) - LISTED_CASES} more' if len(cases) > LISTED_CASES else ''
+    return f'{len(cases)} case(s) passed their response time and were escalated: {listed}{more}.'
+
+
+def _sector_vet_notifications(cases, now):
+    from accounts.models import User
+
+    by_district = {}
+    for case in cases:
+        by_district.setdefault(case.reporter_district or '', []).append(case)
+    notifications = []
+    sector_vets = User.objects.filter(user_type='sector_vet', is_active=True).values_list('id', 'district')
+    for vet_id, district in sector_vets:
+        their_cases = by_district.get(district, []) if district else cases
+        if not their_cases:
+            continue
+        notifications.append(Notification(
+            recipient_id=vet_id,
+            channel='in_app',
+            title='Cases escalated',
+            message=_notification_message(their_cases),
+            related_case_id=their_cases[0].pk if len(their_cases) == 1 else None,
+            status='sent',
+            sent_at=now,
+        ))
+    return notifications
+
+
+def escalate_stale_cases(now=None, dry_run=False):
+    """Escalate every case past its SLA; returns a SweepResult.
+
+    With dry_run nothing is written and no notification is sent.
+    """
+    now = now or timezone.now()
+    result = SweepResult()
+    with transaction.atomic():
+        stale = CaseReport.objects.filter(breaching(now))
+        # Plain rows rather than model instances: a sweep may hold tens of thousands
+        cases = [
+            StaleCase(*row) for row in
+            stale.select_for_update(of=('self',)).order_by('reported_at').values_list(
+                'pk', 'case_id', 'status', 'urgency', 'reporter_id', 'reporter__district',
+                'assigned_veterinarian_id', 'reported_at', 'assigned_at',
+            )
+        ]
+        if not cases:
+            return result
+        for case in cases:
+            result.by_urgency[case.urgency] = result.by_urgency.get(case.urgency, 0) + 1
+        result.escalated = len(cases)
+        if dry_run:
+            return result
+
+        # The selected rows are locked, so the same condition updates exactly them
+        stale.update(status='escalated', updated_at=now)
+        case_ids = [case.pk for case in cases]
+        for start in range(0, len(case_ids), BATCH_SIZE):
+            CaseListEntry.objects.filter(case_report_id__in=case_ids[start:start + BATCH_SIZE]).update(
+                status='escalated', updated_at=now, refreshed_at=now
+            )
+        CaseEscalation.objects.bulk_create([
+            CaseEscalation(
+                case_report_id=case.pk,
+                from_status=case.status,
+                urgency=case.urgency,
+                sla_hours=settings.CASE_SLA_HOURS[case.urgency],
+                waiting_since=getattr(case, WAITING_SINCE[case.status]),
+                escalated_at=now,
+            )
+            for case in cases
+        ], batch_size=BATCH_SIZE)
+        record_changed(cases, 'escalated', now)
+        record_bulk('case_report', cases)
+
+        notifications = _sector_vet_notifications(cases, now)
+        Notification.objects.bulk_create(notifications, batch_size=1000)
+        record_bulk('notification', notifications)
+        unread.adjust(unread.count_unread(notifications))
+        publish(notification_events(notifications))
+        result.notifications = len(notifications)
+    return result
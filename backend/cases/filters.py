@@ -0,0 +1,135 @@
+"""
+Filtering, sorting and facet counts for the case list.
+
+The filters are declared once in CASE_FILTERS and applied by
+CaseListFilterBackend to the case list read model (CaseListEntry), whose
+composite indexes cover the common combinations. Parameters take
+comma-separated values where `many` is set, e.g. ?status=pending,escalated.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Callable
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from .models import CaseReport
+
+
+def _choice(choices):
+    values = {value for value, label in choices}
+
+    def parse(value):
+        if value not in values:
+            raise ValueError(f'must be one of {", ".join(sorted(values))}')
+        return value
+    return parse
+
+
+def _id(value):
+    if value == 'none':
+        return None
+    return int(value)
+
+
+def parse_moment(value, end_of_day=False):
+    """Parse an ISO date or datetime; a date means its start, or with
+    end_of_day the start of the next day."""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError('must be a date (YYYY-MM-DD) or an ISO datetime')
+        moment = datetime.combine(day + timedelta(days=1) if end_of_day else day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def _moment(end_of_day):
+    def parse(value):
+        return parse_moment(value, end_of_day)
+    return parse
+
+
+@dataclass(frozen=True)
+class CaseFilter:
+    param: str
+    field: str
+    parse: Callable = str
+    many: bool = False
+    # Lookup for a single value; 'none' ids become field__isnull
+    lookup: str = 'exact'
+
+    def q(self, raw):
+        values = [value.strip() for value in raw.split(',')] if self.many else [raw.strip()]
+        try:
+            parsed = [self.parse(value) for value in values if value]
+        except (TypeError, ValueError) as e:
+            raise ValidationError({self.param: [f'Invalid value {raw!r}: {e}']})
+        if not parsed:
+            return Q()
+        condition = Q()
+        if None in parsed:
+            condition |= Q(**{f'{self.field}__isnull': True})
+            parsed = [value for value in parsed if value is not None]
+        if len(parsed) > 1:
+            condition |= Q(**{f'{self.field}__in': parsed})
+        elif parsed:
+            condition |= Q(**{f'{self.field}__{self.lookup}': parsed[0]})
+        return condition
+
+
+CASE_FILTERS = [
+    CaseFilter('status', 'status', _choice(CaseReport.STATUS_CHOICES), many=True),
+    CaseFilter('urgency', 'urgency', _choice(CaseReport.URGENCY_CHOICES), many=True),
+    CaseFilter('district', 'reporter_district', many=True),
+    CaseFilter('sector', 'reporter_sector', many=True),
+    CaseFilter('disease', 'suspected_disease_id', _id, many=True),
+    CaseFilter('assigned_veterinarian', 'assigned_veterinarian_id', _id, many=True),
+    CaseFilter('reported_from', 'reported_at', _moment(end_of_day=False), lookup='gte'),
+    CaseFilter('reported_to', 'reported_at', _moment(end_of_day=True), lookup='lt'),
+]
+SEARCH_FIELDS = ('case_id', 'reporter_name', 'livestock_name', 'livestock_tag_number')
+ORDERINGS = ('reported_at', '-reported_at', 'updated_at', '-updated_at')
+# Facet name: CaseListEntry field
+FACETS = {'status': 'status', 'urgency': 'urgency', 'district': 'reporter_district'}
+
+
+class CaseListFilterBackend(BaseFilterBackend):
+    """Apply CASE_FILTERS, ?search= and ?ordering= to the case list."""
+
+    def filter_queryset(self, request, queryset, view):
+        if getattr(view, 'action', None) != 'list':
+            return queryset
+        params = request.query_params
+        for case_filter in CASE_FILTERS:
+            if params.get(case_filter.param):
+                queryset = queryset.filter(case_filter.q(params[case_filter.param]))
+
+        search = params.get('search', '').strip()
+        if search:
+            condition = Q()
+            for field in SEARCH_FIELDS:
+                condition |= Q(**{f'{field}__icontains': search})
+            queryset = queryset.filter(condition)
+
+        ordering = params.get('ordering')
+        if ordering:
+            if ordering not in ORDERINGS:
+                raise ValidationError({'ordering': [f'Must be one of {", ".join(ORDERINGS)}']})
+            queryset = queryset.order_by(ordering, '-pk')
+        return queryset
+
+
+def facet_counts(queryset):
+    """{facet: {value: count}} over the queryset, in one grouped query."""
+    facets = {name: {} for name in FACETS}
+    rows = queryset.order_by().values(*FACETS.values()).annotate(count=Count('pk'))
+    for row in rows:
+        for name, field in FACETS.items():
+            value = row[field] or ''
+            facets[name][value] = facets[name].get(value, 0) + row['count']
+    return facets
@@ -0,0 +1,32 @@
+"""
+Django management command to escalate cases that passed their SLA.
+
+Cases pending since they were reported, or under review since they were
+assigned, for longer than CASE_SLA_HOURS allows for their urgency are set
+to 'escalated' and recorded in case_escalations; sector vets get one
+notification per sweep. Run it every 15 minutes (e.g. from cron).
+
+Usage:
+    python manage.py escalate_stale_cases
+    python manage.py escalate_stale_cases --dry-run
+"""
+from django.core.management.base import BaseCommand
+from cases.escalation import escalate_stale_cases
+import time
+
+
+class Command(BaseCommand):
+    help = 'Escalate pending and under-review cases that waited longer than their SLA'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Count the breaching cases without escalating them')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        result = escalate_stale_cases(dry_run=options['dry_run'])
+        by_urgency = ', '.join(f'{count} {urgency}' for urgency, count in sorted(result.by_urgency.items()))
+        verb = 'Would escalate' if options['dry_run'] else 'Escalated'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {result.escalated} cases{f" ({by_urgency})" if by_urgency else ""}, '
+            f'{result.notifications} sector vet notifications, in {time.perf_counter() - started:.2f}s'
+        ))
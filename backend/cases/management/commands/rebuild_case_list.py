@@ -0,0 +1,25 @@
+"""
+Django management command to rebuild the case list read model.
+
+Every CaseListEntry is rewritten from its case and the users, livestock and
+disease it shows. Entries are kept current by signal receivers; run this
+after writing cases with bulk_create() or update() without refreshing them,
+or after restoring a backup.
+
+Usage:
+    python manage.py rebuild_case_list
+"""
+from django.core.management.base import BaseCommand
+from cases.read_model import rebuild_all
+import time
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized case list entries from the case tables'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        written = rebuild_all()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {written} case list entries in {time.perf_counter() - started:.2f}s'
+        ))
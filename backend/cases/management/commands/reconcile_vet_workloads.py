@@ -0,0 +1,26 @@
+"""
+Django management command to recompute the veterinarians' case counters.
+
+The counters are moved case by case as cases change; run this nightly
+(e.g. from cron) to correct any drift against the cases table, e.g. after
+rows were edited by hand, and to start the month's resolution counts of
+vets without activity since the month began.
+
+Usage:
+    python manage.py reconcile_vet_workloads
+"""
+from django.core.management.base import BaseCommand
+from cases.workload import reconcile
+import time
+
+
+class Command(BaseCommand):
+    help = 'Recompute the case counters of every veterinarian from the cases'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        changed = reconcile()
+        if options.get('verbosity', 1) >= 1:
+            self.stdout.write(self.style.SUCCESS(
+                f'Corrected the counters of {changed} veterinarians in {time.perf_counter() - started:.2f}s'
+            ))
@@ -0,0 +1,25 @@
+"""
+Django management command to rescore the work queue priority of open cases.
+
+A case's priority grows with the hours it has waited, so run this every 15
+minutes (e.g. from cron) to keep vets' queues in order. Only entries below
+the age cap are read, so a run touches the recent open cases only.
+
+Usage:
+    python manage.py refresh_case_priorities
+"""
+from django.core.management.base import BaseCommand
+from cases.priority import refresh_priorities
+import time
+
+
+class Command(BaseCommand):
+    help = 'Recompute the priority score of open cases for the vet work queues'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        changed = refresh_priorities()
+        if options.get('verbosity', 1) >= 1:
+            self.stdout.write(self.style.SUCCESS(
+                f'Rescored {changed} open cases in {time.perf_counter() - started:.2f}s'
+            ))
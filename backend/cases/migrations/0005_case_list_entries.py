@@ -0,0 +1,66 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_entries(apps, schema_editor):
+    """Create the list entries of the existing cases."""
+    from cases.read_model import rebuild_all
+    rebuild_all(apps.get_model('cases', 'CaseReport'), apps.get_model('cases', 'CaseListEntry'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0004_add_farmer_confirmation_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseListEntry',
+            fields=[
+                ('case_report', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='list_entry', serialize=False, to='cases.casereport')),
+                ('case_id', models.CharField(max_length=20)),
+                ('status', models.CharField(max_length=20)),
+                ('urgency', models.CharField(max_length=20)),
+                ('reporter_id', models.BigIntegerField()),
+                ('reporter_name', models.CharField(max_length=300)),
+                ('reporter_phone', models.CharField(max_length=20, null=True)),
+                ('reporter_email', models.CharField(max_length=254, null=True)),
+                ('reporter_district', models.CharField(max_length=100, null=True)),
+                ('reporter_sector', models.CharField(max_length=100, null=True)),
+                ('assigned_veterinarian_id', models.BigIntegerField(null=True)),
+                ('assigned_veterinarian_name', models.CharField(max_length=300, null=True)),
+                ('assigned_veterinarian_phone', models.CharField(max_length=20, null=True)),
+                ('assigned_veterinarian_email', models.CharField(max_length=254, null=True)),
+                ('assigned_at', models.DateTimeField(null=True)),
+                ('assigned_by_id', models.BigIntegerField(null=True)),
+                ('assigned_by_name', models.CharField(max_length=300, null=True)),
+                ('livestock_id', models.BigIntegerField(null=True)),
+                ('livestock_name', models.CharField(max_length=100, null=True)),
+                ('livestock_tag_number', models.CharField(max_length=50, null=True)),
+                ('livestock_type', models.CharField(max_length=100, null=True)),
+                ('suspected_disease_id', models.BigIntegerField(null=True)),
+                ('suspected_disease_name', models.CharField(max_length=200, null=True)),
+                ('symptoms_observed', models.TextField()),
+                ('duration_of_symptoms', models.CharField(blank=True, max_length=100)),
+                ('number_of_affected_animals', models.PositiveIntegerField(default=1)),
+                ('photos', models.JSONField(default=list)),
+                ('videos', models.JSONField(default=list)),
+                ('audio_notes', models.JSONField(default=list)),
+                ('location_notes', models.TextField(blank=True)),
+                ('farmer_confirmed_completion', models.BooleanField(default=False)),
+                ('farmer_confirmed_at', models.DateTimeField(null=True)),
+                ('reported_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'case_list_entries',
+                'ordering': ['-reported_at'],
+                'indexes': [models.Index(fields=['reporter_id', '-reported_at'], name='case_list_reporter_idx'), models.Index(fields=['assigned_veterinarian_id', '-reported_at'], name='case_list_vet_idx'), models.Index(fields=['-reported_at'], name='case_list_reported_idx'), models.Index(fields=['status', '-reported_at'], name='case_list_status_idx')],
+            },
+        ),
+        migrations.RunPython(build_entries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0005_case_list_entries'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='caselistentry',
+            index=models.Index(fields=['reporter_district', 'status', '-reported_at'], name='case_list_dist_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='caselistentry',
+            index=models.Index(fields=['urgency', '-reported_at'], name='case_list_urgency_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='caselistentry',
+            index=models.Index(fields=['status', 'urgency', '-reported_at'], name='case_list_stat_urg_idx'),
+        ),
+    ]
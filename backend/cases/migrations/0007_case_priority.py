@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:23
+
+from django.db import migrations, models
+
+
+def score_entries(apps, schema_editor):
+    """Give the existing entries their priority."""
+    from cases.read_model import rebuild_all
+    rebuild_all(apps.get_model('cases', 'CaseReport'), apps.get_model('cases', 'CaseListEntry'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0006_case_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='caselistentry',
+            name='priority',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='caselistentry',
+            index=models.Index(condition=models.Q(('status__in', ('pending', 'under_review', 'investigation', 'diagnosed', 'escalated'))), fields=['assigned_veterinarian_id', '-priority', 'reported_at'], name='case_list_queue_idx'),
+        ),
+        migrations.RunPython(score_entries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0007_case_priority'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseEscalation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(choices=[('pending', 'Pending Review'), ('under_review', 'Under Review'), ('investigation', 'Under Investigation'), ('diagnosed', 'Diagnosed'), ('treated', 'Treated'), ('resolved', 'Resolved'), ('rejected', 'Rejected'), ('escalated', 'Escalated')], max_length=20)),
+                ('urgency', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('urgent', 'Urgent')], max_length=20)),
+                ('sla_hours', models.PositiveIntegerField()),
+                ('waiting_since', models.DateTimeField()),
+                ('escalated_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'case_escalations',
+                'ordering': ['-escalated_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='casereport',
+            index=models.Index(fields=['status', 'assigned_at'], name='case_reports_stat_asg_idx'),
+        ),
+        migrations.AddField(
+            model_name='caseescalation',
+            name='case_report',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='escalations', to='cases.casereport'),
+        ),
+        migrations.AddIndex(
+            model_name='caseescalation',
+            index=models.Index(fields=['-escalated_at'], name='case_escalations_at_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:29
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def open_journal(apps, schema_editor):
+    """Give each existing case a transition into the status it is in.
+
+    When it entered that status is known for pending cases (reported_at)
+    and assigned ones under review (assigned_at); otherwise updated_at is
+    the best available guess.
+    """
+    CaseReport = apps.get_model('cases', 'CaseReport')
+    CaseStatusTransition = apps.get_model('cases', 'CaseStatusTransition')
+    cases = CaseReport.objects.order_by('pk').values_list(
+        'pk', 'status', 'reporter_id', 'reported_at', 'assigned_at', 'updated_at'
+    )
+    batch = []
+    for pk, status, reporter_id, reported_at, assigned_at, updated_at in cases.iterator(chunk_size=5000):
+        if status == 'pending':
+            at, actor_id = reported_at, reporter_id
+        elif status == 'under_review' and assigned_at:
+            at, actor_id = assigned_at, None
+        else:
+            at, actor_id = updated_at, None
+        batch.append(CaseStatusTransition(case_report_id=pk, to_status=status, actor_id=actor_id, at=at))
+        if len(batch) == 5000:
+            CaseStatusTransition.objects.bulk_create(batch)
+            batch = []
+    CaseStatusTransition.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('cases', '0008_case_escalations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseStatusTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('pending', 'Pending Review'), ('under_review', 'Under Review'), ('investigation', 'Under Investigation'), ('diagnosed', 'Diagnosed'), ('treated', 'Treated'), ('resolved', 'Resolved'), ('rejected', 'Rejected'), ('escalated', 'Escalated')], max_length=20)),
+                ('to_status', models.CharField(choices=[('pending', 'Pending Review'), ('under_review', 'Under Review'), ('investigation', 'Under Investigation'), ('diagnosed', 'Diagnosed'), ('treated', 'Treated'), ('resolved', 'Resolved'), ('rejected', 'Rejected'), ('escalated', 'Escalated')], max_length=20)),
+                ('at', models.DateTimeField()),
+                ('seconds_in_from_status', models.PositiveIntegerField(blank=True, null=True)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('case_report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transitions', to='cases.casereport')),
+            ],
+            options={
+                'db_table': 'case_status_transitions',
+                'ordering': ['at', 'pk'],
+                'indexes': [models.Index(fields=['case_report', 'at'], name='case_transitions_case_idx'), models.Index(fields=['from_status', 'at', 'seconds_in_from_status'], name='case_transitions_from_idx')],
+            },
+        ),
+        migrations.RunPython(open_journal, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:31
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def count_workloads(apps, schema_editor):
+    """Compute the counters of vets with cases."""
+    from cases.workload import reconcile
+    reconcile(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_otpverification_purpose_and_indexes'),
+        ('cases', '0009_case_status_transitions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VetWorkload',
+            fields=[
+                ('veterinarian', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='case_workload', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('open_cases', models.IntegerField(default=0)),
+                ('cases_handled', models.IntegerField(default=0)),
+                ('confirmed_completions', models.IntegerField(default=0)),
+                ('resolved_this_month', models.IntegerField(default=0)),
+                ('month', models.DateField(blank=True, null=True)),
+                ('resolutions_timed', models.IntegerField(default=0)),
+                ('resolution_seconds', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'vet_workloads',
+            },
+        ),
+        migrations.RunPython(count_workloads, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:44
+
+from django.db import migrations, models
+
+
+def fill_breeds(apps, schema_editor):
+    """Give the existing entries their livestock's breed."""
+    from cases.read_model import rebuild_all
+    rebuild_all(apps.get_model('cases', 'CaseReport'), apps.get_model('cases', 'CaseListEntry'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0010_vet_workloads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='caselistentry',
+            name='livestock_breed',
+            field=models.CharField(max_length=100, null=True),
+        ),
+        migrations.RunPython(fill_breeds, migrations.RunPython.noop),
+    ]
@@ -2,10 +2,14 @@
 Case reporting and veterinary consultation models.
 """
 
-from django.db import models
+from django.db import models, transaction, IntegrityError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from accounts.models import User
 from livestock.models import Livestock
+import secrets
+
+# Generated case ids tried before a collision is reported
+CASE_ID_ATTEMPTS = 3
 
 
 class Disease(models.Model):
@@ -70,6 +74,9 @@ class CaseReport(models.Model):
         ('urgent', 'Urgent'),
     ]
     
+    # Statuses in which a case still needs a veterinarian's work
+    OPEN_STATUSES = ('pending', 'under_review', 'investigation', 'diagnosed', 'escalated')
+    
     # Basic information
     reporter = models.ForeignKey(User, on_delete=models.CASCADE, related_name='case_reports')
     livestock = models.ForeignKey(Livestock, on_delete=models.CASCADE, related_name='case_reports', null=True, blank=True, help_text="Optional: Specific livestock affected. Leave blank for general cases.")
@@ -140,21 +147,142 @@ class CaseReport(models.Model):
             models.Index(fields=['assigned_veterinarian'], name='case_reports_vet_idx'),
             models.Index(fields=['reporter'], name='case_reports_reporter_idx'),
             models.Index(fields=['status', 'reported_at'], name='case_reports_stat_rep_idx'),
+            # SLA sweeps of cases under review since their assignment
+            models.Index(fields=['status', 'assigned_at'], name='case_reports_stat_asg_idx'),
         ]
     
+    # Fields whose loaded values are remembered so change hooks can see what
+    # a save replaced without re-reading the row.
+    TRACKED_FIELDS = (
+        'status', 'reporter_id', 'assigned_veterinarian_id', 'assigned_at', 'farmer_confirmed_completion',
+    )
+
     def __str__(self):
         return f"Case {self.case_id} - {self.livestock} ({self.status})"
-    
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: instance.__dict__.get(name) for name in cls.TRACKED_FIELDS
+        }
+        return instance
+
+    def loaded_value(self, field_name):
+        """Value of a tracked field when the row was loaded (None for new cases)."""
+        return getattr(self, '_loaded_values', {}).get(field_name)
+
     def save(self, *args, **kwargs):
-        if not self.case_id:
+        generated = not self.case_id
+        if generated:
             self.case_id = self.generate_case_id()
-        super().save(*args, **kwargs)
-    
+        for attempt in range(CASE_ID_ATTEMPTS):
+            try:
+                # Atomic so the list entry rebuilt by a post_save receiver
+                # commits or rolls back with the case
+                with transaction.atomic(using=kwargs.get('using')):
+                    super().save(*args, **kwargs)
+                break
+            except IntegrityError:
+                # A generated id can (rarely) collide; draw another
+                if not generated or attempt + 1 == CASE_ID_ATTEMPTS or not (
+                    CaseReport.objects.filter(case_id=self.case_id).exists()
+                ):
+                    raise
+                self.case_id = self.generate_case_id()
+        # post_save receivers have run; the saved values are now the baseline
+        self._loaded_values = {
+            name: self.__dict__.get(name) for name in self.TRACKED_FIELDS
+        }
+
     def generate_case_id(self):
-        """Generate unique case ID."""
+        """Generate unique case ID: CR, the time to the second and a random suffix."""
         from datetime import datetime
         timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-        return f"CR{timestamp}"
+        # The suffix keeps ids unique when many cases land in the same second
+        return f"CR{timestamp}{secrets.token_hex(2).upper()}"
+
+
+class CaseEscalation(models.Model):
+    """A case escalated by the SLA sweep for waiting too long in a status."""
+    
+    case_report = models.ForeignKey(CaseReport, on_delete=models.CASCADE, related_name='escalations')
+    from_status = models.CharField(max_length=20, choices=CaseReport.STATUS_CHOICES)
+    urgency = models.CharField(max_length=20, choices=CaseReport.URGENCY_CHOICES)
+    sla_hours = models.PositiveIntegerField()
+    # When the case entered from_status: reported_at if pending, else assigned_at
+    waiting_since = models.DateTimeField()
+    escalated_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'case_escalations'
+        ordering = ['-escalated_at']
+        indexes = [
+            models.Index(fields=['-escalated_at'], name='case_escalations_at_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Escalation of case {self.case_report_id} from {self.from_status}"
+
+
+class CaseStatusTransition(models.Model):
+    """A change of a case's status. Rows are only ever appended (see cases.transitions)."""
+
+    case_report = models.ForeignKey(CaseReport, on_delete=models.CASCADE, related_name='transitions')
+    # Blank for the status a case was created with
+    from_status = models.CharField(max_length=20, choices=CaseReport.STATUS_CHOICES, blank=True)
+    to_status = models.CharField(max_length=20, choices=CaseReport.STATUS_CHOICES)
+    # Null for system changes such as SLA escalation
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    at = models.DateTimeField()
+    # Time spent in from_status; null when the case was created, or entered
+    # from_status before the journal began
+    seconds_in_from_status = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'case_status_transitions'
+        ordering = ['at', 'pk']
+        indexes = [
+            # A case's timeline, and the latest transition a new one follows
+            models.Index(fields=['case_report', 'at'], name='case_transitions_case_idx'),
+            # Durations per status over a period, answered from the index alone
+            models.Index(fields=['from_status', 'at', 'seconds_in_from_status'], name='case_transitions_from_idx'),
+        ]
+
+    def __str__(self):
+        return f"Case {self.case_report_id}: {self.from_status or '-'} -> {self.to_status}"
+
+
+class VetWorkload(models.Model):
+    """Case counters of a veterinarian, kept current by cases.workload."""
+
+    veterinarian = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name='case_workload'
+    )
+    # Cases assigned to the vet in an open status
+    open_cases = models.IntegerField(default=0)
+    # Cases assigned to the vet that were treated or resolved
+    cases_handled = models.IntegerField(default=0)
+    confirmed_completions = models.IntegerField(default=0)
+    # Cases resolved in `month` (the month's first day); stale once it has passed
+    resolved_this_month = models.IntegerField(default=0)
+    month = models.DateField(null=True, blank=True)
+    # Resolved cases with an assignment time, and their total time to resolution
+    resolutions_timed = models.IntegerField(default=0)
+    resolution_seconds = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'vet_workloads'
+
+    def __str__(self):
+        return f"Workload of vet {self.veterinarian_id}"
+
+    @property
+    def mean_resolution_seconds(self):
+        if not self.resolutions_timed:
+            return None
+        return self.resolution_seconds // self.resolutions_timed
 
 
 class VeterinaryConsultation(models.Model):
@@ -324,3 +452,84 @@ class CaseStatistics(models.Model):
     
     def __str__(self):
         return f"Case Statistics - {self.date}"
+
+
+class CaseListEntry(models.Model):
+    """Read model of a case as the case list shows it.
+
+    One row per case with the names, phones and labels the list would
+    otherwise join in from users, livestock and diseases. Rows are rebuilt
+    by cases.read_model whenever a case or one of those rows changes;
+    never write them directly.
+    """
+
+    case_report = models.OneToOneField(
+        CaseReport, on_delete=models.CASCADE, primary_key=True, related_name='list_entry'
+    )
+    case_id = models.CharField(max_length=20)
+    status = models.CharField(max_length=20)
+    urgency = models.CharField(max_length=20)
+
+    reporter_id = models.BigIntegerField()
+    reporter_name = models.CharField(max_length=300)
+    reporter_phone = models.CharField(max_length=20, null=True)
+    reporter_email = models.CharField(max_length=254, null=True)
+    reporter_district = models.CharField(max_length=100, null=True)
+    reporter_sector = models.CharField(max_length=100, null=True)
+
+    assigned_veterinarian_id = models.BigIntegerField(null=True)
+    assigned_veterinarian_name = models.CharField(max_length=300, null=True)
+    assigned_veterinarian_phone = models.CharField(max_length=20, null=True)
+    assigned_veterinarian_email = models.CharField(max_length=254, null=True)
+    assigned_at = models.DateTimeField(null=True)
+    assigned_by_id = models.BigIntegerField(null=True)
+    assigned_by_name = models.CharField(max_length=300, null=True)
+
+    livestock_id = models.BigIntegerField(null=True)
+    livestock_name = models.CharField(max_length=100, null=True)
+    livestock_tag_number = models.CharField(max_length=50, null=True)
+    livestock_type = models.CharField(max_length=100, null=True)
+    livestock_breed = models.CharField(max_length=100, null=True)
+    suspected_disease_id = models.BigIntegerField(null=True)
+    suspected_disease_name = models.CharField(max_length=200, null=True)
+
+    symptoms_observed = models.TextField()
+    duration_of_symptoms = models.CharField(max_length=100, blank=True)
+    number_of_affected_animals = models.PositiveIntegerField(default=1)
+    photos = models.JSONField(default=list)
+    videos = models.JSONField(default=list)
+    audio_notes = models.JSONField(default=list)
+    location_notes = models.TextField(blank=True)
+    farmer_confirmed_completion = models.BooleanField(default=False)
+    farmer_confirmed_at = models.DateTimeField(null=True)
+
+    # Urgency weight plus waiting time (see cases.priority); higher goes first
+    priority = models.IntegerField(default=0)
+
+    reported_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    # Moves on every rebuild, including renamed reporters; the list's validator
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'case_list_entries'
+        ordering = ['-reported_at']
+        indexes = [
+            # One per role's list: farmers, local vets, sector vets and admins
+            models.Index(fields=['reporter_id', '-reported_at'], name='case_list_reporter_idx'),
+            models.Index(fields=['assigned_veterinarian_id', '-reported_at'], name='case_list_vet_idx'),
+            models.Index(fields=['-reported_at'], name='case_list_reported_idx'),
+            models.Index(fields=['status', '-reported_at'], name='case_list_status_idx'),
+            # The dashboard's common filter combinations (see cases.filters)
+            models.Index(fields=['reporter_district', 'status', '-reported_at'], name='case_list_dist_status_idx'),
+            models.Index(fields=['urgency', '-reported_at'], name='case_list_urgency_idx'),
+            models.Index(fields=['status', 'urgency', '-reported_at'], name='case_list_stat_urg_idx'),
+            # A vet's work queue: the open cases assigned to them, most pressing first
+            models.Index(
+                fields=['assigned_veterinarian_id', '-priority', 'reported_at'], name='case_list_queue_idx',
+                condition=models.Q(status__in=CaseReport.OPEN_STATUSES),
+            ),
+        ]
+
+    def __str__(self):
+        return f"List entry of case {self.case_id}"
@@ -0,0 +1,48 @@
+"""
+Work queue priority of cases.
+
+An open case scores the weight of its urgency plus one point per hour since
+it was reported, up to CASE_PRIORITY_MAX_AGE_HOURS. The score is stored on
+the case list entry, where a partial index over open cases makes a vet's
+next case an index seek. Entries get their score when they are rebuilt;
+refresh_priorities(), run periodically, adds the hours waited since.
+"""
+
+from django.conf import settings
+from django.utils import timezone
+from datetime import timedelta
+
+BATCH_SIZE = 1000
+
+
+def priority_for(status, urgency, reported_at, now=None):
+    from .models import CaseReport
+    if status not in CaseReport.OPEN_STATUSES:
+        return 0
+    now = now or timezone.now()
+    hours = max(0, int((now - reported_at).total_seconds() // 3600))
+    return settings.CASE_PRIORITY_URGENCY_WEIGHTS.get(urgency, 0) + min(hours, settings.CASE_PRIORITY_MAX_AGE_HOURS)
+
+
+def refresh_priorities(now=None):
+    """Rescore the open entries whose age has not reached the cap yet.
+
+    Returns how many entries changed.
+    """
+    from .models import CaseListEntry, CaseReport
+    now = now or timezone.now()
+    # Entries past the cap keep their score; stop one hour later to catch
+    # those that reached it since the last run
+    since = now - timedelta(hours=settings.CASE_PRIORITY_MAX_AGE_HOURS + 1)
+    entries = (
+        CaseListEntry.objects.filter(status__in=CaseReport.OPEN_STATUSES, reported_at__gte=since)
+        .only('pk', 'status', 'urgency', 'reported_at', 'priority').order_by()
+    )
+    changed = []
+    for entry in entries.iterator(chunk_size=BATCH_SIZE):
+        priority = priority_for(entry.status, entry.urgency, entry.reported_at, now)
+        if priority != entry.priority:
+            entry.priority = priority
+            changed.append(entry)
+    CaseListEntry.objects.bulk_update(changed, ['priority'], batch_size=BATCH_SIZE)
+    return len(changed)
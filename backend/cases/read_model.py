@@ -0,0 +1,125 @@
+"""
+Maintenance of the case list read model (CaseListEntry).
+
+The case list used to join eight tables per page and format names in
+Python. Each case now has a CaseListEntry holding everything the list
+shows, so a page is a scan of one table on its role's index.
+
+refresh() rebuilds the entries of given cases from the source tables in
+two queries. The signal receivers in cases.signals call it for saved
+cases, and patch the denormalized columns in place when a user, a
+livestock, a livestock type, a breed or a disease changes. Code that writes cases
+with bulk_create() or update() must call refresh() itself.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+from .priority import priority_for
+
+# Columns copied from CaseReport as they are
+CASE_FIELDS = (
+    'case_id', 'status', 'urgency', 'reporter_id', 'assigned_veterinarian_id', 'assigned_at',
+    'assigned_by_id', 'livestock_id', 'suspected_disease_id', 'symptoms_observed',
+    'duration_of_symptoms', 'number_of_affected_animals', 'photos', 'videos', 'audio_notes',
+    'location_notes', 'farmer_confirmed_completion', 'farmer_confirmed_at', 'reported_at', 'updated_at',
+)
+# Columns filled from a user row, by the prefix the user's role has in the case
+USER_FIELDS = {
+    'reporter': ('name', 'phone', 'email', 'district', 'sector'),
+    'assigned_veterinarian': ('name', 'phone', 'email'),
+    'assigned_by': ('name',),
+}
+USER_SOURCE = {
+    'phone': 'phone_number', 'email': 'email', 'district': 'district', 'sector': 'sector',
+}
+NAME_SOURCES = ('first_name', 'last_name', 'username')
+LIVESTOCK_SOURCE = {
+    'livestock_name': 'livestock__name',
+    'livestock_tag_number': 'livestock__tag_number',
+    'livestock_type': 'livestock__livestock_type__name',
+    'livestock_breed': 'livestock__breed__name',
+}
+BATCH_SIZE = 1000
+
+
+def display_name(first_name, last_name, username):
+    """User.get_full_name(), or the username when both names are blank."""
+    if username is None:
+        return None
+    return f'{first_name} {last_name}'.strip() or username
+
+
+def user_columns(prefix, user):
+    """The columns of the given role filled from a user (None clears them)."""
+    columns = {}
+    for column in USER_FIELDS[prefix]:
+        if user is None:
+            value = None
+        elif column == 'name':
+            value = display_name(user.first_name, user.last_name, user.username)
+        else:
+            value = getattr(user, USER_SOURCE[column])
+        columns[f'{prefix}_{column}'] = value
+    return columns
+
+
+def _source_paths():
+    paths = list(CASE_FIELDS) + list(LIVESTOCK_SOURCE.values()) + ['pk', 'suspected_disease__name']
+    for prefix, columns in USER_FIELDS.items():
+        paths += [f'{prefix}__{source}' for source in NAME_SOURCES]
+        paths += [f'{prefix}__{USER_SOURCE[column]}' for column in columns if column != 'name']
+    return paths
+
+
+def _entry_values(row):
+    values = {field: row[field] for field in CASE_FIELDS}
+    values.update({column: row[path] for column, path in LIVESTOCK_SOURCE.items()})
+    values['suspected_disease_name'] = row['suspected_disease__name']
+    for prefix, columns in USER_FIELDS.items():
+        for column in columns:
+            if column == 'name':
+                value = display_name(*(row[f'{prefix}__{source}'] for source in NAME_SOURCES))
+            else:
+                value = row[f'{prefix}__{USER_SOURCE[column]}']
+            values[f'{prefix}_{column}'] = value
+    return values
+
+
+def refresh(case_ids, case_model=None, entry_model=None):
+    """Rebuild the list entries of these cases; returns how many were written.
+
+    Ids of deleted cases are skipped (their entries were deleted with them).
+    The models can be passed in for use from a data migration.
+    """
+    if case_model is None:
+        from .models import CaseListEntry, CaseReport
+        case_model, entry_model = CaseReport, CaseListEntry
+    case_ids = list(case_ids)
+    written = 0
+    now = timezone.now()
+    update_fields = [field.name for field in entry_model._meta.concrete_fields if not field.primary_key]
+    for start in range(0, len(case_ids), BATCH_SIZE):
+        rows = case_model.objects.filter(pk__in=case_ids[start:start + BATCH_SIZE]).values(*_source_paths())
+        entries = []
+        for row in rows:
+            values = _entry_values(row)
+            values['priority'] = priority_for(row['status'], row['urgency'], row['reported_at'], now)
+            # A data migration's entry model may predate some columns
+            values = {name: value for name, value in values.items() if name in update_fields}
+            entries.append(entry_model(case_report_id=row['pk'], refreshed_at=now, **values))
+        if entries:
+            with transaction.atomic():
+                entry_model.objects.bulk_create(
+                    entries, update_conflicts=True, unique_fields=['case_report'], update_fields=update_fields,
+                )
+            written += len(entries)
+    return written
+
+
+def rebuild_all(case_model=None, entry_model=None):
+    """Rebuild the entries of every case; returns how many were written."""
+    if case_model is None:
+        from .models import CaseListEntry, CaseReport
+        case_model, entry_model = CaseReport, CaseListEntry
+    case_ids = list(case_model.objects.order_by('pk').values_list('pk', flat=True))
+    return refresh(case_ids, case_model, entry_model)
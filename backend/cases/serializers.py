@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from .models import CaseReport, Disease
+from django.utils import timezone
+from .models import CaseListEntry, CaseReport, CaseStatusTransition, Disease, VetWorkload
+from .workload import month_of
 
 class DiseaseSerializer(serializers.ModelSerializer):
     class Meta:
@@ -141,3 +143,93 @@ class CaseReportSerializer(serializers.ModelSerializer):
     
     def get_assigned_by_name(self, obj):
         return obj.assigned_by.get_full_name() or obj.assigned_by.username if obj.assigned_by else None
+
+
+class CaseListEntrySerializer(serializers.ModelSerializer):
+    """A case as the case list shows it, read from its CaseListEntry.
+
+    The keys of CaseReportSerializer, with the livestock and disease labels
+    also alongside. livestock keeps the nested shape the web dashboard reads
+    (name, tag number, type and breed names), rebuilt from the entry.
+    """
+    id = serializers.IntegerField(source='case_report_id', read_only=True)
+    reporter = serializers.IntegerField(source='reporter_id', read_only=True)
+    assigned_veterinarian = serializers.IntegerField(source='assigned_veterinarian_id', read_only=True)
+    assigned_by = serializers.IntegerField(source='assigned_by_id', read_only=True)
+    livestock = serializers.SerializerMethodField()
+    suspected_disease = serializers.IntegerField(source='suspected_disease_id', read_only=True)
+    
+    def get_livestock(self, obj):
+        if obj.livestock_id is None:
+            return None
+        return {
+            'id': obj.livestock_id,
+            'name': obj.livestock_name,
+            'tag_number': obj.livestock_tag_number,
+            'livestock_type': {'name': obj.livestock_type} if obj.livestock_type else None,
+            'breed': {'name': obj.livestock_breed} if obj.livestock_breed else None,
+        }
+    
+    class Meta:
+        model = CaseListEntry
+        fields = (
+            'id', 'case_id', 'status', 'urgency',
+            'reporter', 'reporter_name', 'reporter_phone', 'reporter_email', 'reporter_district', 'reporter_sector',
+            'assigned_veterinarian', 'assigned_veterinarian_name', 'assigned_veterinarian_phone',
+            'assigned_veterinarian_email', 'assigned_at', 'assigned_by', 'assigned_by_name',
+            'livestock', 'livestock_name', 'livestock_tag_number', 'livestock_type', 'livestock_breed',
+            'suspected_disease', 'suspected_disease_name',
+            'symptoms_observed', 'duration_of_symptoms', 'number_of_affected_animals',
+            'photos', 'videos', 'audio_notes', 'location_notes',
+            'farmer_confirmed_completion', 'farmer_confirmed_at', 'reported_at', 'updated_at',
+        )
+        read_only_fields = fields
+
+
+class CaseQueueEntrySerializer(CaseListEntrySerializer):
+    """A case in a vet's work queue, with its priority score."""
+    
+    class Meta(CaseListEntrySerializer.Meta):
+        fields = CaseListEntrySerializer.Meta.fields + ('priority',)
+        read_only_fields = fields
+
+
+class VetWorkloadSerializer(serializers.ModelSerializer):
+    """A row of the vet scoreboard, from the vet's precomputed counters."""
+    veterinarian_name = serializers.SerializerMethodField()
+    district = serializers.CharField(source='veterinarian.district', read_only=True)
+    sector = serializers.CharField(source='veterinarian.sector', read_only=True)
+    resolved_this_month = serializers.SerializerMethodField()
+    mean_resolution_hours = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = VetWorkload
+        fields = (
+            'veterinarian', 'veterinarian_name', 'district', 'sector', 'open_cases', 'cases_handled',
+            'confirmed_completions', 'resolved_this_month', 'mean_resolution_hours', 'updated_at',
+        )
+        read_only_fields = fields
+    
+    def get_veterinarian_name(self, obj):
+        return obj.veterinarian.get_full_name() or obj.veterinarian.username
+    
+    def get_resolved_this_month(self, obj):
+        # Rows not written since the month began still hold last month's count
+        return obj.resolved_this_month if obj.month == month_of(timezone.now()) else 0
+    
+    def get_mean_resolution_hours(self, obj):
+        seconds = obj.mean_resolution_seconds
+        return round(seconds / 3600, 1) if seconds is not None else None
+
+
+class CaseStatusTransitionSerializer(serializers.ModelSerializer):
+    """A step of a case's status timeline."""
+    actor_name = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = CaseStatusTransition
+        fields = ('id', 'from_status', 'to_status', 'actor', 'actor_name', 'at', 'seconds_in_from_status')
+        read_only_fields = fields
+    
+    def get_actor_name(self, obj):
+        return obj.actor.get_full_name() or obj.actor.username if obj.actor else None
@@ -0,0 +1,144 @@
+"""
+Keep the case list read model (CaseListEntry), the status journal and the
+vets' case counters in step with their sources.
+
+A saved case has its entry rebuilt, a status change its transition
+appended and its vet's counters moved, in the save's transaction
+(CaseReport.save is atomic). Changes to a user, livestock, livestock type,
+breed or disease patch the copied columns of the entries that show them with one
+UPDATE each.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.utils import timezone
+from .models import CaseListEntry
+from .read_model import USER_FIELDS, refresh, user_columns
+from . import transitions, workload
+
+# Fields of each source model that entries copy; saves limited to other
+# fields (e.g. last_login) leave entries alone
+USER_SOURCE_FIELDS = {'first_name', 'last_name', 'username', 'phone_number', 'email', 'district', 'sector'}
+LIVESTOCK_SOURCE_FIELDS = {'name', 'tag_number', 'livestock_type', 'livestock_type_id', 'breed', 'breed_id'}
+
+
+def _touches(update_fields, source_fields):
+    return update_fields is None or bool(source_fields & set(update_fields))
+
+
+def _on_case_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh([instance.pk])
+
+
+def _on_case_status_change(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    actor = getattr(instance, 'status_changed_by', None)
+    if created:
+        transitions.record(instance, '', actor.pk if actor else instance.reporter_id, instance.reported_at)
+        return
+    previous = instance.loaded_value('status')
+    # None: the case was not loaded from the database, so the change is unknown
+    if previous is not None and previous != instance.status:
+        transitions.record(instance, previous, actor.pk if actor else None)
+
+
+def _on_case_workload_change(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old = None if created else workload.loaded_state(instance)
+    if created or old is not None:
+        workload.apply(instance.pk, old, workload.current_state(instance))
+
+
+def _on_case_delete(sender, instance, **kwargs):
+    # Before the delete: a resolved case's time is read from its journal,
+    # which is deleted with it
+    workload.apply(instance.pk, workload.loaded_state(instance) or workload.current_state(instance), None)
+
+
+def _on_user_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or created or not _touches(update_fields, USER_SOURCE_FIELDS):
+        return
+    now = timezone.now()
+    for prefix in USER_FIELDS:
+        CaseListEntry.objects.filter(**{f'{prefix}_id': instance.pk}).update(
+            refreshed_at=now, **user_columns(prefix, instance)
+        )
+
+
+def _on_user_delete(sender, instance, **kwargs):
+    # Deleting a reporter deletes their cases; vets and assigners are SET_NULL
+    # on the case without a save
+    now = timezone.now()
+    for prefix in ('assigned_veterinarian', 'assigned_by'):
+        CaseListEntry.objects.filter(**{f'{prefix}_id': instance.pk}).update(
+            refreshed_at=now, **{f'{prefix}_id': None}, **user_columns(prefix, None)
+        )
+
+
+def _on_livestock_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or created or not _touches(update_fields, LIVESTOCK_SOURCE_FIELDS):
+        return
+    CaseListEntry.objects.filter(livestock_id=instance.pk).update(
+        livestock_name=instance.name,
+        livestock_tag_number=instance.tag_number,
+        livestock_type=instance.livestock_type.name,
+        livestock_breed=instance.breed.name if instance.breed_id else None,
+        refreshed_at=timezone.now(),
+    )
+
+
+def _on_livestock_type_save(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    from livestock.models import Livestock
+    CaseListEntry.objects.filter(
+        livestock_id__in=Livestock.objects.filter(livestock_type=instance).values('pk')
+    ).update(livestock_type=instance.name, refreshed_at=timezone.now())
+
+
+def _on_breed_save(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    from livestock.models import Livestock
+    CaseListEntry.objects.filter(
+        livestock_id__in=Livestock.objects.filter(breed=instance).values('pk')
+    ).update(livestock_breed=instance.name, refreshed_at=timezone.now())
+
+
+def _on_breed_delete(sender, instance, **kwargs):
+    # Before the delete sets the animals' breed to NULL
+    from livestock.models import Livestock
+    CaseListEntry.objects.filter(
+        livestock_id__in=Livestock.objects.filter(breed=instance).values('pk')
+    ).update(livestock_breed=None, refreshed_at=timezone.now())
+
+
+def _on_disease_save(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    CaseListEntry.objects.filter(suspected_disease_id=instance.pk).update(
+        suspected_disease_name=instance.name, refreshed_at=timezone.now()
+    )
+
+
+def _on_disease_delete(sender, instance, **kwargs):
+    CaseListEntry.objects.filter(suspected_disease_id=instance.pk).update(
+        suspected_disease_id=None, suspected_disease_name=None, refreshed_at=timezone.now()
+    )
+
+
+post_save.connect(_on_case_save, sender='cases.CaseReport', dispatch_uid='case_list_case_save')
+post_save.connect(_on_case_status_change, sender='cases.CaseReport', dispatch_uid='case_status_journal')
+# After the journal: a resolution's time is read from its transition
+post_save.connect(_on_case_workload_change, sender='cases.CaseReport', dispatch_uid='vet_workload_case_save')
+pre_delete.connect(_on_case_delete, sender='cases.CaseReport', dispatch_uid='vet_workload_case_delete')
+post_save.connect(_on_user_save, sender='accounts.User', dispatch_uid='case_list_user_save')
+post_delete.connect(_on_user_delete, sender='accounts.User', dispatch_uid='case_list_user_delete')
+post_save.connect(_on_livestock_save, sender='livestock.Livestock', dispatch_uid='case_list_livestock_save')
+post_save.connect(_on_livestock_type_save, sender='livestock.LivestockType', dispatch_uid='case_list_type_save')
+post_save.connect(_on_breed_save, sender='livestock.Breed', dispatch_uid='case_list_breed_save')
+pre_delete.connect(_on_breed_delete, sender='livestock.Breed', dispatch_uid='case_list_breed_delete')
+post_save.connect(_on_disease_save, sender='cases.Disease', dispatch_uid='case_list_disease_save')
+post_delete.connect(_on_disease_delete, sender='cases.Disease', dispatch_uid='case_list_disease_delete')
@@ -0,0 +1,126 @@
+"""
+The case status journal (CaseStatusTransition).
+
+Every change of a case's status appends a transition: the status left, the
+status entered, who made the change and when. Each transition also stores
+how long the case spent in the status it left, taken from the case's
+previous transition, so time-in-status analytics are one grouped scan of
+(from_status, at, seconds_in_from_status) rather than a window over every
+case's history.
+
+Saved cases get their transitions from a post_save receiver in
+cases.signals, inside the save's transaction (CaseReport.save is atomic).
+Views name the actor by setting `status_changed_by` on the case before
+saving it; a new case defaults to its reporter. Code that writes cases with
+bulk_create() or update() must call record_created() or record_changed().
+"""
+
+from django.db.models import Avg, Count, Max, Min
+from django.utils import timezone
+
+BATCH_SIZE = 5000
+
+
+def _seconds_between(start, end):
+    if start is None:
+        return None
+    return max(0, int((end - start).total_seconds()))
+
+
+def entered_at(case_ids):
+    """{case pk: time of its latest transition}, for cases that have one."""
+    from .models import CaseStatusTransition
+    case_ids = list(case_ids)
+    entered = {}
+    for start in range(0, len(case_ids), BATCH_SIZE):
+        rows = (
+            CaseStatusTransition.objects.filter(case_report_id__in=case_ids[start:start + BATCH_SIZE])
+            .order_by().values('case_report_id').annotate(latest=Max('at'))
+        )
+        entered.update((row['case_report_id'], row['latest']) for row in rows)
+    return entered
+
+
+def record(case, from_status, actor_id=None, at=None):
+    """Append the transition of a saved case from from_status to its status."""
+    from .models import CaseStatusTransition
+    at = at or timezone.now()
+    previous = None
+    if from_status:
+        previous = (
+            CaseStatusTransition.objects.filter(case_report_id=case.pk)
+            .order_by('-at').values_list('at', flat=True).first()
+        )
+    return CaseStatusTransition.objects.create(
+        case_report_id=case.pk,
+        from_status=from_status or '',
+        to_status=case.status,
+        actor_id=actor_id,
+        at=at,
+        seconds_in_from_status=_seconds_between(previous, at),
+    )
+
+
+def record_created(cases):
+    """Append the first transition of cases inserted with bulk_create()."""
+    from .models import CaseStatusTransition
+    CaseStatusTransition.objects.bulk_create([
+        CaseStatusTransition(
+            case_report_id=case.pk,
+            to_status=case.status,
+            actor_id=case.reporter_id,
+            at=case.reported_at,
+        )
+        for case in cases
+    ], batch_size=BATCH_SIZE)
+
+
+def record_changed(cases, to_status, at, actor_id=None):
+    """Append the transitions of cases moved to to_status with update().
+
+    `cases` need `pk` and `status`, the status they had before the update.
+    """
+    from .models import CaseStatusTransition
+    entered = entered_at(case.pk for case in cases)
+    CaseStatusTransition.objects.bulk_create([
+        CaseStatusTransition(
+            case_report_id=case.pk,
+            from_status=case.status,
+            to_status=to_status,
+            actor_id=actor_id,
+            at=at,
+            seconds_in_from_status=_seconds_between(entered.get(case.pk), at),
+        )
+        for case in cases
+    ], batch_size=BATCH_SIZE)
+
+
+def mean_time_in_status(since=None, until=None):
+    """Time cases spent in each status, over the stints that ended in [since, until).
+
+    Returns {status: {'count', 'mean_seconds', 'min_seconds', 'max_seconds'}}.
+    Stints still running, and those begun before the journal, are not counted.
+    """
+    from .models import CaseStatusTransition
+    transitions = CaseStatusTransition.objects.exclude(from_status='').filter(
+        seconds_in_from_status__isnull=False
+    )
+    if since is not None:
+        transitions = transitions.filter(at__gte=since)
+    if until is not None:
+        transitions = transitions.filter(at__lt=until)
+    rows = transitions.order_by().values('from_status').annotate(
+        count=Count('*'),
+        mean_seconds=Avg('seconds_in_from_status'),
+        min_seconds=Min('seconds_in_from_status'),
+        max_seconds=Max('seconds_in_from_status'),
+    )
+    return {
+        row['from_status']: {
+            'count': row['count'],
+            'mean_seconds': round(row['mean_seconds']),
+            'min_seconds': row['min_seconds'],
+            'max_seconds': row['max_seconds'],
+        }
+        for row in rows
+    }
@@ -1,29 +1,50 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import APIException
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.utils import timezone
 from django.core.mail import send_mail
 from django.conf import settings
 from django.db import transaction
+from django.db.models import Max
+from django.http import Http404
 import threading
 import logging
 from accounts.models import User
-from .models import CaseReport, Disease
-from .serializers import CaseReportSerializer, DiseaseSerializer
+from animalguardian.conditional import ConditionalGetMixin
+from reference.data import ReferenceListMixin
+from .filters import CaseListFilterBackend, facet_counts, parse_moment
+from .models import CaseListEntry, CaseReport, CaseStatusTransition, Disease, VetWorkload
+from .serializers import (
+    CaseListEntrySerializer, CaseQueueEntrySerializer, CaseReportSerializer, CaseStatusTransitionSerializer,
+    DiseaseSerializer, VetWorkloadSerializer,
+)
+from .transitions import mean_time_in_status
+from .workload import month_of
 
 logger = logging.getLogger(__name__)
 
-class CaseReportViewSet(viewsets.ModelViewSet):
+class CaseReportViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for Case reports."""
     queryset = CaseReport.objects.all()
     serializer_class = CaseReportSerializer
     permission_classes = [IsAuthenticated]
+    filter_backends = [CaseListFilterBackend]
     
     def list(self, request, *args, **kwargs):
-        """Override list to handle serialization errors gracefully."""
+        """Override list to handle serialization errors gracefully.
+        
+        ?facets=true adds counts per status, urgency and district of the
+        filtered cases, for the dashboard's filter chips.
+        """
         try:
-            return super().list(request, *args, **kwargs)
+            response = super().list(request, *args, **kwargs)
+            if request.query_params.get('facets') in ('1', 'true'):
+                response.data['facets'] = facet_counts(self.filter_queryset(self.get_queryset()))
+            return response
+        except APIException:
+            raise
         except Exception as e:
             logger.error(f"Error in CaseReportViewSet.list: {str(e)}", exc_info=True)
             return Response({
@@ -35,6 +56,8 @@ class CaseReportViewSet(viewsets.ModelViewSet):
         """Override retrieve to handle serialization errors gracefully."""
         try:
             return super().retrieve(request, *args, **kwargs)
+        except (APIException, Http404):
+            raise
         except Exception as e:
             logger.error(f"Error in CaseReportViewSet.retrieve: {str(e)}", exc_info=True)
             return Response({
@@ -43,8 +66,9 @@ class CaseReportViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     def get_queryset(self):
-        user = self.request.user
-        user_type = user.user_type
+        if self.action == 'list':
+            # One table per page instead of the eight-way join below
+            return self.scope_to_user(CaseListEntry.objects.all())
         
         # Optimize queries with select_related to prevent N+1 queries
         # This fetches related ForeignKey objects in a single query
@@ -56,18 +80,25 @@ class CaseReportViewSet(viewsets.ModelViewSet):
             'livestock__owner',   # Livestock owner (farmer)
             'livestock__livestock_type',  # Livestock type
             'livestock__breed',   # Livestock breed
+            'livestock__breed__livestock_type',  # Nested in the breed
             'suspected_disease'   # Disease suspected
         ).prefetch_related(
             # For any ManyToMany or reverse ForeignKey relationships if needed
         )
+        return self.scope_to_user(base_queryset)
+    
+    def scope_to_user(self, base_queryset):
+        """The cases the user may see, from CaseReport or CaseListEntry."""
+        user = self.request.user
+        user_type = user.user_type
         
         # Farmers: Only see their own cases
         if user_type == 'farmer':
-            return base_queryset.filter(reporter=user)
+            return base_queryset.filter(reporter_id=user.pk)
         
         # Local Vets: See cases assigned to them
         elif user_type == 'local_vet':
-            return base_queryset.filter(assigned_veterinarian=user)
+            return base_queryset.filter(assigned_veterinarian_id=user.pk)
         
         # Sector Vets and Admins: See all cases
         elif user_type in ['sector_vet', 'admin'] or user.is_staff or user.is_superuser:
@@ -75,10 +106,21 @@ class CaseReportViewSet(viewsets.ModelViewSet):
         
         # Field Officers: See cases assigned to them (if any)
         elif user_type == 'field_officer':
-            return base_queryset.filter(assigned_veterinarian=user)
+            return base_queryset.filter(assigned_veterinarian_id=user.pk)
         
         # Default: Only own cases
-        return base_queryset.filter(reporter=user)
+        return base_queryset.filter(reporter_id=user.pk)
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return CaseListEntrySerializer
+        return CaseReportSerializer
+    
+    def conditional_aggregates(self):
+        if self.action == 'list':
+            # Entries are rebuilt when a reporter, vet or livestock is renamed too
+            return {'max_refreshed_at': Max('refreshed_at')}
+        return super().conditional_aggregates()
     
     def perform_create(self, serializer):
         """Automatically set the reporter to the current user when creating a case."""
@@ -100,7 +142,8 @@ class CaseReportViewSet(viewsets.ModelViewSet):
         old_symptoms = old_instance.symptoms_observed
         old_location = old_instance.location_notes
         
-        # Save the updated instance
+        # Save the updated instance; a status change is journaled with the user
+        serializer.instance.status_changed_by = user
         instance = serializer.save()
         new_status = instance.status
         new_symptoms = instance.symptoms_observed
@@ -335,6 +378,99 @@ AnimalGuardian Team
         
         instance.delete()
     
+    @action(detail=False, methods=['get'])
+    def my_queue(self, request):
+        """The open cases assigned to a vet, most pressing first.
+        
+        Local vets and field officers get their own queue; sector vets and
+        admins pass ?veterinarian_id= to see a vet's queue.
+        """
+        user = request.user
+        if user.user_type in ['local_vet', 'field_officer']:
+            veterinarian_id = user.pk
+        elif user.is_staff or user.is_superuser or user.user_type in ['admin', 'sector_vet']:
+            try:
+                veterinarian_id = int(request.query_params['veterinarian_id'])
+            except (KeyError, ValueError):
+                return Response({
+                    'error': 'veterinarian_id parameter is required'
+                }, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            return Response({
+                'error': 'Only veterinarians have a case queue.'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        # Seeks case_list_queue_idx; the condition must match the index's
+        queue = CaseListEntry.objects.filter(
+            assigned_veterinarian_id=veterinarian_id, status__in=CaseReport.OPEN_STATUSES
+        ).order_by('-priority', 'reported_at')
+        page = self.paginate_queryset(queue)
+        serializer = CaseQueueEntrySerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+    
+    @action(detail=True, methods=['get'])
+    def timeline(self, request, pk=None):
+        """The status changes of a case, oldest first."""
+        case = self.get_object()
+        transitions = (
+            CaseStatusTransition.objects.filter(case_report_id=case.pk)
+            .select_related('actor').order_by('at', 'pk')
+        )
+        return Response({
+            'case_id': case.case_id,
+            'status': case.status,
+            'transitions': CaseStatusTransitionSerializer(transitions, many=True).data,
+        }, status=status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['get'])
+    def status_durations(self, request):
+        """Mean time cases spend in each status (sector vet/admin only).
+        
+        ?from= and ?to= (dates or ISO datetimes) limit the stints to those
+        that ended in the period.
+        """
+        user = request.user
+        if not (user.is_staff or user.is_superuser or user.user_type in ['admin', 'sector_vet']):
+            return Response({
+                'error': 'You do not have permission to view case analytics.'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        try:
+            since = parse_moment(request.query_params['from']) if request.query_params.get('from') else None
+            until = parse_moment(request.query_params['to'], end_of_day=True) if request.query_params.get('to') else None
+        except ValueError as e:
+            return Response({'error': f'Invalid period: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'from': since,
+            'to': until,
+            'statuses': mean_time_in_status(since, until),
+        }, status=status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['get'])
+    def vet_scoreboard(self, request):
+        """Case counters of each veterinarian, busiest first (sector vet/admin only).
+        
+        Read from the precomputed VetWorkload rows; ?district= and ?sector=
+        narrow it to the vets of a location.
+        """
+        user = request.user
+        if not (user.is_staff or user.is_superuser or user.user_type in ['admin', 'sector_vet']):
+            return Response({
+                'error': 'You do not have permission to view the veterinarian scoreboard.'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        scoreboard = VetWorkload.objects.select_related('veterinarian').order_by(
+            '-cases_handled', 'open_cases', 'pk'
+        )
+        if request.query_params.get('district'):
+            scoreboard = scoreboard.filter(veterinarian__district=request.query_params['district'])
+        if request.query_params.get('sector'):
+            scoreboard = scoreboard.filter(veterinarian__sector=request.query_params['sector'])
+        page = self.paginate_queryset(scoreboard)
+        serializer = VetWorkloadSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+    
     @action(detail=True, methods=['post'])
     def assign(self, request, pk=None):
         """Assign a case to a local veterinarian (sector vet/admin only)."""
@@ -377,6 +513,7 @@ AnimalGuardian Team
         case.assigned_at = timezone.now()
         case.assigned_by = assigner
         case.status = 'under_review'
+        case.status_changed_by = assigner
         case.save()
         
         # Send notifications to assigned veterinarian
@@ -452,7 +589,7 @@ AnimalGuardian Team
         district = request.query_params.get('district')
         
         from accounts.models import VeterinarianProfile
-        queryset = VeterinarianProfile.objects.filter(is_available=True)
+        queryset = VeterinarianProfile.objects.filter(is_available=True).select_related('user__case_workload')
         
         # Filter by location if provided
         if sector:
@@ -460,10 +597,12 @@ AnimalGuardian Team
         if district:
             queryset = queryset.filter(user__district=district)
         
-        # Get only local vets
+        # Get only local vets, with their current load from the precomputed counters
+        month = month_of(timezone.now())
         available_vets = []
         for profile in queryset:
             if profile.user.user_type == 'local_vet':
+                workload = getattr(profile.user, 'case_workload', None)
                 available_vets.append({
                     'id': profile.user.id,
                     'name': profile.user.get_full_name() or profile.user.username,
@@ -472,6 +611,8 @@ AnimalGuardian Team
                     'district': profile.user.district,
                     'specialization': profile.specialization,
                     'license_number': profile.license_number,
+                    'open_cases': workload.open_cases if workload else 0,
+                    'resolved_this_month': workload.resolved_this_month if workload and workload.month == month else 0,
                 })
         
         return Response({
@@ -495,6 +636,7 @@ AnimalGuardian Team
         case.assigned_at = None
         case.assigned_by = None
         case.status = 'pending'
+        case.status_changed_by = assigner
         case.save()
         
         return Response({
@@ -606,7 +748,8 @@ AnimalGuardian Team
             'case': CaseReportSerializer(case).data
         }, status=status.HTTP_200_OK)
 
-class DiseaseViewSet(viewsets.ReadOnlyModelViewSet):
+class DiseaseViewSet(ReferenceListMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for Diseases."""
-    queryset = Disease.objects.all()
+    queryset = Disease.objects.prefetch_related('affected_livestock_types')
     serializer_class = DiseaseSerializer
+    reference_list = 'diseases'
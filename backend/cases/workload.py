@@ -0,0 +1,181 @@
+"""
+Per-veterinarian case counters (VetWorkload).
+
+A case counts towards the vet it is assigned to: as open while its status
+is open, as handled once treated or resolved, as confirmed once the farmer
+confirmed completion, and, when resolved, towards the vet's resolutions of
+the month and their time from assignment to resolution (the resolution
+time being the case's latest transition to 'resolved' in the status
+journal).
+
+apply() moves a case's contribution from its old to its new state with one
+UPDATE of F() deltas per vet concerned, so concurrent changes never lose
+counts. The post_save and pre_delete receivers in cases.signals call it
+inside the case's save or delete transaction; the SLA sweep only moves
+cases between open statuses and leaves the counters as they are.
+reconcile(), run nightly and after bulk inserts, recomputes every row from
+the cases and corrects any drift.
+"""
+
+from datetime import date
+from typing import NamedTuple
+from django.apps import apps as global_apps
+from django.db.models import Case, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+# Statuses counted as cases handled by the assigned vet
+HANDLED_STATUSES = ('treated', 'resolved')
+COUNTERS = (
+    'open_cases', 'cases_handled', 'confirmed_completions', 'resolved_this_month',
+    'resolutions_timed', 'resolution_seconds',
+)
+BATCH_SIZE = 5000
+
+
+class CaseState(NamedTuple):
+    veterinarian_id: int
+    status: str
+    confirmed: bool
+    assigned_at: object
+
+
+def month_of(moment):
+    """First day of the month of `moment`, in the local time zone."""
+    local = timezone.localtime(moment)
+    return date(local.year, local.month, 1)
+
+
+def current_state(case):
+    return CaseState(
+        case.assigned_veterinarian_id, case.status, case.farmer_confirmed_completion, case.assigned_at
+    )
+
+
+def loaded_state(case):
+    """The state the case was loaded in, or None if it was not loaded."""
+    if not hasattr(case, '_loaded_values'):
+        return None
+    return CaseState(*(case.loaded_value(name) for name in (
+        'assigned_veterinarian_id', 'status', 'farmer_confirmed_completion', 'assigned_at',
+    )))
+
+
+def contribution(state, resolved_at, month):
+    """{counter: value} a case in this state adds to its vet's row."""
+    from .models import CaseReport
+    resolved = state.status == 'resolved' and resolved_at is not None
+    timed = resolved and state.assigned_at is not None
+    return {
+        'open_cases': int(state.status in CaseReport.OPEN_STATUSES),
+        'cases_handled': int(state.status in HANDLED_STATUSES),
+        'confirmed_completions': int(bool(state.confirmed)),
+        'resolved_this_month': int(resolved and month_of(resolved_at) == month),
+        'resolutions_timed': int(timed),
+        'resolution_seconds': max(0, int((resolved_at - state.assigned_at).total_seconds())) if timed else 0,
+    }
+
+
+def _resolved_at(case_pk):
+    from .models import CaseStatusTransition
+    return (
+        CaseStatusTransition.objects.filter(case_report_id=case_pk, to_status='resolved')
+        .order_by('-at').values_list('at', flat=True).first()
+    )
+
+
+def _add(veterinarian_id, deltas, month, now):
+    from accounts.models import VeterinarianProfile
+    from .models import VetWorkload
+    updates = {name: F(name) + delta for name, delta in deltas.items() if delta and name != 'resolved_this_month'}
+    # A row last written in an earlier month starts the month's count afresh
+    resolved = deltas.get('resolved_this_month', 0)
+    updates['resolved_this_month'] = Case(
+        When(month=month, then=F('resolved_this_month') + resolved), default=Value(max(resolved, 0)),
+    )
+    updates.update(month=month, updated_at=now)
+    rows = VetWorkload.objects.filter(pk=veterinarian_id)
+    if not rows.update(**updates):
+        VetWorkload.objects.get_or_create(veterinarian_id=veterinarian_id, defaults={'updated_at': now})
+        rows.update(**updates)
+    if deltas.get('cases_handled'):
+        VeterinarianProfile.objects.filter(user_id=veterinarian_id).update(
+            total_cases_handled=Greatest(F('total_cases_handled') + deltas['cases_handled'], Value(0))
+        )
+
+
+def apply(case_pk, old, new, now=None):
+    """Move a case's contribution from state `old` to state `new` (either may be None)."""
+    if old == new:
+        return
+    now = now or timezone.now()
+    month = month_of(now)
+    resolved_at = None
+    if 'resolved' in (getattr(old, 'status', None), getattr(new, 'status', None)):
+        resolved_at = _resolved_at(case_pk)
+    deltas = {}
+    for state, sign in ((old, -1), (new, 1)):
+        if state is None or state.veterinarian_id is None:
+            continue
+        vet_deltas = deltas.setdefault(state.veterinarian_id, dict.fromkeys(COUNTERS, 0))
+        for name, value in contribution(state, resolved_at, month).items():
+            vet_deltas[name] += sign * value
+    for veterinarian_id, vet_deltas in deltas.items():
+        if any(vet_deltas.values()):
+            _add(veterinarian_id, vet_deltas, month, now)
+
+
+def reconcile(now=None, apps=global_apps):
+    """Recompute every vet's row from the cases; returns how many rows changed.
+
+    `apps` may be a migration's app registry.
+    """
+    CaseReport = apps.get_model('cases', 'CaseReport')
+    CaseStatusTransition = apps.get_model('cases', 'CaseStatusTransition')
+    VetWorkload = apps.get_model('cases', 'VetWorkload')
+    VeterinarianProfile = apps.get_model('accounts', 'VeterinarianProfile')
+    now = now or timezone.now()
+    month = month_of(now)
+
+    latest_resolution = (
+        CaseStatusTransition.objects.filter(case_report=OuterRef('pk'), to_status='resolved')
+        .order_by('-at').values('at')[:1]
+    )
+    cases = (
+        CaseReport.objects.filter(assigned_veterinarian__isnull=False)
+        .annotate(resolved_at=Case(When(status='resolved', then=Subquery(latest_resolution))))
+        .order_by().values_list(
+            'assigned_veterinarian_id', 'status', 'farmer_confirmed_completion', 'assigned_at', 'resolved_at',
+        )
+    )
+    totals = {}
+    for veterinarian_id, status, confirmed, assigned_at, resolved_at in cases.iterator(chunk_size=BATCH_SIZE):
+        vet_totals = totals.setdefault(veterinarian_id, dict.fromkeys(COUNTERS, 0))
+        state = CaseState(veterinarian_id, status, confirmed, assigned_at)
+        for name, value in contribution(state, resolved_at, month).items():
+            vet_totals[name] += value
+
+    existing = {row.pk: row for row in VetWorkload.objects.all()}
+    changed = []
+    for veterinarian_id in set(totals) | set(existing):
+        vet_totals = totals.get(veterinarian_id, dict.fromkeys(COUNTERS, 0))
+        row = existing.get(veterinarian_id)
+        if row is not None and row.month == month and all(
+            getattr(row, name) == value for name, value in vet_totals.items()
+        ):
+            continue
+        changed.append(VetWorkload(veterinarian_id=veterinarian_id, month=month, updated_at=now, **vet_totals))
+    VetWorkload.objects.bulk_create(
+        changed, batch_size=BATCH_SIZE, update_conflicts=True, unique_fields=['veterinarian'],
+        update_fields=list(COUNTERS) + ['month', 'updated_at'],
+    )
+
+    profiles = list(VeterinarianProfile.objects.only('pk', 'user_id', 'total_cases_handled'))
+    stale_profiles = []
+    for profile in profiles:
+        handled = totals.get(profile.user_id, {}).get('cases_handled', 0)
+        if profile.total_cases_handled != handled:
+            profile.total_cases_handled = handled
+            stale_profiles.append(profile)
+    VeterinarianProfile.objects.bulk_update(stale_profiles, ['total_cases_handled'], batch_size=BATCH_SIZE)
+    return len(changed)
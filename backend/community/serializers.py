@@ -33,6 +33,8 @@ class PostSerializer(serializers.ModelSerializer):
     def get_is_liked(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            if hasattr(obj, 'is_liked_by_user'):
+                return obj.is_liked_by_user
             return PostLike.objects.filter(post=obj, user=request.user).exists()
         return False
 
@@ -83,6 +85,16 @@ class ConversationSerializer(serializers.ModelSerializer):
         return obj.participant2.get_full_name() or obj.participant2.username
     
     def get_last_message(self, obj):
+        if hasattr(obj, 'last_message_id'):
+            # Annotated by ConversationViewSet.get_queryset
+            if obj.last_message_id is None:
+                return None
+            return {
+                'id': obj.last_message_id,
+                'content': obj.last_message_content,
+                'sender_id': obj.last_message_sender_id,
+                'created_at': obj.last_message_created_at.isoformat(),
+            }
         last_msg = obj.get_last_message()
         if last_msg:
             return {
@@ -96,6 +108,8 @@ class ConversationSerializer(serializers.ModelSerializer):
     def get_unread_count(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            if hasattr(obj, 'unread'):
+                return obj.unread
             return obj.messages.filter(is_read=False).exclude(sender=request.user).count()
         return 0
     
@@ -2,8 +2,9 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.db.models import Q
+from django.db.models import Count, Exists, Max, OuterRef, Prefetch, Q, Subquery
 from accounts.models import User
+from animalguardian.conditional import ConditionalGetMixin
 from .models import Post, PostLike, Comment, Conversation, Message
 from .serializers import (
     PostSerializer, PostLikeSerializer, CommentSerializer,
@@ -17,6 +18,14 @@ class PostViewSet(viewsets.ModelViewSet):
     serializer_class = PostSerializer
     permission_classes = [IsAuthenticated]
     
+    def get_queryset(self):
+        # Authors, comments and the user's likes in a fixed number of queries
+        return Post.objects.select_related('author').prefetch_related(
+            Prefetch('comments', queryset=Comment.objects.select_related('author'))
+        ).annotate(
+            is_liked_by_user=Exists(PostLike.objects.filter(post=OuterRef('pk'), user=self.request.user))
+        )
+    
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
     
@@ -43,7 +52,7 @@ class PostViewSet(viewsets.ModelViewSet):
 
 class CommentViewSet(viewsets.ModelViewSet):
     """ViewSet for post comments."""
-    queryset = Comment.objects.all()
+    queryset = Comment.objects.select_related('author')
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated]
     
@@ -55,17 +64,39 @@ class CommentViewSet(viewsets.ModelViewSet):
         post.save()
 
 
-class ConversationViewSet(viewsets.ModelViewSet):
+class ConversationViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for chat conversations."""
     serializer_class = ConversationSerializer
     permission_classes = [IsAuthenticated]
     
+    def conditional_queryset(self):
+        """The conversations without the per-row annotations; mark_read
+        updates messages only, so the unread count is part of the validator."""
+        user = self.request.user
+        return Conversation.objects.filter(Q(participant1=user) | Q(participant2=user))
+    
+    def conditional_aggregates(self):
+        user = self.request.user
+        return {
+            'max_updated_at': Max('updated_at'),
+            'max_message_at': Max('messages__created_at'),
+            'unread': Count('messages', filter=Q(messages__is_read=False) & ~Q(messages__sender=user)),
+        }
+    
     def get_queryset(self):
         """Get conversations where the current user is a participant."""
         user = self.request.user
+        last_message = Message.objects.filter(conversation=OuterRef('pk')).order_by('-created_at')
+        # The serializer reads these annotations instead of querying per conversation
         return Conversation.objects.filter(
             Q(participant1=user) | Q(participant2=user)
-        ).distinct()
+        ).select_related('participant1', 'participant2').annotate(
+            unread=Count('messages', filter=Q(messages__is_read=False) & ~Q(messages__sender=user)),
+            last_message_id=Subquery(last_message.values('id')[:1]),
+            last_message_content=Subquery(last_message.values('content')[:1]),
+            last_message_sender_id=Subquery(last_message.values('sender_id')[:1]),
+            last_message_created_at=Subquery(last_message.values('created_at')[:1]),
+        ).order_by('-updated_at')  # Meta.ordering does not apply to aggregations
     
     def get_serializer_context(self):
         """Add request to serializer context."""
@@ -145,7 +176,7 @@ class MessageViewSet(viewsets.ModelViewSet):
             ).first()
             
             if conversation:
-                return Message.objects.filter(conversation=conversation)
+                return Message.objects.filter(conversation=conversation).select_related('sender')
         
         return Message.objects.none()
     
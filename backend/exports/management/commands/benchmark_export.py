@@ -0,0 +1,90 @@
+"""
+Django management command to check that exports run in constant memory.
+
+Seeds synthetic livestock rows (if the table holds fewer than requested),
+streams the export to /dev/null and samples the process RSS every 10% of
+rows. A flat RSS column means memory does not grow with row count.
+
+Usage:
+    python manage.py benchmark_export --rows 1000000
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from exports.streaming import EXPORTS, EXPORT_CHUNK_SIZE, encode
+import os
+import resource
+import time
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB."""
+    try:
+        with open('/proc/self/statm') as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # Not Linux: fall back to the peak, which is still flat if usage is
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Command(BaseCommand):
+    help = 'Measure RSS while streaming a large livestock export'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000, help='Rows to export')
+        parser.add_argument('--format', dest='export_format', choices=['csv', 'ndjson'], default='csv')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+
+    def _seed(self, rows):
+        from accounts.models import User
+        from livestock.models import Livestock, LivestockType
+
+        existing = Livestock.objects.count()
+        if existing >= rows:
+            return
+        owner, _ = User.objects.get_or_create(
+            phone_number='0780000000',
+            defaults={'username': 'export-benchmark', 'user_type': 'farmer'},
+        )
+        livestock_type, _ = LivestockType.objects.get_or_create(name='Cattle')
+        missing = rows - existing
+        self.stdout.write(f'Seeding {missing} livestock rows...')
+        batch_size = 5000
+        with transaction.atomic():
+            for start in range(0, missing, batch_size):
+                Livestock.objects.bulk_create([
+                    Livestock(owner=owner, livestock_type=livestock_type, gender='F', name=f'Bench {existing + i}')
+                    for i in range(start, min(start + batch_size, missing))
+                ])
+
+    def handle(self, *args, **options):
+        rows_wanted = options['rows']
+        self._seed(rows_wanted)
+
+        spec = EXPORTS['livestock']
+        queryset = spec.queryset().order_by()[:rows_wanted]
+        lines = encode(options['export_format'], spec.headers, spec.rows(queryset, options['chunk_size']))
+
+        checkpoint = max(rows_wanted // 10, 1)
+        baseline = current_rss_mb()
+        self.stdout.write(f'{"rows":>10}  {"rss_mb":>8}  {"elapsed_s":>9}')
+        self.stdout.write(f'{0:>10}  {baseline:>8.1f}  {0:>9.2f}')
+
+        started = time.perf_counter()
+        exported = 0
+        peak = baseline
+        with open(os.devnull, 'w') as sink:
+            for line in lines:
+                sink.write(line)
+                exported += 1
+                if exported % checkpoint == 0:
+                    rss = current_rss_mb()
+                    peak = max(peak, rss)
+                    self.stdout.write(f'{exported:>10}  {rss:>8.1f}  {time.perf_counter() - started:>9.2f}')
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported {exported} lines in {elapsed:.1f}s '
+            f'({exported / elapsed if elapsed else 0:.0f} rows/s); '
+            f'RSS grew {peak - baseline:.1f} MB over baseline'
+        ))
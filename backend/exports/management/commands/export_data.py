@@ -0,0 +1,47 @@
+"""
+Django management command to export a reporting dataset as CSV or NDJSON.
+
+Streams rows straight to the output file, so memory stays flat however
+large the table is.
+
+Usage:
+    python manage.py export_data cases --format csv --output cases.csv
+    python manage.py export_data vaccinations --format ndjson > vaccinations.ndjson
+"""
+from django.core.management.base import BaseCommand, CommandError
+from exports.streaming import EXPORTS, EXPORT_FORMATS, EXPORT_CHUNK_SIZE, encode
+import sys
+
+
+class Command(BaseCommand):
+    help = 'Export cases, livestock, vaccinations or notifications as CSV/NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(EXPORTS))
+        parser.add_argument('--format', dest='export_format', choices=sorted(EXPORT_FORMATS), default='csv')
+        parser.add_argument('--output', help='File to write (default: stdout)')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE,
+                            help='Rows fetched from the database per round trip')
+
+    def handle(self, *args, **options):
+        spec = EXPORTS[options['dataset']]
+        rows = spec.rows(spec.queryset(), chunk_size=options['chunk_size'])
+        lines = encode(options['export_format'], spec.headers, rows)
+
+        output = options.get('output')
+        try:
+            stream = open(output, 'w', newline='', encoding='utf-8') if output else sys.stdout
+        except OSError as e:
+            raise CommandError(f'Cannot open {output}: {e}')
+
+        count = -1 if options['export_format'] == 'csv' else 0  # Don't count the CSV header
+        try:
+            for line in lines:
+                stream.write(line)
+                count += 1
+        finally:
+            if output:
+                stream.close()
+
+        if output and options.get('verbosity', 1) >= 1:
+            self.stdout.write(self.style.SUCCESS(f'Exported {count} rows to {output}'))
@@ -0,0 +1,178 @@
+"""
+Streaming CSV/NDJSON exports of reporting datasets.
+
+Rows are read with ``values_list(...).iterator(chunk_size=...)`` and encoded
+one at a time, so memory use does not depend on how many rows are exported.
+"""
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+import csv
+import json
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def _viewset_queryset(viewset_path, request):
+    """Queryset of a list endpoint, so exports apply the same scoping."""
+    viewset = import_string(viewset_path)(request=request, kwargs={}, format_kwarg=None)
+    # Not a routed action: list endpoints serving a read model (cases) fall
+    # back to the model's own queryset, which the export columns look up
+    viewset.action = None
+    return viewset.get_queryset()
+
+
+def _vaccination_queryset(request):
+    from livestock.models import VaccinationRecord
+    user = request.user
+    queryset = VaccinationRecord.objects.all()
+    if user.user_type in ['sector_vet', 'admin'] or user.is_staff or user.is_superuser:
+        return queryset
+    livestock = _viewset_queryset('livestock.views.LivestockViewSet', request)
+    return queryset.filter(livestock__in=livestock.values('id'))
+
+
+class ExportSpec:
+    """Columns and source queryset of one exportable dataset."""
+
+    def __init__(self, model_path, columns, queryset=None, viewset=None):
+        self.model_path = model_path
+        self.columns = columns  # [(header, ORM lookup)]
+        self._queryset = queryset
+        self.viewset = viewset
+
+    @property
+    def headers(self):
+        return [header for header, _ in self.columns]
+
+    @property
+    def lookups(self):
+        return [lookup for _, lookup in self.columns]
+
+    def queryset(self, request=None):
+        """Rows visible to the requesting user, or every row without a request."""
+        if request is None:
+            from django.apps import apps
+            return apps.get_model(self.model_path).objects.all()
+        if self._queryset:
+            return self._queryset(request)
+        return _viewset_queryset(self.viewset, request)
+
+    def rows(self, queryset, chunk_size=EXPORT_CHUNK_SIZE):
+        # values_list drops the list endpoints' select_related and only
+        # joins what the columns need
+        return queryset.values_list(*self.lookups).iterator(chunk_size=chunk_size)
+
+
+EXPORTS = {
+    'cases': ExportSpec(
+        'cases.CaseReport',
+        viewset='cases.views.CaseReportViewSet',
+        columns=[
+            ('case_id', 'case_id'),
+            ('status', 'status'),
+            ('urgency', 'urgency'),
+            ('reporter_phone', 'reporter__phone_number'),
+            ('reporter_first_name', 'reporter__first_name'),
+            ('reporter_last_name', 'reporter__last_name'),
+            ('district', 'reporter__district'),
+            ('sector', 'reporter__sector'),
+            ('assigned_veterinarian_phone', 'assigned_veterinarian__phone_number'),
+            ('livestock_tag_number', 'livestock__tag_number'),
+            ('livestock_type', 'livestock__livestock_type__name'),
+            ('suspected_disease', 'suspected_disease__name'),
+            ('number_of_affected_animals', 'number_of_affected_animals'),
+            ('farmer_confirmed_completion', 'farmer_confirmed_completion'),
+            ('reported_at', 'reported_at'),
+            ('assigned_at', 'assigned_at'),
+            ('updated_at', 'updated_at'),
+        ],
+    ),
+    'livestock': ExportSpec(
+        'livestock.Livestock',
+        viewset='livestock.views.LivestockViewSet',
+        columns=[
+            ('id', 'id'),
+            ('tag_number', 'tag_number'),
+            ('name', 'name'),
+            ('livestock_type', 'livestock_type__name'),
+            ('breed', 'breed__name'),
+            ('gender', 'gender'),
+            ('status', 'status'),
+            ('birth_date', 'birth_date'),
+            ('owner_phone', 'owner__phone_number'),
+            ('district', 'owner__district'),
+            ('sector', 'owner__sector'),
+            ('last_vaccination_date', 'last_vaccination_date'),
+            ('is_pregnant', 'is_pregnant'),
+            ('expected_delivery_date', 'expected_delivery_date'),
+            ('created_at', 'created_at'),
+            ('updated_at', 'updated_at'),
+        ],
+    ),
+    'vaccinations': ExportSpec(
+        'livestock.VaccinationRecord',
+        queryset=_vaccination_queryset,
+        columns=[
+            ('id', 'id'),
+            ('livestock_id', 'livestock_id'),
+            ('livestock_tag_number', 'livestock__tag_number'),
+            ('owner_phone', 'livestock__owner__phone_number'),
+            ('district', 'livestock__owner__district'),
+            ('vaccine_name', 'vaccine_name'),
+            ('vaccine_type', 'vaccine_type'),
+            ('vaccination_date', 'vaccination_date'),
+            ('next_due_date', 'next_due_date'),
+            ('batch_number', 'batch_number'),
+            ('veterinarian_phone', 'veterinarian__phone_number'),
+            ('created_at', 'created_at'),
+        ],
+    ),
+    'notifications': ExportSpec(
+        'notifications.Notification',
+        viewset='notifications.views.NotificationViewSet',
+        columns=[
+            ('id', 'id'),
+            ('recipient_phone', 'recipient__phone_number'),
+            ('channel', 'channel'),
+            ('title', 'title'),
+            ('message', 'message'),
+            ('status', 'status'),
+            ('related_case_id', 'related_case__case_id'),
+            ('created_at', 'created_at'),
+            ('sent_at', 'sent_at'),
+            ('read_at', 'read_at'),
+        ],
+    ),
+}
+
+
+class _Echo:
+    """File-like object whose write() hands back the line to yield."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(headers, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(headers, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(headers, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+def encode(export_format, headers, rows):
+    """Lazily encode rows in the requested format."""
+    if export_format == 'csv':
+        return csv_lines(headers, rows)
+    return ndjson_lines(headers, rows)
@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('<str:dataset>.<str:export_format>', views.export_dataset, name='export-dataset'),
+]
@@ -0,0 +1,40 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from .streaming import EXPORTS, EXPORT_FORMATS, encode
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_dataset(request, dataset, export_format):
+    """Stream a full export of a dataset as CSV or NDJSON.
+
+    Rows are scoped exactly like the matching list endpoint, so each role
+    exports what it can already page through.
+    """
+    spec = EXPORTS.get(dataset)
+    if spec is None:
+        return Response({
+            'error': f'Unknown dataset. Available: {", ".join(EXPORTS)}'
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    if export_format not in EXPORT_FORMATS:
+        return Response({
+            'error': f'Unknown format. Available: {", ".join(EXPORT_FORMATS)}'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    rows = spec.rows(spec.queryset(request))
+    response = StreamingHttpResponse(
+        encode(export_format, spec.headers, rows),
+        content_type=EXPORT_FORMATS[export_format],
+    )
+    filename = f"{dataset}-{timezone.now().strftime('%Y%m%d%H%M%S')}.{export_format}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    logger.info(f"Streaming {dataset} export ({export_format}) for user {request.user.id}")
+    return response
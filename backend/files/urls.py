@@ -1,7 +1,10 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+# The async view only pays off under asgi.py; WSGI workers serve the DRF one
+ASYNC_VIEWS = settings.SERVER_PROFILE == 'asgi'
+
 urlpatterns = [
-    path('upload/', views.upload_file, name='upload_file'),
+    path('upload/', views.upload_file_async if ASYNC_VIEWS else views.upload_file, name='upload_file'),
 ]
-
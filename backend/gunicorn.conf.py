@@ -0,0 +1,11 @@
+"""
+Gunicorn hooks shared by the server profiles of render-start.sh; the
+command line there holds the worker settings.
+"""
+
+
+def post_worker_init(worker):
+    # After the fork and the application import, before the accept loop, so
+    # the first request a new or recycled worker serves is not a cold one
+    from animalguardian.warmup import warm_up
+    warm_up()
@@ -0,0 +1,112 @@
+"""
+Sub-resources of the mobile home screen.
+
+Each part resolves on its own, so the home view runs them concurrently and
+answers with whatever is ready within each part's time budget. A part is
+cached for `ttl` seconds (0: always fresh), per user or, if `shared`, once
+for everyone; a part that misses its budget or fails is sent as its
+`placeholder`.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable
+from django.db.models import Count
+from cases.models import CaseReport
+from community.models import Post
+from livestock.models import Livestock
+from notifications import unread
+from notifications.models import Notification
+from notifications.serializers import NotificationSerializer
+from weather.views import current_weather
+
+RECENT_ITEMS = 5
+
+
+@dataclass(frozen=True)
+class Part:
+    name: str
+    # resolve(user, params) returns the part's data
+    resolve: Callable
+    ttl: int = 0
+    budget: float = 1.0  # Seconds
+    shared: bool = False
+    placeholder: Any = None
+    # Query parameters the data depends on
+    params: tuple = ()
+
+    def cache_key(self, user, params):
+        scope = 'shared' if self.shared else user.id
+        values = ':'.join(params.get(name, '') for name in self.params)
+        return f'home:{self.name}:{scope}:{values}'
+
+
+def livestock_summary(user, params):
+    by_status, by_type = {}, {}
+    rows = (
+        Livestock.objects.filter(owner=user).order_by()
+        .values('status', 'livestock_type__name').annotate(count=Count('id'))
+    )
+    for row in rows:
+        by_status[row['status']] = by_status.get(row['status'], 0) + row['count']
+        by_type[row['livestock_type__name']] = by_type.get(row['livestock_type__name'], 0) + row['count']
+    return {'total': sum(by_status.values()), 'by_status': by_status, 'by_type': by_type}
+
+
+def recent_cases(user, params):
+    cases = (
+        CaseReport.objects.filter(reporter=user)
+        .select_related('livestock', 'suspected_disease').order_by('-reported_at')[:RECENT_ITEMS]
+    )
+    return [
+        {
+            'id': case.id,
+            'case_id': case.case_id,
+            'status': case.status,
+            'urgency': case.urgency,
+            'livestock_name': case.livestock.name if case.livestock else None,
+            'suspected_disease': case.suspected_disease.name if case.suspected_disease else None,
+            'reported_at': case.reported_at,
+        }
+        for case in cases
+    ]
+
+
+def unread_notifications(user, params):
+    latest = Notification.objects.filter(
+        recipient=user, status__in=unread.UNREAD_STATUSES
+    ).order_by('-created_at')[:RECENT_ITEMS]
+    return {
+        'unread_count': unread.unread_count(user.id),
+        'latest': NotificationSerializer(latest, many=True).data,
+    }
+
+
+def weather(user, params):
+    # Default location (Kigali, Rwanda), as /api/weather/
+    return current_weather(float(params.get('lat', '-1.9441')), float(params.get('lon', '30.0619')))
+
+
+def latest_posts(user, params):
+    posts = Post.objects.select_related('author').order_by('-created_at')[:RECENT_ITEMS]
+    return [
+        {
+            'id': post.id,
+            'title': post.title,
+            'author_name': post.author.full_name,
+            'image': post.image,
+            'likes_count': post.likes_count,
+            'comments_count': post.comments_count,
+            'created_at': post.created_at,
+        }
+        for post in posts
+    ]
+
+
+PARTS = [
+    Part('livestock_summary', livestock_summary, ttl=60, placeholder={}),
+    Part('recent_cases', recent_cases, ttl=30, placeholder=[]),
+    Part('unread_notifications', unread_notifications, placeholder={}),
+    Part('weather', weather, ttl=600, budget=1.5, shared=True, params=('lat', 'lon')),
+    Part('latest_posts', latest_posts, ttl=60, shared=True, placeholder=[]),
+]
+PARTS_BY_NAME = {part.name: part for part in PARTS}
@@ -0,0 +1,88 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from .parts import PARTS, PARTS_BY_NAME
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Shared by all requests of the process, so a burst of home screens cannot
+# open more than HOME_PART_WORKERS extra database connections
+_executor = ThreadPoolExecutor(max_workers=settings.HOME_PART_WORKERS, thread_name_prefix='home-part')
+
+
+def _resolve(part, cache_key, user, params):
+    """Resolve a part in a pool thread and cache it, even if the request
+    has stopped waiting for it. Returns (data, milliseconds)."""
+    started = time.monotonic()
+    try:
+        data = part.resolve(user, params)
+        if part.ttl:
+            cache.set(cache_key, data, part.ttl)
+        return data, round((time.monotonic() - started) * 1000)
+    finally:
+        # Pool threads outlive requests; close connections as request_finished would
+        close_old_connections()
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def home_screen(request):
+    """Everything the farmer home screen shows, in one round trip.
+
+    ?parts=weather,recent_cases selects parts (default: all) and
+    ?refresh=1 skips the cached copies. Uncached parts are resolved
+    concurrently; a part that misses its time budget or fails is sent as
+    its placeholder, with its status in `meta`.
+    """
+    names = request.query_params.get('parts')
+    if names:
+        names = [name.strip() for name in names.split(',') if name.strip()]
+        unknown = [name for name in names if name not in PARTS_BY_NAME]
+        if unknown:
+            return Response(
+                {'error': f'Unknown parts: {", ".join(unknown)}', 'available': list(PARTS_BY_NAME)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        selected = [PARTS_BY_NAME[name] for name in dict.fromkeys(names)]
+    else:
+        selected = PARTS
+
+    user = request.user
+    params = request.query_params
+    started = time.monotonic()
+    keys = {part.name: part.cache_key(user, params) for part in selected}
+    refresh = params.get('refresh') in ('1', 'true')
+    cached = {} if refresh else cache.get_many([keys[part.name] for part in selected if part.ttl])
+
+    parts, meta, futures = {}, {}, {}
+    for part in selected:
+        if keys[part.name] in cached:
+            parts[part.name] = cached[keys[part.name]]
+            meta[part.name] = {'status': 'cached'}
+        else:
+            futures[part.name] = _executor.submit(_resolve, part, keys[part.name], user, params)
+
+    for name, future in futures.items():
+        part = PARTS_BY_NAME[name]
+        try:
+            parts[name], ms = future.result(timeout=max(0, started + part.budget - time.monotonic()))
+            meta[name] = {'status': 'fresh', 'ms': ms}
+        except TimeoutError:
+            parts[name] = part.placeholder
+            meta[name] = {'status': 'timeout', 'ms': round(part.budget * 1000)}
+        except Exception as e:
+            logger.warning(f"Home screen part {name} failed: {e}")
+            parts[name] = part.placeholder
+            meta[name] = {'status': 'error'}
+
+    return Response({
+        'parts': {part.name: parts[part.name] for part in selected},
+        'meta': {part.name: meta[part.name] for part in selected},
+    })
@@ -0,0 +1,214 @@
+"""
+Per-farmer herd summaries (HerdSummary).
+
+The farmer home screen shows how many animals a farmer has by status and
+by type, the expected deliveries and the next vaccination due. Rather than
+paging through the farmer's livestock, it reads their HerdSummary row.
+
+Counts move incrementally: a saved or deleted animal takes its owner's row
+FOR UPDATE, subtracts what the animal counted for as loaded and adds what
+it counts for as saved, in the save's transaction (Livestock.save is
+atomic). The earliest expected delivery and vaccination due date cannot be
+moved that way when the animal holding them changes, so they are re-read
+from the farmer's livestock (one query on the owner index) when an
+animal's delivery date or herd membership changes, or a vaccination is
+saved or deleted. The receivers are in livestock.signals.
+
+rebuild() recomputes summaries in bulk from the livestock tables, for
+bulk inserts (sync batches, benchmark data) and the repair command.
+"""
+
+from typing import NamedTuple
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.utils import timezone
+
+# Animals in these statuses are no longer part of the herd
+OUT_OF_HERD = ('deceased', 'sold')
+BATCH_SIZE = 1000
+
+
+class AnimalState(NamedTuple):
+    owner_id: int
+    status: str
+    livestock_type_id: int
+    is_pregnant: bool
+    expected_delivery_date: object
+
+
+def current_state(livestock):
+    return AnimalState(*(livestock.__dict__.get(name) for name in livestock.TRACKED_FIELDS))
+
+
+def loaded_state(livestock):
+    """The state the animal was loaded in, or None if it was not loaded."""
+    if not hasattr(livestock, '_loaded_values'):
+        return None
+    return AnimalState(*(livestock.loaded_value(name) for name in livestock.TRACKED_FIELDS))
+
+
+def in_herd(state):
+    return state is not None and state.status not in OUT_OF_HERD
+
+
+def _delivery(state):
+    if in_herd(state) and state.is_pregnant and state.expected_delivery_date:
+        return state.expected_delivery_date
+    return None
+
+
+def _adjust(summary, state, sign):
+    summary.by_status[state.status] = summary.by_status.get(state.status, 0) + sign
+    if not summary.by_status[state.status]:
+        del summary.by_status[state.status]
+    if not in_herd(state):
+        return
+    summary.total_livestock += sign
+    type_key = str(state.livestock_type_id)
+    summary.by_type[type_key] = summary.by_type.get(type_key, 0) + sign
+    if not summary.by_type[type_key]:
+        del summary.by_type[type_key]
+    if _delivery(state):
+        summary.expected_deliveries += sign
+
+
+def _herd(livestock_model, owner_ids):
+    return livestock_model.objects.filter(owner_id__in=owner_ids).exclude(status__in=OUT_OF_HERD)
+
+
+def _next_deliveries(livestock_model, owner_ids):
+    """{owner id: (expected deliveries, earliest delivery date)}."""
+    rows = (
+        _herd(livestock_model, owner_ids).filter(is_pregnant=True, expected_delivery_date__isnull=False)
+        .order_by().values('owner_id').annotate(count=Count('*'), earliest=Min('expected_delivery_date'))
+    )
+    return {row['owner_id']: (row['count'], row['earliest']) for row in rows}
+
+
+def _next_vaccinations(livestock_model, vaccination_model, owner_ids):
+    """{owner id: (earliest due date, livestock id)} over each animal's latest vaccination."""
+    latest_due = (
+        vaccination_model.objects.filter(livestock=OuterRef('pk'))
+        .order_by('-vaccination_date', '-pk').values('next_due_date')[:1]
+    )
+    rows = (
+        _herd(livestock_model, owner_ids).annotate(due=Subquery(latest_due)).filter(due__isnull=False)
+        .order_by('owner_id', 'due', 'pk').values_list('owner_id', 'due', 'pk')
+    )
+    earliest = {}
+    for owner_id, due, livestock_id in rows:
+        earliest.setdefault(owner_id, (due, livestock_id))
+    return earliest
+
+
+def _sync_profile_count(summary):
+    from accounts.models import FarmerProfile
+    FarmerProfile.objects.filter(user_id=summary.owner_id).exclude(
+        total_livestock_count=summary.total_livestock
+    ).update(total_livestock_count=summary.total_livestock)
+
+
+def _locked_summary(owner_id, create):
+    from .models import HerdSummary
+    rows = HerdSummary.objects.select_for_update().filter(pk=owner_id)
+    summary = rows.first()
+    if summary is None and create:
+        HerdSummary.objects.get_or_create(owner_id=owner_id)
+        summary = rows.first()
+    return summary
+
+
+def livestock_changed(old, new):
+    """Move an animal from state `old` to state `new` (None when created or deleted)."""
+    from .models import Livestock, VaccinationRecord
+    if old == new:
+        return
+    owner_ids = {state.owner_id for state in (old, new) if state is not None}
+    for owner_id in owner_ids:
+        before = old if old is not None and old.owner_id == owner_id else None
+        after = new if new is not None and new.owner_id == owner_id else None
+        # Deleting an owner deletes their summary with their livestock; never recreate it
+        summary = _locked_summary(owner_id, create=after is not None)
+        if summary is None:
+            continue
+        if before is not None:
+            _adjust(summary, before, -1)
+        if after is not None:
+            _adjust(summary, after, 1)
+        if _delivery(before) != _delivery(after):
+            summary.next_expected_delivery = _next_deliveries(Livestock, [owner_id]).get(owner_id, (0, None))[1]
+        if in_herd(before) != in_herd(after):
+            summary.next_vaccination_due, summary.next_vaccination_livestock_id = _next_vaccinations(
+                Livestock, VaccinationRecord, [owner_id]
+            ).get(owner_id, (None, None))
+        summary.save()
+        _sync_profile_count(summary)
+
+
+def vaccinations_changed(owner_id, create=True):
+    """Re-read the next vaccination due of a farmer's herd."""
+    from .models import Livestock, VaccinationRecord
+    # VaccinationRecord.save is not atomic; the row lock needs a transaction
+    with transaction.atomic():
+        summary = _locked_summary(owner_id, create)
+        if summary is None:
+            return
+        due = _next_vaccinations(Livestock, VaccinationRecord, [owner_id]).get(owner_id, (None, None))
+        if due != (summary.next_vaccination_due, summary.next_vaccination_livestock_id):
+            summary.next_vaccination_due, summary.next_vaccination_livestock_id = due
+            summary.save(update_fields=['next_vaccination_due', 'next_vaccination_livestock_id', 'updated_at'])
+
+
+def rebuild(owner_ids=None, apps=global_apps):
+    """Recompute the summaries of these owners (all owners when None).
+
+    Returns how many summaries were written. `apps` may be a migration's
+    app registry.
+    """
+    Livestock = apps.get_model('livestock', 'Livestock')
+    VaccinationRecord = apps.get_model('livestock', 'VaccinationRecord')
+    HerdSummary = apps.get_model('livestock', 'HerdSummary')
+    FarmerProfile = apps.get_model('accounts', 'FarmerProfile')
+
+    if owner_ids is None:
+        owner_ids = set(Livestock.objects.order_by().values_list('owner_id', flat=True).distinct())
+        owner_ids |= set(HerdSummary.objects.values_list('pk', flat=True))
+    owner_ids = sorted(set(owner_ids))
+    written = 0
+    now = timezone.now()
+    for start in range(0, len(owner_ids), BATCH_SIZE):
+        batch = owner_ids[start:start + BATCH_SIZE]
+        summaries = {owner_id: HerdSummary(owner_id=owner_id, by_status={}, by_type={}, updated_at=now) for owner_id in batch}
+        counts = (
+            Livestock.objects.filter(owner_id__in=batch).order_by()
+            .values('owner_id', 'status', 'livestock_type_id').annotate(count=Count('*'))
+        )
+        for row in counts:
+            summary = summaries[row['owner_id']]
+            summary.by_status[row['status']] = summary.by_status.get(row['status'], 0) + row['count']
+            if row['status'] not in OUT_OF_HERD:
+                summary.total_livestock += row['count']
+                type_key = str(row['livestock_type_id'])
+                summary.by_type[type_key] = summary.by_type.get(type_key, 0) + row['count']
+        for owner_id, (count, earliest) in _next_deliveries(Livestock, batch).items():
+            summaries[owner_id].expected_deliveries = count
+            summaries[owner_id].next_expected_delivery = earliest
+        for owner_id, (due, livestock_id) in _next_vaccinations(Livestock, VaccinationRecord, batch).items():
+            summaries[owner_id].next_vaccination_due = due
+            summaries[owner_id].next_vaccination_livestock_id = livestock_id
+
+        HerdSummary.objects.bulk_create(
+            summaries.values(), update_conflicts=True, unique_fields=['owner'],
+            update_fields=[field.name for field in HerdSummary._meta.concrete_fields if not field.primary_key],
+        )
+        profiles = list(FarmerProfile.objects.filter(user_id__in=batch).only('pk', 'user_id', 'total_livestock_count'))
+        stale = []
+        for profile in profiles:
+            total = summaries[profile.user_id].total_livestock
+            if profile.total_livestock_count != total:
+                profile.total_livestock_count = total
+                stale.append(profile)
+        FarmerProfile.objects.bulk_update(stale, ['total_livestock_count'])
+        written += len(summaries)
+    return written
@@ -0,0 +1,33 @@
+"""
+Django management command to rebuild the farmers' herd summaries.
+
+Summaries are kept current as livestock and vaccinations are saved; run
+this to repair them after rows were written without signals (bulk imports,
+raw SQL) or edited by hand. Rebuilding is done in batches of farmers with
+grouped queries, so it can rebuild every herd at once.
+
+Usage:
+    python manage.py rebuild_herd_summaries
+    python manage.py rebuild_herd_summaries --owner 12 --owner 15
+"""
+from django.core.management.base import BaseCommand
+from livestock.herd import rebuild
+import time
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the herd summaries of all farmers, or of the given ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--owner', type=int, action='append', dest='owners',
+            help='Id of a farmer whose summary to rebuild (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        written = rebuild(options['owners'])
+        if options.get('verbosity', 1) >= 1:
+            self.stdout.write(self.style.SUCCESS(
+                f'Rebuilt {written} herd summaries in {time.perf_counter() - started:.2f}s'
+            ))
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:34
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def summarize_herds(apps, schema_editor):
+    """Build the summaries of farmers with livestock."""
+    from livestock.herd import rebuild
+    rebuild(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_otpverification_purpose_and_indexes'),
+        ('livestock', '0003_livestock_livestock_status_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HerdSummary',
+            fields=[
+                ('owner', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='herd_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total_livestock', models.IntegerField(default=0)),
+                ('by_status', models.JSONField(default=dict)),
+                ('by_type', models.JSONField(default=dict)),
+                ('expected_deliveries', models.IntegerField(default=0)),
+                ('next_expected_delivery', models.DateField(null=True)),
+                ('next_vaccination_due', models.DateField(null=True)),
+                ('next_vaccination_livestock_id', models.BigIntegerField(null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Herd Summary',
+                'verbose_name_plural': 'Herd Summaries',
+                'db_table': 'herd_summaries',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='vaccinationrecord',
+            index=models.Index(fields=['livestock', '-vaccination_date'], name='vaccination_livestock_idx'),
+        ),
+        migrations.RunPython(summarize_herds, migrations.RunPython.noop),
+    ]
@@ -2,7 +2,7 @@
 Livestock management models for AnimalGuardian system.
 """
 
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 from accounts.models import User
 
@@ -125,11 +125,33 @@ class Livestock(models.Model):
             models.Index(fields=['-created_at'], name='livestock_created_at_idx'),
         ]
     
+    # Fields whose loaded values are remembered so the herd summary can move
+    # an animal's counts from what a save replaced (see livestock.herd)
+    TRACKED_FIELDS = ('owner_id', 'status', 'livestock_type_id', 'is_pregnant', 'expected_delivery_date')
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: instance.__dict__.get(name) for name in cls.TRACKED_FIELDS
+        }
+        return instance
+    
+    def loaded_value(self, field_name):
+        """Value of a tracked field when the row was loaded (None for new livestock)."""
+        return getattr(self, '_loaded_values', {}).get(field_name)
+    
     def save(self, *args, **kwargs):
         """Override save to ensure empty tag_number is converted to None."""
         if self.tag_number is not None and isinstance(self.tag_number, str) and not self.tag_number.strip():
             self.tag_number = None
-        super().save(*args, **kwargs)
+        # Atomic so the herd summary updated by a post_save receiver commits
+        # or rolls back with the livestock
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+        self._loaded_values = {
+            name: self.__dict__.get(name) for name in self.TRACKED_FIELDS
+        }
     
     def __str__(self):
         return f"{self.name or self.tag_number} ({self.livestock_type.name})"
@@ -173,11 +195,45 @@ class VaccinationRecord(models.Model):
         verbose_name = 'Vaccination Record'
         verbose_name_plural = 'Vaccination Records'
         ordering = ['-vaccination_date']
+        indexes = [
+            # An animal's latest vaccination, whose next_due_date is when it is due
+            models.Index(fields=['livestock', '-vaccination_date'], name='vaccination_livestock_idx'),
+        ]
     
     def __str__(self):
         return f"{self.livestock} - {self.vaccine_name} ({self.vaccination_date})"
 
 
+class HerdSummary(models.Model):
+    """Counts and upcoming dates of a farmer's herd, for the home screen.
+
+    Kept current by livestock.herd as livestock and vaccinations change;
+    never write it directly.
+    """
+    
+    owner = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='herd_summary')
+    # Animals neither deceased nor sold
+    total_livestock = models.IntegerField(default=0)
+    # {status: count} over all animals; {livestock type id: count} over the herd
+    by_status = models.JSONField(default=dict)
+    by_type = models.JSONField(default=dict)
+    # Pregnant animals of the herd with an expected delivery date
+    expected_deliveries = models.IntegerField(default=0)
+    next_expected_delivery = models.DateField(null=True)
+    # Earliest next_due_date of the herd's animals' latest vaccinations
+    next_vaccination_due = models.DateField(null=True)
+    next_vaccination_livestock_id = models.BigIntegerField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'herd_summaries'
+        verbose_name = 'Herd Summary'
+        verbose_name_plural = 'Herd Summaries'
+    
+    def __str__(self):
+        return f"Herd of user {self.owner_id}"
+
+
 class HealthRecord(models.Model):
     """Health check and treatment records."""
     
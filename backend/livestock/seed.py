@@ -0,0 +1,101 @@
+"""
+Livestock types and breeds every installation needs, and their idempotent
+bulk insert.
+"""
+
+from django.db import transaction
+
+LIVESTOCK_TYPES = [
+    {
+        'name': 'Cattle',
+        'description': 'Domesticated cattle including cows and bulls',
+        'breeds': [
+            {'name': 'Ankole', 'description': 'Long-horned cattle breed'},
+            {'name': 'Holstein', 'description': 'Dairy cattle breed'},
+            {'name': 'Angus', 'description': 'Beef cattle breed'},
+            {'name': 'Boran', 'description': 'East African cattle breed'},
+        ]
+    },
+    {
+        'name': 'Goat',
+        'description': 'Domesticated goats',
+        'breeds': [
+            {'name': 'Boer', 'description': 'Meat goat breed'},
+            {'name': 'Saanen', 'description': 'Dairy goat breed'},
+            {'name': 'Toggenburg', 'description': 'Dairy goat breed'},
+            {'name': 'Local', 'description': 'Local goat breed'},
+        ]
+    },
+    {
+        'name': 'Sheep',
+        'description': 'Domesticated sheep',
+        'breeds': [
+            {'name': 'Dorper', 'description': 'Meat sheep breed'},
+            {'name': 'Merino', 'description': 'Wool sheep breed'},
+            {'name': 'Local', 'description': 'Local sheep breed'},
+        ]
+    },
+    {
+        'name': 'Pig',
+        'description': 'Domesticated pigs',
+        'breeds': [
+            {'name': 'Large White', 'description': 'Commercial pig breed'},
+            {'name': 'Landrace', 'description': 'Commercial pig breed'},
+            {'name': 'Local', 'description': 'Local pig breed'},
+        ]
+    },
+    {
+        'name': 'Chicken',
+        'description': 'Domesticated chickens',
+        'breeds': [
+            {'name': 'Broiler', 'description': 'Meat chicken breed'},
+            {'name': 'Layer', 'description': 'Egg-laying chicken breed'},
+            {'name': 'Local', 'description': 'Local chicken breed'},
+        ]
+    },
+    {
+        'name': 'Rabbit',
+        'description': 'Domesticated rabbits',
+        'breeds': [
+            {'name': 'New Zealand White', 'description': 'Meat rabbit breed'},
+            {'name': 'Californian', 'description': 'Meat rabbit breed'},
+            {'name': 'Local', 'description': 'Local rabbit breed'},
+        ]
+    },
+]
+
+
+def seed_livestock_types(data=LIVESTOCK_TYPES):
+    """Insert the missing types and breeds; existing rows are left as they are.
+
+    Runs a fixed number of queries whatever the data size. Returns
+    (types created, breeds created).
+    """
+    from reference.data import invalidate
+    from .models import Breed, LivestockType
+
+    with transaction.atomic():
+        types_before = LivestockType.objects.count()
+        # Note: LivestockType model doesn't have a description field
+        LivestockType.objects.bulk_create(
+            [LivestockType(name=type_data['name']) for type_data in data], ignore_conflicts=True,
+        )
+        type_ids = dict(
+            LivestockType.objects.filter(name__in=[type_data['name'] for type_data in data]).values_list('name', 'id')
+        )
+        breeds_before = Breed.objects.count()
+        Breed.objects.bulk_create([
+            Breed(
+                livestock_type_id=type_ids[type_data['name']],
+                name=breed_data['name'],
+                characteristics=breed_data.get('description', ''),
+            )
+            for type_data in data
+            for breed_data in type_data['breeds']
+        ], ignore_conflicts=True)
+        created_types = LivestockType.objects.count() - types_before
+        created_breeds = Breed.objects.count() - breeds_before
+        # bulk_create skips the signals that bump the reference generation
+        if created_types or created_breeds:
+            invalidate()
+    return created_types, created_breeds
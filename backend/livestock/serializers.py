@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Livestock, LivestockType, Breed, HealthRecord, VaccinationRecord
+from .models import Livestock, LivestockType, Breed, HealthRecord, VaccinationRecord, HerdSummary
 
 class LivestockTypeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -148,3 +148,28 @@ class VaccinationRecordSerializer(serializers.ModelSerializer):
     class Meta:
         model = VaccinationRecord
         fields = '__all__'
+
+
+class HerdSummarySerializer(serializers.ModelSerializer):
+    """A farmer's herd summary; type names come from the cached reference list."""
+    by_status = serializers.SerializerMethodField()
+    by_type = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = HerdSummary
+        fields = (
+            'owner', 'total_livestock', 'by_status', 'by_type', 'expected_deliveries', 'next_expected_delivery',
+            'next_vaccination_due', 'next_vaccination_livestock_id', 'updated_at',
+        )
+        read_only_fields = fields
+    
+    def get_by_status(self, obj):
+        return {value: obj.by_status.get(value, 0) for value, label in Livestock.STATUS_CHOICES}
+    
+    def get_by_type(self, obj):
+        from reference.data import rows
+        names = {row['id']: row['name'] for row in rows('livestock_types')}
+        return [
+            {'id': int(type_id), 'name': names.get(int(type_id)), 'count': count}
+            for type_id, count in sorted(obj.by_type.items(), key=lambda item: -item[1])
+        ]
@@ -0,0 +1,47 @@
+"""
+Keep each farmer's herd summary (HerdSummary) in step with their livestock
+and vaccinations; see livestock.herd.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from . import herd
+
+
+def _owner_of(livestock_id):
+    from .models import Livestock
+    return Livestock.objects.filter(pk=livestock_id).values_list('owner_id', flat=True).first()
+
+
+def _on_livestock_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old = None if created else herd.loaded_state(instance)
+    # None: the animal was not loaded from the database, so the change is unknown
+    if created or old is not None:
+        herd.livestock_changed(old, herd.current_state(instance))
+
+
+def _on_livestock_delete(sender, instance, **kwargs):
+    herd.livestock_changed(herd.loaded_state(instance) or herd.current_state(instance), None)
+
+
+def _on_vaccination_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    owner_id = _owner_of(instance.livestock_id)
+    if owner_id is not None:
+        herd.vaccinations_changed(owner_id)
+
+
+def _on_vaccination_delete(sender, instance, **kwargs):
+    # Also sent for the vaccinations of a deleted animal or owner, before the
+    # animal's own row is deleted
+    owner_id = _owner_of(instance.livestock_id)
+    if owner_id is not None:
+        herd.vaccinations_changed(owner_id, create=False)
+
+
+post_save.connect(_on_livestock_save, sender='livestock.Livestock', dispatch_uid='herd_livestock_save')
+post_delete.connect(_on_livestock_delete, sender='livestock.Livestock', dispatch_uid='herd_livestock_delete')
+post_save.connect(_on_vaccination_save, sender='livestock.VaccinationRecord', dispatch_uid='herd_vaccination_save')
+post_delete.connect(_on_vaccination_delete, sender='livestock.VaccinationRecord', dispatch_uid='herd_vaccination_delete')
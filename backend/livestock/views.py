@@ -1,18 +1,21 @@
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from django.db import models, IntegrityError
 from django.core.exceptions import ValidationError as DjangoValidationError
-from .models import Livestock, LivestockType, Breed, HealthRecord, VaccinationRecord
+from animalguardian.conditional import ConditionalGetMixin
+from reference.data import ReferenceListMixin
+from .models import Livestock, LivestockType, Breed, HealthRecord, VaccinationRecord, HerdSummary
 from .serializers import (
     LivestockSerializer, LivestockTypeSerializer, BreedSerializer,
-    HealthRecordSerializer, VaccinationRecordSerializer
+    HealthRecordSerializer, VaccinationRecordSerializer, HerdSummarySerializer
 )
 import logging
 
 logger = logging.getLogger(__name__)
 
-class LivestockViewSet(viewsets.ModelViewSet):
+class LivestockViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet for Livestock management."""
     queryset = Livestock.objects.all()
     serializer_class = LivestockSerializer
@@ -26,7 +29,8 @@ class LivestockViewSet(viewsets.ModelViewSet):
         base_queryset = Livestock.objects.select_related(
             'owner',           # User who owns the livestock
             'livestock_type',  # Livestock type
-            'breed'            # Breed (if exists)
+            'breed',           # Breed (if exists)
+            'breed__livestock_type'  # Nested in the breed
         )
         
         # Farmers: Only see their own livestock
@@ -101,21 +105,64 @@ class LivestockViewSet(viewsets.ModelViewSet):
                 },
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+    
+    @action(detail=False, methods=['get'])
+    def herd_summary(self, request):
+        """Counts by status and type, expected deliveries and next vaccination of a herd.
+        
+        Farmers get their own herd. Vets and admins pass ?owner_id=; local
+        vets only for farmers whose cases are assigned to them.
+        """
+        user = request.user
+        if user.user_type == 'farmer':
+            owner_id = user.pk
+        else:
+            try:
+                owner_id = int(request.query_params['owner_id'])
+            except (KeyError, ValueError):
+                return Response({
+                    'error': 'owner_id parameter is required'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            if user.user_type == 'local_vet':
+                from cases.models import CaseReport
+                if not CaseReport.objects.filter(assigned_veterinarian=user, reporter_id=owner_id).exists():
+                    return Response({
+                        'error': 'You can only view the herds of farmers whose cases are assigned to you.'
+                    }, status=status.HTTP_403_FORBIDDEN)
+            elif not (user.is_staff or user.is_superuser or user.user_type in ['admin', 'sector_vet']):
+                return Response({
+                    'error': 'You do not have permission to view this herd.'
+                }, status=status.HTTP_403_FORBIDDEN)
+        
+        # A farmer without livestock has no row yet
+        summary = HerdSummary.objects.filter(pk=owner_id).first() or HerdSummary(owner_id=owner_id)
+        return Response(HerdSummarySerializer(summary).data, status=status.HTTP_200_OK)
 
-class LivestockTypeViewSet(viewsets.ReadOnlyModelViewSet):
+class LivestockTypeViewSet(ReferenceListMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for Livestock types.
     Public read access - livestock types are reference data needed by all users.
     """
     queryset = LivestockType.objects.all()
     serializer_class = LivestockTypeSerializer
     permission_classes = [AllowAny]  # Public read access for reference data
+    reference_list = 'livestock_types'
 
-class BreedViewSet(viewsets.ReadOnlyModelViewSet):
+class BreedViewSet(ReferenceListMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for Breeds.
     Public read access - breeds are reference data needed by all users.
     """
     serializer_class = BreedSerializer
     permission_classes = [AllowAny]  # Public read access for reference data
+    reference_list = 'breeds'
+    
+    def filter_rows(self, data):
+        """Filter the cached breeds by livestock_type if provided."""
+        try:
+            livestock_type_id = int(self.request.query_params['livestock_type'])
+        except (KeyError, ValueError, TypeError):
+            # Missing or invalid livestock_type_id, return all breeds
+            return data
+        return [breed for breed in data if breed['livestock_type']['id'] == livestock_type_id]
     
     def get_queryset(self):
         """Filter breeds by livestock_type if provided in query parameters."""
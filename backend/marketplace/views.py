@@ -2,18 +2,20 @@ from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from .models import Product, Category
 from .serializers import ProductSerializer, CategorySerializer
+from reference.data import ReferenceListMixin
 
 
-class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CategoryViewSet(ReferenceListMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for product categories."""
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [AllowAny]
+    reference_list = 'categories'
 
 
 class ProductViewSet(viewsets.ModelViewSet):
     """ViewSet for marketplace products."""
-    queryset = Product.objects.filter(is_available=True)
+    queryset = Product.objects.filter(is_available=True).select_related('seller', 'category')
     serializer_class = ProductSerializer
     permission_classes = [IsAuthenticated]
     
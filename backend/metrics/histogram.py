@@ -0,0 +1,83 @@
+"""
+Log-linear (HDR-style) histogram of non-negative integers.
+
+Values below 64 get a bucket each; above that every power of two is split
+into 32 buckets, so any recorded value is reported within ~3%. Buckets are
+a sparse dict, which keeps histograms small and trivially mergeable across
+worker processes.
+"""
+
+import math
+
+SUB_BUCKET_BITS = 6
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS  # Exact below this value
+HALF = SUB_BUCKETS // 2
+
+
+def bucket_index(value):
+    value = max(int(value), 0)
+    if value < SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return shift * HALF + (value >> shift)
+
+
+def bucket_upper(index):
+    """Largest value that falls in the bucket."""
+    if index < SUB_BUCKETS:
+        return index
+    shift = index // HALF - 1
+    top = index - shift * HALF
+    return ((top + 1) << shift) - 1
+
+
+class Histogram:
+
+    def __init__(self, counts=None, total=0):
+        self.counts = dict(counts or {})
+        self.total = total
+
+    @property
+    def count(self):
+        return sum(self.counts.values())
+
+    def record(self, value):
+        index = bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += int(value)
+
+    def merge(self, other):
+        for index, n in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.total += other.total
+
+    def quantile(self, q):
+        count = self.count
+        if not count:
+            return 0
+        target = max(math.ceil(q * count), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return bucket_upper(index)
+        return bucket_upper(max(self.counts))
+
+    def cumulative(self, bounds):
+        """[(bound, values <= bound)] for ascending bounds, plus +Inf."""
+        result = []
+        items = sorted(self.counts.items())
+        seen, position = 0, 0
+        for bound in bounds:
+            while position < len(items) and bucket_upper(items[position][0]) <= bound:
+                seen += items[position][1]
+                position += 1
+            result.append((bound, seen))
+        return result
+
+    def to_dict(self):
+        return {'counts': {str(index): n for index, n in self.counts.items()}, 'total': self.total}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls({int(index): n for index, n in data['counts'].items()}, data['total'])
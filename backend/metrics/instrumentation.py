@@ -0,0 +1,54 @@
+"""
+Timing of DRF serialization for the request metrics middleware.
+
+BaseSerializer.data is wrapped once at startup; time spent in the
+outermost .data call of a request is added to the request's timer, so
+nested serializers built inside method fields are not counted twice.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+import functools
+import time
+
+_current = ContextVar('serializer_timer', default=None)
+
+
+class SerializerTimer:
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.depth = 0
+
+
+@contextmanager
+def serializer_timer():
+    timer = SerializerTimer()
+    token = _current.set(timer)
+    try:
+        yield timer
+    finally:
+        _current.reset(token)
+
+
+def _timed(fget):
+    @functools.wraps(fget)
+    def data(self):
+        timer = _current.get()
+        if timer is None or timer.depth:
+            return fget(self)
+        timer.depth += 1
+        started = time.perf_counter()
+        try:
+            return fget(self)
+        finally:
+            timer.seconds += time.perf_counter() - started
+            timer.depth -= 1
+    data._metrics_timed = True
+    return data
+
+
+def instrument_serializers():
+    from rest_framework.serializers import BaseSerializer
+    if not getattr(BaseSerializer.data.fget, '_metrics_timed', False):
+        BaseSerializer.data = property(_timed(BaseSerializer.data.fget))
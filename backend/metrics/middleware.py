@@ -0,0 +1,84 @@
+"""
+Request metrics middleware: query count, DB time, serializer time and total
+latency per resolved view name (e.g. ``casereport-list``).
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+from .registry import registry
+from .instrumentation import serializer_timer
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class QueryTimer:
+    """connection.execute_wrapper hook counting and timing SQL."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+
+
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return '<unresolved>'
+    return match.view_name or match._func_path
+
+
+class RequestMetricsMiddleware:
+    """Record per-view request metrics and optionally a Server-Timing header.
+
+    Under ASGI, async views run their queries in other threads, so only
+    latency is recorded for them.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.server_timing = getattr(settings, 'METRICS_SERVER_TIMING', False)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        queries = QueryTimer()
+        started = time.perf_counter()
+        with serializer_timer() as serializer, connection.execute_wrapper(queries):
+            response = self.get_response(request)
+        self._finish(request, response, time.perf_counter() - started, queries, serializer.seconds)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with serializer_timer() as serializer:
+            response = await self.get_response(request)
+        self._finish(request, response, time.perf_counter() - started, QueryTimer(), serializer.seconds)
+        return response
+
+    def _finish(self, request, response, seconds, queries, serializer_seconds):
+        try:
+            registry.record(
+                _view_name(request), request.method, response.status_code,
+                seconds * 1e6, queries.seconds * 1e6, serializer_seconds * 1e6, queries.count,
+            )
+        except Exception as e:
+            logger.warning(f"Could not record request metrics: {e}")
+        if self.server_timing:
+            response['Server-Timing'] = (
+                f'db;dur={queries.seconds * 1000:.1f};desc="{queries.count} queries", '
+                f'serializer;dur={serializer_seconds * 1000:.1f}, '
+                f'total;dur={seconds * 1000:.1f}'
+            )
@@ -0,0 +1,261 @@
+"""
+Per-view request metrics, shared across gunicorn workers through files.
+
+Each worker keeps cumulative histograms in memory and periodically writes a
+snapshot to ``METRICS_DIR/<pid>.json``. The exposition endpoint merges the
+snapshots of all workers; snapshots of workers that have exited (e.g.
+recycled by --max-requests) are folded into ``archive.json`` so totals stay
+monotonic without the directory growing.
+"""
+
+from contextlib import contextmanager
+from django.conf import settings
+from .histogram import Histogram
+import atexit
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows; msvcrt locks the directory instead
+    fcntl = None
+    import msvcrt
+
+METRICS_DIR = getattr(settings, 'METRICS_DIR', '/tmp/animalguardian-metrics')
+METRICS_FLUSH_INTERVAL = getattr(settings, 'METRICS_FLUSH_INTERVAL', 5)
+
+# Histograms are recorded in microseconds (times) or units (queries)
+SERIES = {
+    'duration': ('request_duration_seconds', 'Total request latency', 1e-6),
+    'db': ('request_db_seconds', 'Time spent executing SQL', 1e-6),
+    'serializer': ('request_serializer_seconds', 'Time spent in DRF serializer .data', 1e-6),
+    'queries': ('request_queries', 'SQL queries per request', 1),
+}
+BUCKETS = {
+    'duration': [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10],
+    'db': [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5],
+    'serializer': [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1],
+    'queries': [0, 1, 2, 3, 5, 10, 20, 50, 100, 200],
+}
+QUANTILES = [0.5, 0.95, 0.99]
+ARCHIVE = 'archive.json'
+
+
+class ViewMetrics:
+    """Cumulative metrics of one (view, method) pair."""
+
+    def __init__(self):
+        self.responses = {}  # status class ('2xx') -> count
+        self.histograms = {name: Histogram() for name in SERIES}
+
+    def merge(self, other):
+        for status_class, n in other.responses.items():
+            self.responses[status_class] = self.responses.get(status_class, 0) + n
+        for name, histogram in other.histograms.items():
+            self.histograms[name].merge(histogram)
+
+    def to_dict(self):
+        return {
+            'responses': self.responses,
+            'histograms': {name: h.to_dict() for name, h in self.histograms.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        metrics = cls()
+        metrics.responses = dict(data['responses'])
+        for name, histogram in data['histograms'].items():
+            if name in metrics.histograms:
+                metrics.histograms[name] = Histogram.from_dict(histogram)
+        return metrics
+
+
+class Registry:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.pid = os.getpid()
+        self.views = {}  # (view, method) -> ViewMetrics
+        self.last_flush = time.monotonic()
+
+    def record(self, view, method, status_code, duration_us, db_us, serializer_us, queries):
+        with self._lock:
+            if os.getpid() != self.pid:
+                self._reset()  # Forked worker; the parent's numbers are not ours
+            metrics = self.views.get((view, method))
+            if metrics is None:
+                metrics = self.views[(view, method)] = ViewMetrics()
+            status_class = f'{status_code // 100}xx'
+            metrics.responses[status_class] = metrics.responses.get(status_class, 0) + 1
+            metrics.histograms['duration'].record(duration_us)
+            metrics.histograms['db'].record(db_us)
+            metrics.histograms['serializer'].record(serializer_us)
+            metrics.histograms['queries'].record(queries)
+            due = time.monotonic() - self.last_flush >= METRICS_FLUSH_INTERVAL
+        if due:
+            self.flush()
+
+    def snapshot(self):
+        with self._lock:
+            return {f'{view}\t{method}': m.to_dict() for (view, method), m in self.views.items()}
+
+    def flush(self):
+        """Write this worker's totals where other workers can read them."""
+        with self._lock:
+            self.last_flush = time.monotonic()
+        data = self.snapshot()
+        if not data:
+            return
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        path = os.path.join(METRICS_DIR, f'{os.getpid()}.json')
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+
+registry = Registry()
+atexit.register(registry.flush)  # Keep the tail of a recycled worker
+
+
+def _merge_into(merged, data):
+    for key, value in data.items():
+        metrics = ViewMetrics.from_dict(value)
+        if key in merged:
+            merged[key].merge(metrics)
+        else:
+            merged[key] = metrics
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _alive(pid):
+    if os.name == 'nt':
+        # os.kill() would terminate the process; Windows development servers
+        # run one process, so every other snapshot is of an exited one
+        return pid == os.getpid()
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+@contextmanager
+def _directory_lock():
+    """Exclusive lock of METRICS_DIR across processes."""
+    with open(os.path.join(METRICS_DIR, '.lock'), 'w') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+            return
+        msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def collect():
+    """Merged metrics of every worker, {(view, method): ViewMetrics}."""
+    registry.flush()
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    with _directory_lock():
+        archive_path = os.path.join(METRICS_DIR, ARCHIVE)
+        archived = {}
+        _merge_into(archived, _read(archive_path))
+
+        merged = {}
+        dead = []
+        for name in os.listdir(METRICS_DIR):
+            if not name.endswith('.json') or name == ARCHIVE:
+                continue
+            data = _read(os.path.join(METRICS_DIR, name))
+            try:
+                pid = int(name[:-len('.json')])
+            except ValueError:
+                continue
+            if _alive(pid):
+                _merge_into(merged, data)
+            else:
+                _merge_into(archived, data)
+                dead.append(name)
+
+        if dead:
+            tmp_path = f'{archive_path}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump({key: m.to_dict() for key, m in archived.items()}, f)
+            os.replace(tmp_path, archive_path)
+            for name in dead:
+                os.remove(os.path.join(METRICS_DIR, name))
+
+    for key, metrics in archived.items():
+        if key in merged:
+            merged[key].merge(metrics)
+        else:
+            merged[key] = metrics
+    return {tuple(key.split('\t', 1)): metrics for key, metrics in merged.items()}
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    return f'{value:.6g}' if isinstance(value, float) else str(value)
+
+
+def prometheus_text(views):
+    """Prometheus text exposition (format 0.0.4) of collected metrics."""
+    prefix = 'animalguardian_'
+    lines = [
+        f'# HELP {prefix}requests_total Responses by view, method and status class',
+        f'# TYPE {prefix}requests_total counter',
+    ]
+    ordered = sorted(views.items())
+    for (view, method), metrics in ordered:
+        for status_class, n in sorted(metrics.responses.items()):
+            lines.append(
+                f'{prefix}requests_total{{view="{_label(view)}",method="{method}",status="{status_class}"}} {n}'
+            )
+
+    for series, (name, help_text, scale) in SERIES.items():
+        metric = prefix + name
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} histogram')
+        for (view, method), metrics in ordered:
+            labels = f'view="{_label(view)}",method="{method}"'
+            histogram = metrics.histograms[series]
+            bounds = [round(bound / scale) for bound in BUCKETS[series]]
+            for (bound, seen), le in zip(histogram.cumulative(bounds), BUCKETS[series]):
+                lines.append(f'{metric}_bucket{{{labels},le="{_number(le)}"}} {seen}')
+            lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f'{metric}_sum{{{labels}}} {_number(histogram.total * scale)}')
+            lines.append(f'{metric}_count{{{labels}}} {histogram.count}')
+
+        # Quantiles from the high resolution buckets, which the coarse
+        # Prometheus buckets above cannot reproduce
+        lines.append(f'# HELP {metric}_quantile {help_text} (p50/p95/p99, ~3% resolution)')
+        lines.append(f'# TYPE {metric}_quantile gauge')
+        for (view, method), metrics in ordered:
+            histogram = metrics.histograms[series]
+            for q in QUANTILES:
+                lines.append(
+                    f'{metric}_quantile{{view="{_label(view)}",method="{method}",quantile="{q}"}} '
+                    f'{_number(histogram.quantile(q) * scale)}'
+                )
+    return '\n'.join(lines) + '\n'
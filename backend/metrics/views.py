@@ -0,0 +1,19 @@
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from .registry import collect, prometheus_text
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def metrics(request):
+    """Per-view request metrics of all workers in Prometheus text format."""
+    user = request.user
+    if not (user.user_type == 'admin' or user.is_staff or user.is_superuser):
+        return Response({
+            'error': 'Only administrators can view metrics.'
+        }, status=status.HTTP_403_FORBIDDEN)
+
+    return HttpResponse(prometheus_text(collect()), content_type='text/plain; version=0.0.4; charset=utf-8')
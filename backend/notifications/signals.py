@@ -0,0 +1,20 @@
+"""
+Keep cached unread counters in step with notifications saved or deleted
+through the ORM. bulk_create() and update() callers adjust them directly.
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Notification
+from . import unread
+
+
+@receiver(post_save, sender=Notification, dispatch_uid='notification_unread_created')
+def notification_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        unread.adjust(unread.count_unread([instance]))
+
+
+@receiver(post_delete, sender=Notification, dispatch_uid='notification_unread_deleted')
+def notification_deleted(sender, instance, **kwargs):
+    unread.adjust({user_id: -n for user_id, n in unread.count_unread([instance]).items()})
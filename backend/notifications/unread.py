@@ -0,0 +1,102 @@
+"""
+Per-user unread notification counters kept in the shared cache.
+
+Counters are adjusted as notifications are created or read and rebuilt from
+the (recipient, status) index when missing, so badge polling normally never
+reads the notifications table. Adjustments are deferred to transaction
+commit so a rolled back write does not move the badge.
+
+An adjustment made while a reader rebuilds a missing counter would be lost:
+it finds no counter to move, and the reader then stores a count taken
+before the change. So each adjustment first bumps a per-user version, and
+a reader that sees the version move during its rebuild drops what it
+stored; the next read counts again.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+UNREAD_STATUSES = ['pending', 'sent', 'delivered']
+
+
+def _cache_key(user_id):
+    return f'notifications:unread:{user_id}'
+
+
+def _timeout():
+    return getattr(settings, 'CACHE_TTL', {}).get('unread_notifications', 300)
+
+
+def _version_key(user_id):
+    return f'notifications:unread_version:{user_id}'
+
+
+def _count(user_id):
+    from .models import Notification
+    return Notification.objects.filter(recipient_id=user_id, status__in=UNREAD_STATUSES).count()
+
+
+def unread_count(user_id):
+    """Unread notifications for a user, rebuilding the counter on a miss."""
+    count = cache.get(_cache_key(user_id))
+    if count is None:
+        version = cache.get(_version_key(user_id))
+        count = _count(user_id)
+        cache.add(_cache_key(user_id), count, _timeout())
+        if cache.get(_version_key(user_id)) != version:
+            cache.delete(_cache_key(user_id))  # Adjusted meanwhile; may miss it
+    return count
+
+
+async def aunread_count(user_id):
+    """unread_count() for async views."""
+    count = await cache.aget(_cache_key(user_id))
+    if count is None:
+        from .models import Notification
+        version = await cache.aget(_version_key(user_id))
+        count = await Notification.objects.filter(recipient_id=user_id, status__in=UNREAD_STATUSES).acount()
+        await cache.aadd(_cache_key(user_id), count, _timeout())
+        if await cache.aget(_version_key(user_id)) != version:
+            await cache.adelete(_cache_key(user_id))  # Adjusted meanwhile; may miss it
+    return count
+
+
+def _bump_version(user_id):
+    key = _version_key(user_id)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr(); any new value tells readers
+        cache.set(key, 1, None)
+
+
+def _apply(deltas):
+    for user_id, delta in deltas.items():
+        if not delta:
+            continue
+        # Before the counter, so a rebuild that missed this change sees it
+        _bump_version(user_id)
+        key = _cache_key(user_id)
+        try:
+            value = cache.incr(key, delta)
+        except ValueError:
+            continue  # Not cached; the next read rebuilds it
+        if value < 0:
+            cache.delete(key)
+
+
+def adjust(deltas):
+    """Apply {user_id: delta} to cached counters once the transaction commits."""
+    deltas = dict(deltas)
+    transaction.on_commit(lambda: _apply(deltas))
+
+
+def count_unread(notifications):
+    """{recipient_id: n} for the unread notifications in a list of instances."""
+    counts = {}
+    for notification in notifications:
+        if notification.status in UNREAD_STATUSES:
+            counts[notification.recipient_id] = counts.get(notification.recipient_id, 0) + 1
+    return counts
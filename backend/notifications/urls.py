@@ -1,7 +1,11 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
 
+# The async views only pay off under asgi.py; WSGI workers serve the viewset
+ASYNC_VIEWS = settings.SERVER_PROFILE == 'asgi'
+
 router = DefaultRouter()
 router.register(r'notifications', views.NotificationViewSet, basename='notification')
 router.register(r'broadcasts', views.BroadcastMessageViewSet, basename='broadcast')
@@ -9,3 +13,10 @@ router.register(r'broadcasts', views.BroadcastMessageViewSet, basename='broadcas
 urlpatterns = [
     path('', include(router.urls)),
 ]
+
+if ASYNC_VIEWS:
+    # Ahead of the router's routes for the same paths
+    urlpatterns = [
+        path('notifications/', views.notification_list, name='notification-list'),
+        path('notifications/unread_count/', views.notification_unread_count, name='notification-unread-count'),
+    ] + urlpatterns
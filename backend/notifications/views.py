@@ -2,19 +2,42 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from django.http import HttpResponseNotAllowed, HttpResponseNotModified, JsonResponse
 from django.utils import timezone
+from django.db import transaction
+from django.db.models import Count, Max, Q
 from django.contrib.auth import get_user_model
+from accounts.authentication import async_jwt_required
+from animalguardian.conditional import ConditionalGetMixin, etag_matches, last_modified_of, make_etag, set_validators
+from sync.changelog import record_bulk, record_changes
+from realtime.events import publish, notification_events
 from .models import Notification, BroadcastMessage
 from .serializers import NotificationSerializer, BroadcastMessageSerializer
+from . import unread
 
 User = get_user_model()
 
-class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+def validator_aggregates():
+    """Notifications have no updated_at; every status change sets one of
+    these timestamps or moves the unread count."""
+    aggregates = {
+        f'max_{field}': Max(field) for field in ('created_at', 'sent_at', 'delivered_at', 'read_at')
+    }
+    aggregates['unread'] = Count('pk', filter=Q(status__in=unread.UNREAD_STATUSES))
+    return aggregates
+
+
+class NotificationViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for Notifications."""
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
     
+    def conditional_aggregates(self):
+        return validator_aggregates()
+    
     def get_queryset(self):
         return Notification.objects.filter(recipient=self.request.user)
     
@@ -31,10 +54,13 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
             )
         
         # Update notification status
+        was_unread = notification.status in unread.UNREAD_STATUSES
         notification.status = 'read'
         if not notification.read_at:
             notification.read_at = timezone.now()
         notification.save(update_fields=['status', 'read_at'])
+        if was_unread:
+            unread.adjust({request.user.id: -1})
         
         serializer = self.get_serializer(notification)
         return Response(serializer.data)
@@ -44,18 +70,83 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         """Mark all notifications for the current user as read."""
         notifications = Notification.objects.filter(
             recipient=request.user,
-            status__in=['pending', 'sent', 'delivered']
+            status__in=unread.UNREAD_STATUSES
         )
         
-        updated_count = notifications.update(
-            status='read',
-            read_at=timezone.now()
-        )
+        # update() skips model signals, so log the rows for delta sync ourselves
+        notification_ids = list(notifications.values_list('id', flat=True))
+        with transaction.atomic():
+            updated_count = Notification.objects.filter(id__in=notification_ids).update(
+                status='read',
+                read_at=timezone.now()
+            )
+            record_changes('notification', notification_ids, [request.user.id])
+            unread.adjust({request.user.id: -updated_count})
         
         return Response({
             'message': f'Marked {updated_count} notifications as read.',
             'updated_count': updated_count
         })
+    
+    @action(detail=False, methods=['get'])
+    def unread_count(self, request):
+        """Unread badge count, served from the cached per-user counter."""
+        return Response({'unread_count': unread.unread_count(request.user.id)})
+
+
+@async_jwt_required
+async def notification_list(request):
+    """The user's notifications, newest first, in DRF's page format.
+
+    Served in place of the viewset's list under the asgi server profile, so
+    the most polled list does not hold a worker thread; the viewset still
+    serves retrieve and the read actions.
+    """
+    # require_GET only wraps async views from Django 5.0
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    notifications = Notification.objects.filter(recipient_id=request.user.id)
+    # The validator query also gives the count the page needs
+    values = await notifications.order_by().aaggregate(rows=Count('pk'), **validator_aggregates())
+    etag = make_etag(request.user.id, request.get_full_path(), values)
+    if etag_matches(request, etag):
+        return set_validators(HttpResponseNotModified(), etag, last_modified_of(values))
+
+    count = values['rows']
+    page_size = api_settings.PAGE_SIZE
+    last_page = max(1, -(-count // page_size))
+    try:
+        page = int(request.GET.get('page', 1))
+    except ValueError:
+        page = 0
+    if not 1 <= page <= last_page:
+        return JsonResponse({'detail': 'Invalid page.'}, status=404)
+
+    offset = (page - 1) * page_size
+    results = [notification async for notification in notifications[offset:offset + page_size]]
+    url = request.build_absolute_uri()
+    if page == 1:
+        previous = None
+    elif page == 2:
+        previous = remove_query_param(url, 'page')
+    else:
+        previous = replace_query_param(url, 'page', page - 1)
+    response = JsonResponse({
+        'count': count,
+        'next': replace_query_param(url, 'page', page + 1) if page < last_page else None,
+        'previous': previous,
+        'results': NotificationSerializer(results, many=True, context={'request': request}).data,
+    })
+    return set_validators(response, etag, last_modified_of(values))
+
+
+@async_jwt_required
+async def notification_unread_count(request):
+    """The viewset's unread_count, for the asgi server profile."""
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    return JsonResponse({'unread_count': await unread.aunread_count(request.user.id)})
 
 
 class BroadcastMessageViewSet(viewsets.ModelViewSet):
@@ -67,7 +158,7 @@ class BroadcastMessageViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         # Only sector vets and admins can view broadcasts
         if self.request.user.user_type in ['sector_vet', 'admin'] or self.request.user.is_staff:
-            return BroadcastMessage.objects.all()
+            return BroadcastMessage.objects.select_related('created_by')
         return BroadcastMessage.objects.none()
     
     def perform_create(self, serializer):
@@ -97,30 +188,38 @@ class BroadcastMessageViewSet(viewsets.ModelViewSet):
             if broadcast.target_users:
                 users = users.filter(id__in=broadcast.target_users)
             
-            # Create notifications for each user
-            notifications_created = 0
-            for user in users:
-                for channel in broadcast.channels or ['in_app']:
-                    Notification.objects.create(
-                        recipient=user,
-                        channel=channel,
-                        title=broadcast.title,
-                        message=broadcast.message,
-                        language=broadcast.language,
-                        status='sent'
-                    )
-                    notifications_created += 1
+            # Create notifications for each user in one insert; bulk_create
+            # skips signals, so sync, unread counters and push are updated here
+            recipient_ids = list(users.values_list('id', flat=True))
+            notifications = [
+                Notification(
+                    recipient_id=user_id,
+                    channel=channel,
+                    title=broadcast.title,
+                    message=broadcast.message,
+                    language=broadcast.language,
+                    status='sent'
+                )
+                for user_id in recipient_ids
+                for channel in broadcast.channels or ['in_app']
+            ]
+            with transaction.atomic():
+                Notification.objects.bulk_create(notifications, batch_size=1000)
+                record_bulk('notification', notifications)
+                unread.adjust(unread.count_unread(notifications))
+                publish(notification_events(notifications))
+            notifications_created = len(notifications)
             
             # Update broadcast status
             broadcast.status = 'sent'
             broadcast.sent_at = timezone.now()
-            broadcast.total_recipients = users.count()
+            broadcast.total_recipients = len(recipient_ids)
             broadcast.sent_count = notifications_created
             broadcast.save()
             
             return Response({
-                'message': f'Broadcast sent successfully to {users.count()} users',
-                'total_recipients': users.count(),
+                'message': f'Broadcast sent successfully to {len(recipient_ids)} users',
+                'total_recipients': len(recipient_ids),
                 'notifications_sent': notifications_created
             })
         except Exception as e:
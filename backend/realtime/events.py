@@ -0,0 +1,157 @@
+"""
+Per-user event log used to push notifications and chat messages.
+
+Each user has a sequence counter and a short-lived cache entry per event,
+so any worker sharing the cache (Redis in production) can serve a stream
+started on another worker. Subscribers in the same process are also woken
+immediately; others notice new events on their next poll of the counter.
+Events are published once the transaction commits.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from collections import defaultdict
+from contextlib import contextmanager
+import asyncio
+import threading
+
+REALTIME_EVENT_TTL = getattr(settings, 'REALTIME_EVENT_TTL', 300)
+REALTIME_POLL_INTERVAL = getattr(settings, 'REALTIME_POLL_INTERVAL', 1.0)
+REALTIME_MAX_BACKLOG = 100  # Events replayed to a reconnecting client at most
+SEQUENCE_TTL = 60 * 60 * 24
+
+PUSHED_NOTIFICATION_CHANNELS = ['in_app', 'push']
+
+_waiters = defaultdict(set)  # user_id -> {(loop, asyncio.Event)}
+_waiters_lock = threading.Lock()
+
+
+def _sequence_key(user_id):
+    return f'realtime:seq:{user_id}'
+
+
+def _event_key(user_id, event_id):
+    return f'realtime:event:{user_id}:{event_id}'
+
+
+def _wake(user_ids):
+    with _waiters_lock:
+        waiters = [waiter for user_id in user_ids for waiter in _waiters.get(user_id, ())]
+    for loop, event in waiters:
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            pass  # Loop already closed
+
+
+def _store(events):
+    by_user = defaultdict(list)
+    for user_id, event_type, data in events:
+        by_user[user_id].append((event_type, data))
+
+    entries = {}
+    for user_id, items in by_user.items():
+        key = _sequence_key(user_id)
+        cache.add(key, 0, SEQUENCE_TTL)
+        try:
+            last_id = cache.incr(key, len(items))
+        except ValueError:
+            # Evicted between add() and incr(); start a new sequence
+            cache.set(key, len(items), SEQUENCE_TTL)
+            last_id = len(items)
+        first_id = last_id - len(items) + 1
+        for event_id, (event_type, data) in enumerate(items, start=first_id):
+            entries[_event_key(user_id, event_id)] = {'id': event_id, 'type': event_type, 'data': data}
+
+    cache.set_many(entries, REALTIME_EVENT_TTL)
+    _wake(by_user)
+
+
+def publish(events):
+    """Publish [(user_id, event_type, data)] once the transaction commits."""
+    events = list(events)
+    if events:
+        transaction.on_commit(lambda: _store(events))
+
+
+def notification_events(notifications):
+    """Events for notifications shown inside the app."""
+    return [
+        (notification.recipient_id, 'notification', {
+            'id': notification.pk,
+            'title': notification.title,
+            'message': notification.message,
+            'status': notification.status,
+            'related_case': notification.related_case_id,
+            'created_at': notification.created_at.isoformat() if notification.created_at else None,
+        })
+        for notification in notifications
+        if notification.channel in PUSHED_NOTIFICATION_CHANNELS
+    ]
+
+
+def message_events(message, conversation):
+    """The same chat message event for both participants."""
+    data = {
+        'id': message.pk,
+        'conversation': conversation.pk,
+        'sender': message.sender_id,
+        'content': message.content,
+        'created_at': message.created_at.isoformat() if message.created_at else None,
+    }
+    return [(user_id, 'message', data) for user_id in (conversation.participant1_id, conversation.participant2_id)]
+
+
+async def read_events(user_id, after):
+    """Events newer than ``after`` and the user's latest event id.
+
+    With ``after=None`` nothing is returned, only the id to continue from.
+    If ``after`` is ahead of the sequence the counter was evicted; the caller
+    just continues from the new latest id (clients resync via /api/sync/).
+    """
+    latest = await cache.aget(_sequence_key(user_id)) or 0
+    if after is None or after >= latest:
+        return [], latest
+    first_id = max(after + 1, latest - REALTIME_MAX_BACKLOG + 1)
+    keys = [_event_key(user_id, event_id) for event_id in range(first_id, latest + 1)]
+    found = await cache.aget_many(keys)
+    # Expired events are skipped rather than blocking the stream
+    return [found[key] for key in keys if key in found], latest
+
+
+@contextmanager
+def _subscription(user_id):
+    waiter = (asyncio.get_running_loop(), asyncio.Event())
+    with _waiters_lock:
+        _waiters[user_id].add(waiter)
+    try:
+        yield waiter[1]
+    finally:
+        with _waiters_lock:
+            _waiters[user_id].discard(waiter)
+            if not _waiters[user_id]:
+                del _waiters[user_id]
+
+
+async def wait_for_events(user_id, after, timeout):
+    """Wait up to ``timeout`` seconds for events newer than ``after``.
+
+    Returns (events, latest id). Sleeping here does not hold a thread, so
+    under ASGI an idle subscriber costs only a cache read per poll interval.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    with _subscription(user_id) as wakeup:
+        while True:
+            wakeup.clear()
+            events, latest = await read_events(user_id, after)
+            if after is None:
+                after = latest
+            remaining = deadline - loop.time()
+            if events or remaining <= 0:
+                return events, latest
+            try:
+                await asyncio.wait_for(wakeup.wait(), min(REALTIME_POLL_INTERVAL, remaining))
+            except asyncio.TimeoutError:
+                pass
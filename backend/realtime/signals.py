@@ -0,0 +1,20 @@
+"""
+Publish realtime events for notifications and chat messages saved through
+the ORM. bulk_create() callers publish notification_events() directly.
+"""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .events import publish, notification_events, message_events
+
+
+@receiver(post_save, sender='notifications.Notification', dispatch_uid='realtime_notification_created')
+def notification_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        publish(notification_events([instance]))
+
+
+@receiver(post_save, sender='community.Message', dispatch_uid='realtime_message_created')
+def message_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        publish(message_events(instance, instance.conversation))
@@ -0,0 +1,30 @@
+"""
+Stream tickets: short-lived credentials for opening a realtime stream.
+
+EventSource cannot send an Authorization header, so a browser passes its
+credential in the URL, where access logs and proxies record it. Rather
+than the access token, it passes a ticket: a signed user id, good for
+REALTIME_TICKET_SECONDS and only for the realtime endpoints. Tickets are
+signed with SECRET_KEY, so any worker can check one without shared state.
+A client whose stream ends after the ticket expired asks for a new one.
+"""
+
+from django.conf import settings
+from django.core import signing
+
+REALTIME_TICKET_SECONDS = getattr(settings, 'REALTIME_TICKET_SECONDS', 60)
+TICKET_SALT = 'realtime.stream-ticket'
+
+
+def issue_ticket(user):
+    return signing.dumps(user.pk, salt=TICKET_SALT)
+
+
+async def user_for_ticket(ticket):
+    """Active user the ticket was issued to, or None if it is invalid or expired."""
+    from accounts.models import User
+    try:
+        user_id = signing.loads(ticket, salt=TICKET_SALT, max_age=REALTIME_TICKET_SECONDS)
+    except signing.BadSignature:  # Includes SignatureExpired
+        return None
+    return await User.objects.filter(pk=user_id, is_active=True).afirst()
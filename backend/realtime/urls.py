@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('ticket/', views.ticket, name='realtime-ticket'),
+    path('stream/', views.stream, name='realtime-stream'),
+    path('poll/', views.poll, name='realtime-poll'),
+]
@@ -0,0 +1,135 @@
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from accounts.authentication import authenticate_async
+from .events import read_events, wait_for_events, REALTIME_POLL_INTERVAL
+from .tickets import issue_ticket, user_for_ticket, REALTIME_TICKET_SECONDS
+import asyncio
+import json
+import math
+
+REALTIME_STREAM_SECONDS = getattr(settings, 'REALTIME_STREAM_SECONDS', 300)
+REALTIME_LONG_POLL_SECONDS = getattr(settings, 'REALTIME_LONG_POLL_SECONDS', 25)
+REALTIME_KEEPALIVE_SECONDS = getattr(settings, 'REALTIME_KEEPALIVE_SECONDS', 15)
+# How soon EventSource reconnects when the server ends a stream
+REALTIME_RETRY_MS = 3000
+
+
+def _parse_event_id(value):
+    try:
+        return int(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _sse(event):
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'], cls=DjangoJSONEncoder)}\n\n"
+
+
+async def _event_stream(user_id, last_id):
+    yield f'retry: {REALTIME_RETRY_MS}\n\n'
+    loop = asyncio.get_running_loop()
+    # Bounded so abandoned streams end; EventSource resumes via Last-Event-ID
+    deadline = loop.time() + REALTIME_STREAM_SECONDS
+    while loop.time() < deadline:
+        events, latest = await wait_for_events(user_id, last_id, min(REALTIME_KEEPALIVE_SECONDS, deadline - loop.time()))
+        if last_id is None:
+            last_id = latest
+        if not events:
+            yield ': keepalive\n\n'
+            continue
+        for event in events:
+            yield _sse(event)
+        last_id = latest
+
+
+async def _authenticate(request):
+    """User of the request's JWT or, as EventSource cannot set headers, its ?ticket=."""
+    user = await authenticate_async(request)
+    if user is None and request.GET.get('ticket'):
+        user = await user_for_ticket(request.GET['ticket'])
+    return user
+
+
+async def ticket(request):
+    """Issue a stream ticket to put in the stream URL instead of the access token."""
+    # require_POST only wraps async views from Django 5.0
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    user = await authenticate_async(request)
+    if user is None:
+        return JsonResponse({'error': 'Authentication credentials were not provided or are invalid.'}, status=401)
+    return JsonResponse({'ticket': issue_ticket(user), 'expires_in': REALTIME_TICKET_SECONDS})
+
+
+# csrf_exempt only wraps async views from Django 5.0; clients authenticate
+# with a bearer token, as with the DRF views
+ticket.csrf_exempt = True
+
+
+async def stream(request):
+    """Server-Sent Events stream of the user's notifications and messages.
+
+    Served through asgi.py the connection stays open without holding a
+    worker thread. Under WSGI the pending events are returned at once and
+    the browser reconnects after ``retry``, degrading to polling.
+    """
+    # require_GET only wraps async views from Django 5.0
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    user = await _authenticate(request)
+    if user is None:
+        return JsonResponse({'error': 'Authentication credentials were not provided or are invalid.'}, status=401)
+
+    last_id = _parse_event_id(request.headers.get('Last-Event-ID') or request.GET.get('last_event_id'))
+
+    if isinstance(request, ASGIRequest):
+        response = StreamingHttpResponse(_event_stream(user.id, last_id), content_type='text/event-stream')
+    else:
+        events, latest = await read_events(user.id, last_id)
+        retry_ms = int(REALTIME_POLL_INTERVAL * 1000) * 5
+        body = f'retry: {retry_ms}\n\n' + ''.join(_sse(event) for event in events)
+        if not events:
+            # Comment carrying the cursor for clients reading the raw stream
+            body += f': last_event_id {latest}\n\n'
+        response = HttpResponse(body, content_type='text/event-stream')
+
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+async def poll(request):
+    """Long-poll for events after ``since`` (an event id).
+
+    Waits up to ``timeout`` seconds (ASGI only) for something new. Without
+    ``since`` it returns at once with the id to start polling from.
+    """
+    # require_GET only wraps async views from Django 5.0
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    user = await _authenticate(request)
+    if user is None:
+        return JsonResponse({'error': 'Authentication credentials were not provided or are invalid.'}, status=401)
+
+    since = _parse_event_id(request.GET.get('since'))
+    try:
+        timeout = float(request.GET.get('timeout', REALTIME_LONG_POLL_SECONDS))
+    except (TypeError, ValueError):
+        timeout = math.nan
+    # nan would never reach the deadline in wait_for_events
+    if not math.isfinite(timeout):
+        return JsonResponse({'error': 'timeout must be a number of seconds.'}, status=400)
+    timeout = min(timeout, REALTIME_LONG_POLL_SECONDS)
+
+    if since is None or not isinstance(request, ASGIRequest) or timeout <= 0:
+        # A waiting request would pin a WSGI thread; answer immediately
+        events, latest = await read_events(user.id, since)
+    else:
+        events, latest = await wait_for_events(user.id, since, timeout)
+
+    return JsonResponse({
+        'events': events,
+        'last_event_id': latest,
+    }, encoder=DjangoJSONEncoder)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ReferenceConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'reference'
+
+    def ready(self):
+        from . import signals  # noqa: F401 - drops cached lists on changes
@@ -0,0 +1,75 @@
+"""
+The reference-data bundle: every reference catalog in one precompressed
+JSON document.
+
+Built once per content generation (see data.generation()) and held in
+process memory as identity, gzip and brotli bodies, each with a strong
+ETag derived from the content. Checking whether the held bundle is current
+costs one primary-key read of the generation, so revalidating clients get
+their 304 without any other database work.
+"""
+
+from django.core.serializers.json import DjangoJSONEncoder
+from .data import REFERENCE_LISTS, generation, rows
+import gzip
+import hashlib
+import json
+import threading
+
+try:
+    import brotli
+except ImportError:  # Optional; gzip is served instead
+    brotli = None
+
+# Content codings in order of preference
+ENCODINGS = ('br', 'gzip', 'identity')
+# Name fields are given in English plus, where the model has them,
+# *_kinyarwanda and *_french
+LANGUAGES = ['en', 'rw', 'fr']
+
+
+class Bundle:
+
+    def __init__(self, generation, version, content):
+        self.generation = generation
+        self.version = version
+        self.bodies = {'identity': content, 'gzip': gzip.compress(content, compresslevel=9)}
+        if brotli is not None:
+            self.bodies['br'] = brotli.compress(content, quality=11)
+        # Strong ETags differ per coding since the bytes do
+        self.etags = {
+            encoding: f'"{version}"' if encoding == 'identity' else f'"{version}-{encoding}"'
+            for encoding in self.bodies
+        }
+
+    def is_stale(self, current_generation):
+        return self.generation != current_generation
+
+
+_bundle = None
+_lock = threading.Lock()
+
+
+def _build(current_generation):
+    catalogs = {name: rows(name, current_generation) for name in REFERENCE_LISTS}
+    # The version only changes with the content, so clients keep their copy
+    # across generations that changed nothing visible
+    version = hashlib.sha256(json.dumps(catalogs, cls=DjangoJSONEncoder, sort_keys=True).encode()).hexdigest()[:32]
+    content = json.dumps(
+        {'version': version, 'languages': LANGUAGES, **catalogs},
+        cls=DjangoJSONEncoder, separators=(',', ':'), ensure_ascii=False,
+    ).encode()
+    return Bundle(current_generation, version, content)
+
+
+def current_bundle():
+    """The bundle for the current generation, rebuilt when it changed."""
+    global _bundle
+    current_generation = generation()
+    bundle = _bundle
+    if bundle is None or bundle.is_stale(current_generation):
+        with _lock:
+            bundle = _bundle
+            if bundle is None or bundle.is_stale(current_generation):
+                bundle = _bundle = _build(current_generation)
+    return bundle
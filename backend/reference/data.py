@@ -0,0 +1,109 @@
+"""
+Cached reference data: livestock types, breeds, diseases and product
+categories.
+
+These tables change a few times a year but every client lists them on
+start, so their serialized rows are kept in the cache and the list
+endpoints paginate the cached rows. Any change to a reference row bumps the
+content generation, a single database row (ReferenceGeneration), in the
+change's transaction (see signals.py). Cached rows are keyed by the
+generation, so with the per-process locmem cache too every worker serves
+the new rows once the change commits, for one primary-key read.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.response import Response
+import time
+
+REFERENCE_LISTS = ('livestock_types', 'breeds', 'diseases', 'categories')
+
+
+def _sources():
+    """{name: (queryset, serializer class)} of the cached lists."""
+    from cases.models import Disease
+    from cases.serializers import DiseaseSerializer
+    from livestock.models import Breed, LivestockType
+    from livestock.serializers import BreedSerializer, LivestockTypeSerializer
+    from marketplace.models import Category
+    from marketplace.serializers import CategorySerializer
+
+    return {
+        'livestock_types': (LivestockType.objects.order_by('name'), LivestockTypeSerializer),
+        'breeds': (
+            Breed.objects.select_related('livestock_type').order_by('livestock_type__name', 'name'),
+            BreedSerializer,
+        ),
+        'diseases': (Disease.objects.prefetch_related('affected_livestock_types').order_by('name'), DiseaseSerializer),
+        'categories': (Category.objects.order_by('name'), CategorySerializer),
+    }
+
+
+GENERATION_ID = 1
+
+
+def _cache_key(name, current_generation):
+    return f'reference:{name}:{current_generation}'
+
+
+def _timeout():
+    return getattr(settings, 'CACHE_TTL', {}).get('reference_data', 3600)
+
+
+def rows(name, current_generation=None):
+    """Serialized rows of a reference list, rebuilt on a cache miss."""
+    if current_generation is None:
+        current_generation = generation()
+    data = cache.get(_cache_key(name, current_generation))
+    if data is None:
+        queryset, serializer_class = _sources()[name]
+        data = list(serializer_class(queryset, many=True).data)
+        cache.set(_cache_key(name, current_generation), data, _timeout())
+    return data
+
+
+def warm():
+    """Load every reference list into the cache; returns {name: rows}."""
+    current_generation = generation()
+    return {name: len(rows(name, current_generation)) for name in REFERENCE_LISTS}
+
+
+def generation():
+    """Counter bumped by every reference change; one primary-key read."""
+    from .models import ReferenceGeneration
+    value = ReferenceGeneration.objects.filter(pk=GENERATION_ID).values_list('value', flat=True).first()
+    if value is None:
+        # Start from the clock so a recreated row never repeats an old value
+        row, _ = ReferenceGeneration.objects.get_or_create(pk=GENERATION_ID, defaults={'value': time.time_ns()})
+        value = row.value
+    return value
+
+
+def invalidate():
+    """Bump the generation; workers rebuild their lists once this commits."""
+    from .models import ReferenceGeneration
+    bumped = ReferenceGeneration.objects.filter(pk=GENERATION_ID).update(
+        value=F('value') + 1, updated_at=timezone.now()
+    )
+    if not bumped:
+        generation()
+
+
+class ReferenceListMixin:
+    """Serve a viewset's list() from the cached rows of ``reference_list``.
+
+    Override filter_rows() to apply query parameters to the cached rows.
+    """
+    reference_list = None
+
+    def filter_rows(self, data):
+        return data
+
+    def list(self, request, *args, **kwargs):
+        data = self.filter_rows(rows(self.reference_list))
+        page = self.paginate_queryset(data)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(data)
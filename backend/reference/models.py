@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class ReferenceGeneration(models.Model):
+    """Counter bumped by every change to the reference tables.
+
+    One row, so every worker sees a change as soon as it commits; the cached
+    reference lists and the bundle are keyed by its value (see data.py).
+    """
+    value = models.BigIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'reference_generation'
+
+    def __str__(self):
+        return f"Reference generation {self.value}"
@@ -0,0 +1,23 @@
+"""
+Bump the reference generation whenever a reference row changes.
+"""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from .data import invalidate
+
+REFERENCE_MODELS = ('livestock.LivestockType', 'livestock.Breed', 'cases.Disease', 'marketplace.Category')
+
+
+def _on_change(sender, raw=False, **kwargs):
+    # In the change's transaction: the new generation commits with the rows,
+    # so no request can cache the old rows under it
+    if not raw:
+        invalidate()
+
+
+for _model in REFERENCE_MODELS:
+    post_save.connect(_on_change, sender=_model, dispatch_uid=f'reference_save_{_model}')
+    post_delete.connect(_on_change, sender=_model, dispatch_uid=f'reference_delete_{_model}')
+m2m_changed.connect(
+    _on_change, sender='cases.Disease_affected_livestock_types', dispatch_uid='reference_m2m_disease_types',
+)
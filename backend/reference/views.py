@@ -0,0 +1,56 @@
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_http_methods
+from .bundle import ENCODINGS, current_bundle
+
+
+def _accepted_encodings(header):
+    """{coding: q} from an Accept-Encoding header."""
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding.strip():
+            accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def _negotiate(request, bundle):
+    accepted = _accepted_encodings(request.headers.get('Accept-Encoding', ''))
+    for encoding in ENCODINGS:
+        if encoding in bundle.bodies and accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+    return 'identity'
+
+
+@require_http_methods(['GET', 'HEAD'])
+def reference_bundle(request):
+    """Livestock types, breeds, diseases and product categories in one document.
+
+    Clients keep the ETag and send it back as If-None-Match on launch; an
+    unchanged bundle answers 304 after one primary-key read of the content
+    generation, without any other database work.
+    """
+    bundle = current_bundle()
+    encoding = _negotiate(request, bundle)
+
+    # If-None-Match compares weakly, and any coding of this version is current
+    if_none_match = request.headers.get('If-None-Match', '')
+    client_etags = {etag.removeprefix('W/') for etag in parse_etags(if_none_match)}
+    if client_etags & set(bundle.etags.values()):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(bundle.bodies[encoding], content_type='application/json')
+        if encoding != 'identity':
+            response['Content-Encoding'] = encoding
+    response['ETag'] = bundle.etags[encoding]
+    response['Vary'] = 'Accept-Encoding'
+    # Stored by clients and proxies, but revalidated on every use
+    response['Cache-Control'] = 'public, no-cache'
+    return response
@@ -6,30 +6,63 @@ echo "========================================="
 echo "Starting AnimalGuardian Backend on Render"
 echo "========================================="
 
-# Run migrations (silent mode for faster startup)
-echo "Running database migrations..."
-python manage.py migrate --noinput --verbosity=0 || {
-    echo "⚠ Migration failed, retrying..."
-    python manage.py migrate --noinput --verbosity=1 || {
+# Migrate and seed only when migrations or seed data changed since the last
+# boot (one query otherwise); FORCE_MIGRATE=1 always runs them
+echo "Preparing database..."
+PREPARE_ARGS=""
+if [ "${FORCE_MIGRATE:-0}" = "1" ]; then
+    PREPARE_ARGS="--force"
+fi
+python manage.py prepare_database $PREPARE_ARGS --verbosity=1 || {
+    echo "⚠ Database preparation failed, retrying..."
+    python manage.py prepare_database --force --verbosity=2 || {
         echo "❌ Migration failed. Check logs."
         exit 1
     }
 }
 
-# Seed livestock types if database is empty (idempotent - safe to run multiple times)
-echo "Checking if livestock types need to be seeded..."
-python manage.py seed_livestock_types --verbosity=0 || {
-    echo "⚠ Seed command failed, but continuing..."
-}
+# Request metrics are merged from per-worker snapshot files; start empty
+rm -rf "${METRICS_DIR:-/tmp/animalguardian-metrics}"
 
 # Get port from environment variable (Render sets this automatically)
 PORT=${PORT:-8000}
 
+# SERVER_PROFILE picks the worker class:
+#   gthread (default) - WSGI, 2 workers x 2 threads
+#   asgi              - asgi.py on 2 uvicorn workers; async views (health,
+#                       weather, notifications list/unread count, file upload,
+#                       realtime) wait on I/O without holding a thread, sync
+#                       DRF views run one at a time per worker; the other
+#                       profiles serve the DRF versions of those views
+# Django reads it too (settings.SERVER_PROFILE) to route them
+export SERVER_PROFILE=${SERVER_PROFILE:-gthread}
+
+if [ "$SERVER_PROFILE" = "asgi" ]; then
+    # Each ASGI request queries on its own thread, so persistent connections
+    # would never be reused
+    export DB_CONN_MAX_AGE=0
+    exec gunicorn animalguardian.asgi:application \
+        --config gunicorn.conf.py \
+        --bind 0.0.0.0:$PORT \
+        --workers 2 \
+        --worker-class uvicorn.workers.UvicornWorker \
+        --timeout 120 \
+        --keep-alive 5 \
+        --max-requests 1000 \
+        --max-requests-jitter 50 \
+        --preload \
+        --access-logfile - \
+        --error-logfile - \
+        --log-level info
+fi
+
 # Start gunicorn with optimized settings for Render
 # Workers: 2 (optimal for free tier)
 # Threads: 2 per worker
 # Timeout: 120 seconds
+# Workers warm up (DB, URLs, serializers, reference caches) before serving
 exec gunicorn animalguardian.wsgi:application \
+    --config gunicorn.conf.py \
     --bind 0.0.0.0:$PORT \
     --workers 2 \
     --threads 2 \
@@ -42,4 +75,3 @@ exec gunicorn animalguardian.wsgi:application \
     --access-logfile - \
     --error-logfile - \
     --log-level info
-
@@ -0,0 +1,59 @@
+"""
+Fingerprint of what a deploy needs from the database: the migration graph
+and the seed data.
+
+Computed from the code alone (migration files are read from disk, never
+from the database), so it can be compared with the stored one in a single
+query before deciding whether migrate and seeding have to run.
+"""
+
+from django.db import DatabaseError
+from django.db.migrations.loader import MigrationLoader
+import hashlib
+import inspect
+import json
+
+FINGERPRINT_KEY = 'schema_and_seed'
+
+
+def migration_graph_hash():
+    """Hash of every migration's name, dependencies and source."""
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    digest = hashlib.sha256()
+    for key in sorted(loader.graph.nodes):
+        migration = loader.graph.nodes[key]
+        digest.update(repr((key, sorted(migration.dependencies))).encode())
+        try:
+            digest.update(inspect.getsource(inspect.getmodule(migration)).encode())
+        except (OSError, TypeError):
+            pass  # No source available (e.g. compiled-only deploy); names still count
+    return digest.hexdigest()
+
+
+def seed_hash():
+    from livestock.seed import LIVESTOCK_TYPES
+    return hashlib.sha256(json.dumps(LIVESTOCK_TYPES, sort_keys=True).encode()).hexdigest()
+
+
+def current_fingerprint():
+    return hashlib.sha256(f'{migration_graph_hash()}:{seed_hash()}'.encode()).hexdigest()
+
+
+def stored_fingerprint():
+    """The fingerprint the database was last prepared for, or None.
+
+    None too when the table does not exist yet, i.e. on a fresh database.
+    """
+    from .models import StartupFingerprint
+    try:
+        return (
+            StartupFingerprint.objects.filter(key=FINGERPRINT_KEY)
+            .values_list('fingerprint', flat=True).first()
+        )
+    except DatabaseError:
+        return None
+
+
+def store_fingerprint(fingerprint):
+    from .models import StartupFingerprint
+    StartupFingerprint.objects.update_or_create(key=FINGERPRINT_KEY, defaults={'fingerprint': fingerprint})
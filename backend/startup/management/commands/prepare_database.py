@@ -0,0 +1,50 @@
+"""
+Django management command to bring the database up to date for a deploy.
+
+Compares the fingerprint of the migration graph and seed data with the one
+stored at the last successful run (one query). Only when they differ, or
+with --force, does it run migrate and seed_livestock_types, then store the
+new fingerprint. render-start.sh calls it on every boot, so an unchanged
+deploy starts without any migration round trips.
+
+Usage:
+    python manage.py prepare_database
+    python manage.py prepare_database --force
+"""
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from startup.fingerprint import current_fingerprint, stored_fingerprint, store_fingerprint
+import time
+
+
+class Command(BaseCommand):
+    help = 'Run migrate and seeding only when migrations or seed data changed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Migrate and seed even if nothing changed')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        verbosity = options['verbosity']
+        fingerprint = current_fingerprint()
+
+        if not options['force'] and stored_fingerprint() == fingerprint:
+            self.stdout.write(self.style.SUCCESS(
+                f'Database up to date ({fingerprint[:12]}); skipped migrate and seed '
+                f'in {time.perf_counter() - started:.2f}s'
+            ))
+            return
+
+        self.stdout.write('Migrations or seed data changed; running migrate and seed_livestock_types...')
+        call_command('migrate', interactive=False, verbosity=max(verbosity - 1, 0))
+        try:
+            call_command('seed_livestock_types', verbosity=max(verbosity - 1, 0))
+        except Exception as e:
+            # The app can serve without seed data; keep the old fingerprint so
+            # the next boot tries again
+            self.stdout.write(self.style.WARNING(f'Seeding failed, continuing: {e}'))
+            return
+        store_fingerprint(fingerprint)
+        self.stdout.write(self.style.SUCCESS(
+            f'Database prepared ({fingerprint[:12]}) in {time.perf_counter() - started:.2f}s'
+        ))
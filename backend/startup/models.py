@@ -0,0 +1,20 @@
+from django.db import models
+
+
+class StartupFingerprint(models.Model):
+    """Fingerprint of the schema and seed data the database was last prepared for.
+
+    render-start.sh compares it with the code being deployed and skips
+    migrate and seeding when they match.
+    """
+    key = models.CharField(max_length=50, unique=True)
+    fingerprint = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'startup_fingerprints'
+        verbose_name = 'Startup Fingerprint'
+        verbose_name_plural = 'Startup Fingerprints'
+
+    def __str__(self):
+        return f"{self.key}: {self.fingerprint[:12]}"
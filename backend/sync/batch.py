@@ -0,0 +1,294 @@
+"""
+Replay of offline mutations queued by the mobile app.
+
+A batch is an ordered list of mutations, each carrying a client generated
+idempotency key. Keys already applied are answered from the key store, the
+rest are validated with the regular API serializers and inserted with one
+bulk_create per mutation type inside a single transaction.
+
+Mutations may reference a livestock created earlier in the same batch (or
+in an earlier batch) with ``{"$ref": "<idempotency key>"}`` in place of the
+livestock id, so a case reported for an animal registered offline can be
+queued before either has reached the server.
+"""
+
+from django.conf import settings
+from django.db import transaction, IntegrityError
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from datetime import timedelta
+import logging
+from cases.read_model import refresh as refresh_case_list
+from cases.transitions import record_created as record_case_transitions
+from livestock.herd import rebuild as rebuild_herd_summaries
+from .changelog import record_bulk
+from .models import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+SYNC_IDEMPOTENCY_TTL = getattr(settings, 'SYNC_IDEMPOTENCY_TTL', timedelta(days=7))
+SYNC_BATCH_MAX_MUTATIONS = getattr(settings, 'SYNC_BATCH_MAX_MUTATIONS', 200)
+
+
+class MutationError(Exception):
+    """A mutation that cannot be applied; carries the per-item result."""
+
+    def __init__(self, status_code, errors):
+        super().__init__(errors)
+        self.status_code = status_code
+        self.errors = errors
+
+
+def _livestock_scope(request):
+    """Livestock the user may attach records to (same rules as the list API)."""
+    from livestock.views import LivestockViewSet
+    return LivestockViewSet(request=request).get_queryset()
+
+
+def _build_livestock(request, validated_data):
+    if request.user.user_type != 'farmer':
+        raise MutationError(403, {'error': 'Only farmers can create livestock records.'})
+    return {'owner': request.user, **validated_data}
+
+
+def _build_record(request, validated_data):
+    return dict(validated_data)
+
+
+def _build_case(request, validated_data):
+    validated_data = dict(validated_data)
+    validated_data['livestock_id'] = validated_data.pop('livestock_id', None) or None
+    validated_data['reporter'] = request.user
+    return validated_data
+
+
+class MutationType:
+    """How one kind of queued mutation is validated and inserted."""
+
+    def __init__(self, name, feed, model_path, serializer_path, build, livestock_field=None, stage=1):
+        self.name = name
+        self.feed = feed
+        self.model_path = model_path
+        self.serializer_path = serializer_path
+        self.build = build
+        self.livestock_field = livestock_field  # Attribute holding the livestock id to check
+        self.stage = stage  # Lower stages insert first so later ones can reference them
+
+    @property
+    def model(self):
+        from django.apps import apps
+        return apps.get_model(self.model_path)
+
+    @property
+    def serializer_class(self):
+        return import_string(self.serializer_path)
+
+
+MUTATION_TYPES = {
+    mutation.name: mutation for mutation in [
+        MutationType(
+            'livestock.create', 'livestock', 'livestock.Livestock',
+            'livestock.serializers.LivestockSerializer', _build_livestock, stage=0,
+        ),
+        MutationType(
+            'health_record.create', 'health_record', 'livestock.HealthRecord',
+            'livestock.serializers.HealthRecordSerializer', _build_record, livestock_field='livestock_id',
+        ),
+        MutationType(
+            'vaccination.create', 'vaccination', 'livestock.VaccinationRecord',
+            'livestock.serializers.VaccinationRecordSerializer', _build_record, livestock_field='livestock_id',
+        ),
+        MutationType(
+            'case_report.create', 'case_report', 'cases.CaseReport',
+            'cases.serializers.CaseReportSerializer', _build_case, livestock_field='livestock_id',
+        ),
+    ]
+}
+
+
+def _resolve_refs(data, created_ids):
+    """Replace {"$ref": key} values with the id created for that key."""
+    resolved = {}
+    for field, value in data.items():
+        if isinstance(value, dict) and '$ref' in value:
+            ref = value['$ref']
+            if ref not in created_ids:
+                raise MutationError(400, {field: [f'Unknown reference "{ref}".']})
+            value = created_ids[ref]
+        resolved[field] = value
+    return resolved
+
+
+def _insert(model, instances):
+    """bulk_create the instances; on a constraint failure retry one by one.
+
+    Returns (inserted, failed) where failed pairs an instance with its error.
+    """
+    try:
+        with transaction.atomic():
+            model.objects.bulk_create(instances)
+        return instances, []
+    except IntegrityError:
+        pass
+
+    inserted, failed = [], []
+    for instance in instances:
+        instance.pk = None
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create([instance])
+            inserted.append(instance)
+        except IntegrityError as e:
+            failed.append((instance, str(e)))
+    return inserted, failed
+
+
+def _apply_group(request, mutation_type, items, created_ids, results):
+    """Validate and insert all pending mutations of one type."""
+    model = mutation_type.model
+    serializer_class = mutation_type.serializer_class
+    context = {'request': request}
+
+    built = []  # (index, key, instance)
+    for index, mutation in items:
+        key = mutation['key']
+        try:
+            data = _resolve_refs(mutation['data'], created_ids)
+            serializer = serializer_class(data=data, context=context)
+            if not serializer.is_valid():
+                raise MutationError(400, serializer.errors)
+            instance = model(**mutation_type.build(request, serializer.validated_data))
+        except MutationError as e:
+            results[index] = {'key': key, 'type': mutation_type.name, 'status': e.status_code, 'errors': e.errors}
+            continue
+        built.append((index, key, instance))
+
+    # Check every referenced animal with one query
+    if mutation_type.livestock_field:
+        livestock_ids = {getattr(inst, mutation_type.livestock_field) for _, _, inst in built} - {None}
+        visible = {
+            livestock.pk: livestock
+            for livestock in _livestock_scope(request).filter(pk__in=livestock_ids)
+        } if livestock_ids else {}
+        allowed = []
+        for index, key, instance in built:
+            livestock_id = getattr(instance, mutation_type.livestock_field)
+            if livestock_id is not None and livestock_id not in visible:
+                results[index] = {
+                    'key': key, 'type': mutation_type.name, 'status': 400,
+                    'errors': {'livestock': ['Livestock not found.']},
+                }
+                continue
+            if livestock_id is not None:
+                instance.livestock = visible[livestock_id]
+            allowed.append((index, key, instance))
+        built = allowed
+
+    if model._meta.label == 'cases.CaseReport':
+        # bulk_create skips save(), which normally assigns the case id
+        for _, _, instance in built:
+            instance.case_id = instance.generate_case_id()
+
+    inserted, failed = _insert(model, [instance for _, _, instance in built])
+    failed_errors = {id(instance): error for instance, error in failed}
+    if inserted:
+        record_bulk(mutation_type.feed, inserted)
+        if model._meta.label == 'cases.CaseReport':
+            refresh_case_list([instance.pk for instance in inserted])
+            record_case_transitions(inserted)
+        elif model._meta.label == 'livestock.Livestock':
+            rebuild_herd_summaries({instance.owner_id for instance in inserted})
+        elif model._meta.label == 'livestock.VaccinationRecord':
+            rebuild_herd_summaries({instance.livestock.owner_id for instance in inserted})
+        data = serializer_class(inserted, many=True, context=context).data
+        serialized = {id(instance): item for instance, item in zip(inserted, data)}
+    else:
+        serialized = {}
+
+    for index, key, instance in built:
+        if id(instance) in failed_errors:
+            results[index] = {
+                'key': key, 'type': mutation_type.name, 'status': 409,
+                'errors': {'error': 'Conflicts with an existing record.', 'detail': failed_errors[id(instance)]},
+            }
+            continue
+        created_ids[key] = instance.pk
+        results[index] = {
+            'key': key, 'type': mutation_type.name, 'status': 201,
+            'id': instance.pk, 'replayed': False, 'data': serialized[id(instance)],
+        }
+
+
+def apply_batch(request, mutations):
+    """Apply an ordered list of mutations and return one result per item.
+
+    Raises IntegrityError if another request stored one of the same keys
+    while this batch was running; the caller should answer 409 so the
+    client retries and picks up the stored outcomes.
+    """
+    user = request.user
+    now = timezone.now()
+    results = [None] * len(mutations)
+
+    pending = []
+    seen_keys = set()
+    for index, mutation in enumerate(mutations):
+        key = mutation.get('key') if isinstance(mutation, dict) else None
+        mutation_type = MUTATION_TYPES.get(mutation.get('type')) if isinstance(mutation, dict) else None
+        if not isinstance(key, str) or not key or len(key) > 100:
+            results[index] = {'key': key, 'status': 400, 'errors': {'key': ['A key of at most 100 characters is required.']}}
+        elif mutation_type is None:
+            results[index] = {'key': key, 'status': 400, 'errors': {'type': [f'Supported types: {", ".join(MUTATION_TYPES)}.']}}
+        elif not isinstance(mutation.get('data'), dict):
+            results[index] = {'key': key, 'status': 400, 'errors': {'data': ['An object is required.']}}
+        elif key in seen_keys:
+            results[index] = {'key': key, 'status': 400, 'errors': {'key': ['Duplicate key in batch.']}}
+        else:
+            seen_keys.add(key)
+            pending.append((index, mutation))
+
+    # Load the outcomes of this batch's keys and of keys referenced from an earlier batch
+    referenced = {
+        value['$ref'] for _, mutation in pending for value in mutation['data'].values()
+        if isinstance(value, dict) and isinstance(value.get('$ref'), str)
+    }
+    remembered = {
+        entry.key: entry
+        for entry in IdempotencyKey.objects.filter(user=user, key__in=seen_keys | referenced, expires_at__gt=now)
+    }
+    stored = {key: entry for key, entry in remembered.items() if key in seen_keys}
+    created_ids = {key: entry.object_id for key, entry in remembered.items() if entry.object_id}
+
+    to_apply = []
+    for index, mutation in pending:
+        entry = stored.get(mutation['key'])
+        if entry:
+            results[index] = {
+                'key': entry.key, 'type': entry.mutation_type, 'status': entry.status_code,
+                'id': entry.object_id, 'replayed': True,
+            }
+        else:
+            to_apply.append((index, mutation))
+
+    with transaction.atomic():
+        for stage in sorted({mutation_type.stage for mutation_type in MUTATION_TYPES.values()}):
+            for mutation_type in MUTATION_TYPES.values():
+                if mutation_type.stage != stage:
+                    continue
+                items = [(i, m) for i, m in to_apply if m['type'] == mutation_type.name]
+                if items:
+                    _apply_group(request, mutation_type, items, created_ids, results)
+
+        # Only successful outcomes are remembered; a rejected mutation can be
+        # corrected and resent under the same key
+        expires_at = now + SYNC_IDEMPOTENCY_TTL
+        IdempotencyKey.objects.filter(user=user, key__in=seen_keys, expires_at__lte=now).delete()
+        IdempotencyKey.objects.bulk_create([
+            IdempotencyKey(
+                user=user, key=results[i]['key'], mutation_type=results[i]['type'],
+                object_id=results[i]['id'], status_code=results[i]['status'], expires_at=expires_at,
+            )
+            for i, _ in to_apply if results[i]['status'] == 201
+        ])
+
+    return results
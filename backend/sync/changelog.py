@@ -0,0 +1,129 @@
+"""
+Feed registry and change recording helpers for the delta-sync API.
+
+Each feed names a model the mobile app mirrors offline, the users whose
+devices hold a copy of a given row (its audience), and how rows are loaded
+and serialized when a client pulls changes.
+"""
+
+from django.db.models import Q
+from .models import ChangeLogEntry
+
+
+class Feed:
+    """Description of one synced model."""
+
+    def __init__(self, key, model_path, serializer_path, audience, scope, select_related=()):
+        self.key = key
+        self.model_path = model_path
+        self.serializer_path = serializer_path
+        self.audience = audience          # instance -> set of user ids
+        self.scope = scope                # user -> Q limiting rows to that user
+        self.select_related = select_related
+
+    @property
+    def model(self):
+        from django.apps import apps
+        return apps.get_model(self.model_path)
+
+    @property
+    def serializer_class(self):
+        from django.utils.module_loading import import_string
+        return import_string(self.serializer_path)
+
+    def queryset(self, user):
+        return self.model.objects.select_related(*self.select_related).filter(self.scope(user))
+
+
+def _livestock_owner(instance):
+    """Owner of the animal a health/vaccination record belongs to."""
+    if instance.livestock_id is None:
+        return set()
+    return {instance.livestock.owner_id}
+
+
+def _case_audience(case):
+    return {uid for uid in (case.reporter_id, case.assigned_veterinarian_id) if uid}
+
+
+FEEDS = [
+    Feed(
+        'livestock', 'livestock.Livestock', 'livestock.serializers.LivestockSerializer',
+        audience=lambda obj: {obj.owner_id},
+        scope=lambda user: Q(owner=user),
+        select_related=('owner', 'livestock_type', 'breed'),
+    ),
+    Feed(
+        'health_record', 'livestock.HealthRecord', 'livestock.serializers.HealthRecordSerializer',
+        audience=_livestock_owner,
+        scope=lambda user: Q(livestock__owner=user),
+    ),
+    Feed(
+        'vaccination', 'livestock.VaccinationRecord', 'livestock.serializers.VaccinationRecordSerializer',
+        audience=_livestock_owner,
+        scope=lambda user: Q(livestock__owner=user),
+    ),
+    Feed(
+        'case_report', 'cases.CaseReport', 'cases.serializers.CaseReportSerializer',
+        audience=_case_audience,
+        scope=lambda user: Q(reporter=user) | Q(assigned_veterinarian=user),
+        select_related=(
+            'reporter', 'assigned_veterinarian', 'assigned_by', 'livestock',
+            'livestock__owner', 'livestock__livestock_type', 'livestock__breed',
+            'suspected_disease',
+        ),
+    ),
+    Feed(
+        'notification', 'notifications.Notification', 'notifications.serializers.NotificationSerializer',
+        audience=lambda obj: {obj.recipient_id},
+        scope=lambda user: Q(recipient=user),
+    ),
+]
+
+FEEDS_BY_KEY = {feed.key: feed for feed in FEEDS}
+
+
+def feed_for_model(model):
+    """Return the feed for a model class, or None if it is not synced."""
+    label = model._meta.label
+    for feed in FEEDS:
+        if feed.model_path == label:
+            return feed
+    return None
+
+
+def record_change(feed_key, object_id, user_ids, action='upsert'):
+    """Append one change log entry per user that mirrors the object."""
+    entries = [
+        ChangeLogEntry(user_id=user_id, model=feed_key, object_id=object_id, action=action)
+        for user_id in user_ids if user_id
+    ]
+    if entries:
+        ChangeLogEntry.objects.bulk_create(entries)
+
+
+def record_changes(feed_key, object_ids, user_ids, action='upsert'):
+    """Log the same change for many objects sharing one audience."""
+    entries = [
+        ChangeLogEntry(user_id=user_id, model=feed_key, object_id=object_id, action=action)
+        for object_id in object_ids
+        for user_id in user_ids if user_id
+    ]
+    if entries:
+        ChangeLogEntry.objects.bulk_create(entries)
+
+
+def record_bulk(feed_key, instances, action='upsert'):
+    """Record changes for rows written with bulk_create() or update().
+
+    Those paths bypass model signals, so callers that use them must log the
+    affected rows themselves.
+    """
+    feed = FEEDS_BY_KEY[feed_key]
+    entries = [
+        ChangeLogEntry(user_id=user_id, model=feed_key, object_id=obj.pk, action=action)
+        for obj in instances
+        for user_id in feed.audience(obj) if user_id
+    ]
+    if entries:
+        ChangeLogEntry.objects.bulk_create(entries)
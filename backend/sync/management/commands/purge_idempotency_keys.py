@@ -0,0 +1,18 @@
+"""
+Django management command to delete expired offline-replay idempotency keys.
+
+Usage:
+    python manage.py purge_idempotency_keys
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from sync.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = 'Delete idempotency keys whose TTL has passed'
+
+    def handle(self, *args, **options):
+        deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).delete()
+        if options.get('verbosity', 1) >= 1:
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired idempotency keys'))
@@ -0,0 +1,66 @@
+"""
+Change log backing the offline delta-sync feed.
+"""
+
+from django.db import models
+from accounts.models import User
+
+
+class ChangeLogEntry(models.Model):
+    """One row per (user, object) change the user's devices need to replay.
+
+    The auto-increment id doubles as the sync token: a client that has seen
+    entry N asks for everything with id > N for its own user, which is a
+    single range scan on the (user, id) index.
+    """
+
+    ACTION_CHOICES = [
+        ('upsert', 'Created or Updated'),
+        ('delete', 'Deleted'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sync_changes')
+    model = models.CharField(max_length=50)  # Feed key, e.g. 'livestock', 'case_report'
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'sync_change_log'
+        verbose_name = 'Change Log Entry'
+        verbose_name_plural = 'Change Log Entries'
+        indexes = [
+            models.Index(fields=['user', 'id'], name='sync_change_user_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.model}#{self.object_id} for user {self.user_id}"
+
+
+class IdempotencyKey(models.Model):
+    """Outcome of an offline mutation, keyed by the client's idempotency key.
+
+    A replayed batch finds its keys here and returns the stored outcome
+    instead of applying the mutation a second time. Rows expire after
+    ``SYNC_IDEMPOTENCY_TTL`` and are removed by ``purge_idempotency_keys``.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='idempotency_keys')
+    key = models.CharField(max_length=100)
+    mutation_type = models.CharField(max_length=50)
+    object_id = models.BigIntegerField(null=True, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'sync_idempotency_keys'
+        verbose_name = 'Idempotency Key'
+        verbose_name_plural = 'Idempotency Keys'
+        unique_together = ['user', 'key']
+        indexes = [
+            models.Index(fields=['expires_at'], name='sync_idem_expires_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.key} ({self.mutation_type}) for user {self.user_id}"
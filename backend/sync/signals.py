@@ -0,0 +1,35 @@
+"""
+Model signal receivers that keep the sync change log current.
+
+Entries are written inside the same transaction as the change itself, so a
+rolled back save never leaves a phantom entry behind.
+"""
+
+from django.db.models.signals import post_save, pre_delete
+from .changelog import FEEDS, feed_for_model, record_change
+
+
+def _on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    feed = feed_for_model(sender)
+    audience = feed.audience(instance)
+    record_change(feed.key, instance.pk, audience, 'upsert')
+
+    # A reassigned case disappears from the previous vet's device
+    if feed.key == 'case_report' and not created:
+        previous_vet = instance.loaded_value('assigned_veterinarian_id')
+        if previous_vet and previous_vet not in audience:
+            record_change(feed.key, instance.pk, [previous_vet], 'delete')
+
+
+def _on_delete(sender, instance, **kwargs):
+    # pre_delete so related rows needed to resolve the audience still exist
+    # while a cascade is in progress
+    feed = feed_for_model(sender)
+    record_change(feed.key, instance.pk, feed.audience(instance), 'delete')
+
+
+for _feed in FEEDS:
+    post_save.connect(_on_save, sender=_feed.model_path, dispatch_uid=f'sync_save_{_feed.key}')
+    pre_delete.connect(_on_delete, sender=_feed.model_path, dispatch_uid=f'sync_delete_{_feed.key}')
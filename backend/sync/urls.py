@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.changes, name='sync-changes'),
+    path('batch/', views.batch, name='sync-batch'),
+]
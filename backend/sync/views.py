@@ -0,0 +1,146 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from django.conf import settings
+from django.db import IntegrityError
+from django.utils import timezone
+from datetime import timedelta
+from .batch import apply_batch, SYNC_BATCH_MAX_MUTATIONS
+from .changelog import FEEDS, FEEDS_BY_KEY
+from .models import ChangeLogEntry
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Entries younger than this are held back for one more round so that a
+# transaction which took a lower id but committed late is not skipped.
+SYNC_SETTLE_SECONDS = getattr(settings, 'SYNC_SETTLE_SECONDS', 2)
+SYNC_PAGE_SIZE = getattr(settings, 'SYNC_PAGE_SIZE', 500)
+
+
+def _empty_payload():
+    return {feed.key: [] for feed in FEEDS}
+
+
+def _serialize(feed, rows, request):
+    return feed.serializer_class(rows, many=True, context={'request': request}).data
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def changes(request):
+    """Delta-sync feed for the offline mobile app.
+
+    Without ``since`` the response is a full snapshot of the user's rows plus
+    a token. With ``since=<token>`` only rows changed after that token are
+    returned, with deleted (or no longer visible) rows listed under
+    ``deleted``. Keep calling with the returned token while ``has_more``.
+    """
+    user = request.user
+    since = request.query_params.get('since')
+
+    if since in (None, ''):
+        # Take the token before reading rows so changes made meanwhile replay
+        token = ChangeLogEntry.objects.filter(user=user).order_by('-id').values_list('id', flat=True).first() or 0
+        payload = {
+            feed.key: _serialize(feed, feed.queryset(user), request)
+            for feed in FEEDS
+        }
+        return Response({
+            'token': str(token),
+            'has_more': False,
+            'full_sync': True,
+            'changes': payload,
+            'deleted': _empty_payload(),
+        })
+
+    try:
+        since = int(since)
+    except (TypeError, ValueError):
+        return Response({
+            'error': 'Invalid sync token.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    horizon = timezone.now() - timedelta(seconds=SYNC_SETTLE_SECONDS)
+    entries = list(
+        ChangeLogEntry.objects.filter(user=user, id__gt=since, created_at__lte=horizon)
+        .order_by('id')
+        .values_list('id', 'model', 'object_id', 'action')[:SYNC_PAGE_SIZE + 1]
+    )
+    has_more = len(entries) > SYNC_PAGE_SIZE
+    entries = entries[:SYNC_PAGE_SIZE]
+
+    changed = _empty_payload()
+    deleted = _empty_payload()
+    if not entries:
+        return Response({
+            'token': str(since),
+            'has_more': False,
+            'full_sync': False,
+            'changes': changed,
+            'deleted': deleted,
+        })
+
+    # Only the latest action per object matters
+    latest = {}
+    for entry_id, model_key, object_id, action in entries:
+        latest[(model_key, object_id)] = action
+
+    upserts = {}
+    for (model_key, object_id), action in latest.items():
+        if model_key not in FEEDS_BY_KEY:
+            continue
+        if action == 'delete':
+            deleted[model_key].append(object_id)
+        else:
+            upserts.setdefault(model_key, set()).add(object_id)
+
+    for model_key, ids in upserts.items():
+        feed = FEEDS_BY_KEY[model_key]
+        rows = list(feed.queryset(user).filter(pk__in=ids))
+        changed[model_key] = _serialize(feed, rows, request)
+        # Rows gone or out of scope since the entry was written are tombstones
+        deleted[model_key].extend(sorted(ids - {row.pk for row in rows}))
+
+    return Response({
+        'token': str(entries[-1][0]),
+        'has_more': has_more,
+        'full_sync': False,
+        'changes': changed,
+        'deleted': deleted,
+    })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def batch(request):
+    """Apply mutations queued offline, each under a client idempotency key.
+
+    Body: ``{"mutations": [{"key": "...", "type": "case_report.create",
+    "data": {...}}, ...]}``. Returns one result per mutation in the same
+    order. Resending keys that were already applied is a no-op that returns
+    the stored outcome with ``"replayed": true``.
+    """
+    mutations = request.data.get('mutations') if isinstance(request.data, dict) else None
+    if not isinstance(mutations, list) or not mutations:
+        return Response({
+            'error': 'mutations must be a non-empty list.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if len(mutations) > SYNC_BATCH_MAX_MUTATIONS:
+        return Response({
+            'error': f'A batch can hold at most {SYNC_BATCH_MAX_MUTATIONS} mutations.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        results = apply_batch(request, mutations)
+    except IntegrityError:
+        # Another request stored the same keys concurrently; nothing from
+        # this batch was kept, and a retry will be answered from the store
+        logger.warning(f"Concurrent replay of sync batch for user {request.user.id}")
+        return Response({
+            'error': 'This batch is already being applied. Please retry.'
+        }, status=status.HTTP_409_CONFLICT)
+
+    return Response({'results': results}, status=status.HTTP_200_OK)
@@ -0,0 +1,40 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from accounts.authentication import ClaimsRefreshToken
+from .factories import UserFactory, FarmerFactory, LocalVetFactory
+
+_USER_FACTORIES = {
+    'farmer': FarmerFactory,
+    'local_vet': LocalVetFactory,
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Cached dashboards, unread counters and token markers must not leak
+    # between tests
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def make_user(db):
+    """Create a user of the given user_type, with the profile it would have."""
+    def make(user_type, **kwargs):
+        factory = _USER_FACTORIES.get(user_type, UserFactory)
+        return factory(user_type=user_type, **kwargs)
+    return make
+
+
+@pytest.fixture
+def api_client_for():
+    """APIClient sending a JWT for the given user, as the apps do."""
+    def client_for(user):
+        client = APIClient()
+        token = ClaimsRefreshToken.for_user(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client
+    return client_for
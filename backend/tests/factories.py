@@ -0,0 +1,210 @@
+"""
+factory-boy factories for the models the API serves.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+import factory
+
+from accounts.models import User, VeterinarianProfile, FarmerProfile
+from cases.models import Disease, CaseReport
+from community.models import Post, PostLike, Comment, Conversation, Message
+from livestock.models import LivestockType, Breed, Livestock, HealthRecord, VaccinationRecord
+from marketplace.models import Category, Product
+from notifications.models import Notification, BroadcastMessage
+
+
+class UserFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = User
+
+    username = factory.Sequence(lambda n: f'user{n}')
+    phone_number = factory.Sequence(lambda n: f'078{n:07d}')
+    first_name = factory.Faker('first_name')
+    last_name = factory.Faker('last_name')
+    user_type = 'farmer'
+    province = 'Eastern'
+    district = 'Nyagatare'
+    sector = 'Karangazi'
+    is_verified = True
+    is_approved_by_admin = True
+    # Tests authenticate with tokens, so skip the password hasher
+    password = '!'
+
+
+class FarmerFactory(UserFactory):
+    class Meta:
+        skip_postgeneration_save = True
+
+    user_type = 'farmer'
+    farmer_profile = factory.RelatedFactory('tests.factories.FarmerProfileFactory', factory_related_name='user')
+
+
+class LocalVetFactory(UserFactory):
+    class Meta:
+        skip_postgeneration_save = True
+
+    user_type = 'local_vet'
+    vet_profile = factory.RelatedFactory('tests.factories.VeterinarianProfileFactory', factory_related_name='user')
+
+
+class FarmerProfileFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = FarmerProfile
+
+    user = factory.SubFactory(UserFactory)
+    farm_name = factory.Sequence(lambda n: f'Farm {n}')
+
+
+class VeterinarianProfileFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = VeterinarianProfile
+
+    user = factory.SubFactory(UserFactory, user_type='local_vet')
+    license_number = factory.Sequence(lambda n: f'VET{n:05d}')
+    license_type = 'licensed'
+
+
+class LivestockTypeFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = LivestockType
+
+    name = factory.Sequence(lambda n: f'Type {n}')
+
+
+class BreedFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Breed
+
+    livestock_type = factory.SubFactory(LivestockTypeFactory)
+    name = factory.Sequence(lambda n: f'Breed {n}')
+
+
+class LivestockFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Livestock
+
+    owner = factory.SubFactory(FarmerFactory)
+    livestock_type = factory.SubFactory(LivestockTypeFactory)
+    breed = factory.SubFactory(BreedFactory, livestock_type=factory.SelfAttribute('..livestock_type'))
+    name = factory.Sequence(lambda n: f'Animal {n}')
+    gender = 'F'
+
+
+class HealthRecordFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = HealthRecord
+
+    livestock = factory.SubFactory(LivestockFactory)
+    check_date = factory.LazyFunction(date.today)
+    check_type = 'routine'
+
+
+class VaccinationRecordFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = VaccinationRecord
+
+    livestock = factory.SubFactory(LivestockFactory)
+    vaccine_name = 'FMD'
+    vaccination_date = factory.LazyFunction(date.today)
+    next_due_date = factory.LazyFunction(lambda: date.today() + timedelta(days=180))
+
+
+class DiseaseFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Disease
+
+    name = factory.Sequence(lambda n: f'Disease {n}')
+
+
+class CaseReportFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = CaseReport
+
+    case_id = factory.Sequence(lambda n: f'CRTEST{n:06d}')
+    reporter = factory.SubFactory(FarmerFactory)
+    livestock = factory.SubFactory(LivestockFactory, owner=factory.SelfAttribute('..reporter'))
+    assigned_veterinarian = factory.SubFactory(LocalVetFactory)
+    assigned_by = factory.SubFactory(UserFactory, user_type='sector_vet')
+    suspected_disease = factory.SubFactory(DiseaseFactory)
+    symptoms_observed = 'Fever and loss of appetite'
+
+
+class PostFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Post
+
+    author = factory.SubFactory(FarmerFactory)
+    title = factory.Sequence(lambda n: f'Post {n}')
+    content = 'How do I treat mastitis?'
+
+
+class CommentFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Comment
+
+    post = factory.SubFactory(PostFactory)
+    author = factory.SubFactory(FarmerFactory)
+    content = 'Call your local vet.'
+
+
+class PostLikeFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = PostLike
+
+    post = factory.SubFactory(PostFactory)
+    user = factory.SubFactory(FarmerFactory)
+
+
+class ConversationFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Conversation
+
+    participant1 = factory.SubFactory(FarmerFactory)
+    participant2 = factory.SubFactory(LocalVetFactory)
+
+
+class MessageFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Message
+
+    conversation = factory.SubFactory(ConversationFactory)
+    sender = factory.SelfAttribute('conversation.participant2')
+    content = 'Hello'
+
+
+class CategoryFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Category
+
+    name = factory.Sequence(lambda n: f'Category {n}')
+
+
+class ProductFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Product
+
+    seller = factory.SubFactory(FarmerFactory)
+    category = factory.SubFactory(CategoryFactory)
+    name = factory.Sequence(lambda n: f'Product {n}')
+    description = 'Fresh milk'
+    price = Decimal('500.00')
+
+
+class NotificationFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Notification
+
+    recipient = factory.SubFactory(FarmerFactory)
+    channel = 'in_app'
+    title = 'Case update'
+    message = 'Your case was assigned.'
+
+
+class BroadcastMessageFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = BroadcastMessage
+
+    title = factory.Sequence(lambda n: f'Broadcast {n}')
+    message = 'Vaccination campaign next week.'
+    created_by = factory.SubFactory(UserFactory, user_type='sector_vet')
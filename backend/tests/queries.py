@@ -0,0 +1,35 @@
+"""
+Helpers for comparing the SQL two requests executed.
+"""
+
+from collections import Counter
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import re
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'IN \((?:\?, )*\?\)')
+
+
+def normalize_sql(sql):
+    """SQL with literals replaced by ?, so repeats of one statement compare equal."""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    return _IN_LIST.sub('IN (...)', sql)
+
+
+def capture_queries(func):
+    """Call func() and return (its result, the SQL statements it executed)."""
+    with CaptureQueriesContext(connection) as context:
+        result = func()
+    return result, [query['sql'] for query in context.captured_queries]
+
+
+def query_diff(expected, actual):
+    """Readable summary of the statements actual ran more often than expected."""
+    extra = Counter(map(normalize_sql, actual)) - Counter(map(normalize_sql, expected))
+    lines = [f'{len(expected)} queries became {len(actual)}; repeated statements:']
+    for sql, times in extra.most_common():
+        lines.append(f'  +{times} x {sql}')
+    return '\n'.join(lines)
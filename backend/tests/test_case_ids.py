@@ -0,0 +1,35 @@
+"""
+Generated case ids stay unique when many cases are reported in one second.
+"""
+
+from unittest import mock
+import pytest
+
+from cases.models import CaseReport
+from .factories import CaseReportFactory
+
+
+@pytest.mark.django_db
+def test_cases_reported_in_the_same_second_get_distinct_ids():
+    cases = CaseReportFactory.create_batch(20, case_id='')
+    ids = {case.case_id for case in cases}
+    assert len(ids) == 20
+    assert all(len(case_id) <= 20 and case_id.startswith('CR') for case_id in ids)
+
+
+@pytest.mark.django_db
+def test_a_colliding_generated_id_is_drawn_again():
+    taken = CaseReportFactory(case_id='').case_id
+    fresh = 'CR20261019120000ABCD'
+    with mock.patch.object(CaseReport, 'generate_case_id', side_effect=[taken, fresh]):
+        case = CaseReportFactory(case_id='')
+    assert case.case_id == fresh
+    assert CaseReport.objects.filter(case_id=fresh).count() == 1
+
+
+@pytest.mark.django_db
+def test_an_explicit_duplicate_id_is_still_an_error():
+    from django.db import IntegrityError
+    taken = CaseReportFactory().case_id
+    with pytest.raises(IntegrityError):
+        CaseReportFactory(case_id=taken)
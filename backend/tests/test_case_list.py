@@ -0,0 +1,57 @@
+"""
+The case list, served from the CaseListEntry read model, keeps the keys the
+apps read: the nested livestock object of the web dashboard and the flat
+labels of the mobile app.
+"""
+
+import pytest
+
+from .factories import BreedFactory, CaseReportFactory, LivestockFactory
+
+
+def _listed(client):
+    response = client.get('/api/cases/reports/')
+    assert response.status_code == 200
+    return response.data['results'] if isinstance(response.data, dict) else response.data
+
+
+@pytest.mark.django_db
+def test_case_list_nests_livestock_type_and_breed(make_user, api_client_for):
+    farmer = make_user('farmer')
+    livestock = LivestockFactory(owner=farmer, breed__name='Ankole')
+    case = CaseReportFactory(reporter=farmer, livestock=livestock)
+
+    [entry] = _listed(api_client_for(farmer))
+
+    assert entry['case_id'] == case.case_id
+    assert entry['livestock'] == {
+        'id': livestock.pk,
+        'name': livestock.name,
+        'tag_number': livestock.tag_number,
+        'livestock_type': {'name': livestock.livestock_type.name},
+        'breed': {'name': 'Ankole'},
+    }
+    assert entry['livestock_name'] == livestock.name
+    assert entry['livestock_type'] == livestock.livestock_type.name
+    assert entry['livestock_breed'] == 'Ankole'
+
+
+@pytest.mark.django_db
+def test_breed_changes_reach_the_case_list(make_user, api_client_for):
+    farmer = make_user('farmer')
+    livestock = LivestockFactory(owner=farmer, breed=None)
+    CaseReportFactory(reporter=farmer, livestock=livestock)
+    client = api_client_for(farmer)
+    assert _listed(client)[0]['livestock']['breed'] is None
+
+    breed = BreedFactory(livestock_type=livestock.livestock_type, name='Friesian')
+    livestock.breed = breed
+    livestock.save(update_fields=['breed'])
+    assert _listed(client)[0]['livestock']['breed'] == {'name': 'Friesian'}
+
+    breed.name = 'Holstein-Friesian'
+    breed.save()
+    assert _listed(client)[0]['livestock_breed'] == 'Holstein-Friesian'
+
+    breed.delete()
+    assert _listed(client)[0]['livestock']['breed'] is None
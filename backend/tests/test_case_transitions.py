@@ -0,0 +1,109 @@
+"""
+The case status journal: each status change appends a transition carrying
+the time spent in the status it left, taken from the previous transition.
+"""
+
+from datetime import timedelta
+import pytest
+from django.utils import timezone
+
+from cases import transitions
+from cases.models import CaseReport, CaseStatusTransition
+from .factories import CaseReportFactory
+
+T0 = timezone.now().replace(microsecond=0) - timedelta(days=1)
+
+
+def _journal(case):
+    return list(
+        CaseStatusTransition.objects.filter(case_report=case).order_by('at', 'pk')
+        .values_list('from_status', 'to_status', 'seconds_in_from_status')
+    )
+
+
+@pytest.fixture
+def case(db):
+    case = CaseReportFactory(status='pending')
+    # Start the journal at a known time
+    CaseStatusTransition.objects.filter(case_report=case).update(at=T0)
+    return case
+
+
+def test_saved_cases_are_journalled_with_their_actor(case):
+    assert _journal(case) == [('', 'pending', None)]
+    assert CaseStatusTransition.objects.get(case_report=case).actor_id == case.reporter_id
+
+    loaded = CaseReport.objects.get(pk=case.pk)
+    loaded.status = 'under_review'
+    loaded.status_changed_by = case.assigned_by
+    loaded.save()
+
+    latest = CaseStatusTransition.objects.filter(case_report=case).latest('at')
+    assert (latest.from_status, latest.to_status, latest.actor_id) == ('pending', 'under_review', case.assigned_by_id)
+    assert latest.seconds_in_from_status == pytest.approx((latest.at - T0).total_seconds(), abs=1)
+
+
+def test_saves_without_a_status_change_are_not_journalled(case):
+    loaded = CaseReport.objects.get(pk=case.pk)
+    loaded.location_notes = 'Near the river'
+    loaded.save()
+    assert len(_journal(case)) == 1
+
+
+def test_record_chains_time_in_status(case):
+    case.status = 'under_review'
+    transitions.record(case, 'pending', at=T0 + timedelta(minutes=30))
+    case.status = 'diagnosed'
+    transitions.record(case, 'under_review', at=T0 + timedelta(hours=2))
+
+    assert _journal(case) == [
+        ('', 'pending', None),
+        ('pending', 'under_review', 30 * 60),
+        ('under_review', 'diagnosed', 90 * 60),
+    ]
+
+
+def test_record_changed_chains_from_each_case_latest_transition(case):
+    other = CaseReportFactory(status='under_review')
+    CaseStatusTransition.objects.filter(case_report=other).update(at=T0 + timedelta(hours=1))
+    at = T0 + timedelta(hours=3)
+
+    transitions.record_changed([case, other], 'escalated', at)
+
+    assert _journal(case)[-1] == ('pending', 'escalated', 3 * 3600)
+    assert _journal(other)[-1] == ('under_review', 'escalated', 2 * 3600)
+
+
+def test_record_changed_without_a_journal_leaves_the_time_unknown(db):
+    case = CaseReportFactory(status='pending')
+    CaseStatusTransition.objects.filter(case_report=case).delete()
+
+    transitions.record_changed([case], 'escalated', T0)
+
+    assert _journal(case) == [('pending', 'escalated', None)]
+
+
+def test_mean_time_in_status_over_a_period(case):
+    case.status = 'under_review'
+    transitions.record(case, 'pending', at=T0 + timedelta(minutes=10))
+    other = CaseReportFactory(status='pending')
+    CaseStatusTransition.objects.filter(case_report=other).update(at=T0)
+    other.status = 'under_review'
+    transitions.record(other, 'pending', at=T0 + timedelta(minutes=30))
+
+    stats = transitions.mean_time_in_status(since=T0, until=T0 + timedelta(hours=1))
+
+    assert stats == {'pending': {'count': 2, 'mean_seconds': 20 * 60, 'min_seconds': 10 * 60, 'max_seconds': 30 * 60}}
+    assert transitions.mean_time_in_status(since=T0 + timedelta(minutes=20), until=T0 + timedelta(hours=1))['pending']['count'] == 1
+
+
+def test_timeline_lists_the_journal(case, api_client_for):
+    case.status = 'under_review'
+    transitions.record(case, 'pending', at=T0 + timedelta(minutes=5))
+
+    response = api_client_for(case.reporter).get(f'/api/cases/reports/{case.pk}/timeline/')
+
+    assert response.status_code == 200
+    assert [(t['from_status'], t['to_status']) for t in response.data['transitions']] == [
+        ('', 'pending'), ('pending', 'under_review'),
+    ]
@@ -0,0 +1,43 @@
+"""
+Conditional GET (ConditionalGetMixin): unchanged rows answer 304, and a
+lookup value that cannot match still reaches retrieve's 404.
+"""
+
+import pytest
+
+from .factories import CaseReportFactory, ConversationFactory
+
+
+@pytest.mark.parametrize('url', [
+    '/api/cases/reports/abc/',
+    '/api/livestock/abc/',
+    '/api/notifications/abc/',
+    '/api/community/conversations/abc/',
+])
+def test_non_numeric_pk_is_not_found(make_user, api_client_for, url):
+    client = api_client_for(make_user('farmer'))
+
+    assert client.get(url).status_code == 404
+    assert client.get(url, HTTP_IF_NONE_MATCH='W/"abc"').status_code == 404
+
+
+def test_unchanged_case_answers_304(db, api_client_for):
+    case = CaseReportFactory()
+    client = api_client_for(case.reporter)
+    url = f'/api/cases/reports/{case.pk}/'
+
+    response = client.get(url)
+    assert response.status_code == 200
+
+    assert client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == 304
+
+
+def test_unchanged_conversation_answers_304(db, api_client_for):
+    conversation = ConversationFactory()
+    client = api_client_for(conversation.participant1)
+    url = f'/api/community/conversations/{conversation.pk}/'
+
+    response = client.get(url)
+    assert response.status_code == 200
+
+    assert client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == 304
@@ -0,0 +1,139 @@
+"""
+The SLA sweep: cases waiting past CASE_SLA_HOURS are escalated once, with
+their list entries, journal, sync change log, sector vet notifications,
+unread counters and push events kept in step.
+"""
+
+from datetime import timedelta
+from django.core.cache import cache
+from django.utils import timezone
+
+from cases.escalation import breaching, escalate_stale_cases
+from cases.models import CaseEscalation, CaseListEntry, CaseReport, CaseStatusTransition
+from notifications import unread
+from notifications.models import Notification
+from realtime.events import _sequence_key
+from sync.models import ChangeLogEntry
+from .factories import CaseReportFactory, FarmerFactory
+
+NOW = timezone.now().replace(microsecond=0)
+
+
+def _case(urgency, waited_hours, status='pending', district='Nyagatare'):
+    """A case of a reporter in `district` that has waited in `status`."""
+    case = CaseReportFactory(
+        reporter=FarmerFactory(district=district), urgency=urgency, status=status,
+        assigned_by=None, assigned_veterinarian=None,
+    )
+    since = NOW - timedelta(hours=waited_hours)
+    if status == 'pending':
+        CaseReport.objects.filter(pk=case.pk).update(reported_at=since)
+    else:
+        CaseReport.objects.filter(pk=case.pk).update(reported_at=since - timedelta(hours=1), assigned_at=since)
+    CaseStatusTransition.objects.filter(case_report=case).update(at=since)
+    return case
+
+
+def _statuses(*cases):
+    return list(CaseReport.objects.filter(pk__in=[c.pk for c in cases]).order_by('pk').values_list('status', flat=True))
+
+
+def test_breach_query_follows_the_sla_by_urgency_and_status(db):
+    urgent_late = _case('urgent', 5)
+    urgent_in_time = _case('urgent', 3)
+    low_in_time = _case('low', 100)
+    reviewed_late = _case('high', 25, status='under_review')
+    reviewed_in_time = _case('high', 23, status='under_review')
+    diagnosed = _case('urgent', 50, status='diagnosed')
+
+    breached = set(CaseReport.objects.filter(breaching(NOW)).values_list('pk', flat=True))
+
+    assert breached == {urgent_late.pk, reviewed_late.pk}
+    assert urgent_in_time.pk not in breached and low_in_time.pk not in breached
+    assert reviewed_in_time.pk not in breached and diagnosed.pk not in breached
+
+
+def test_dry_run_writes_nothing(db):
+    case = _case('urgent', 5)
+
+    result = escalate_stale_cases(now=NOW, dry_run=True)
+
+    assert (result.escalated, result.notifications, result.by_urgency) == (1, 0, {'urgent': 1})
+    assert _statuses(case) == ['pending']
+    assert not CaseEscalation.objects.exists()
+
+
+def test_sweep_escalates_and_records_each_case(db):
+    pending = _case('urgent', 5)
+    reviewed = _case('medium', 80, status='under_review')
+    in_time = _case('medium', 10)
+
+    result = escalate_stale_cases(now=NOW)
+
+    assert (result.escalated, result.by_urgency) == (2, {'urgent': 1, 'medium': 1})
+    assert _statuses(pending, reviewed, in_time) == ['escalated', 'escalated', 'pending']
+    escalations = {e.case_report_id: e for e in CaseEscalation.objects.all()}
+    assert set(escalations) == {pending.pk, reviewed.pk}
+    assert (escalations[pending.pk].from_status, escalations[pending.pk].sla_hours) == ('pending', 4)
+    assert escalations[pending.pk].waiting_since == NOW - timedelta(hours=5)
+    assert (escalations[reviewed.pk].from_status, escalations[reviewed.pk].sla_hours) == ('under_review', 72)
+    assert escalations[reviewed.pk].waiting_since == NOW - timedelta(hours=80)
+
+    # update() skipped the model signals, so the read model and journal are patched
+    entries = dict(CaseListEntry.objects.values_list('case_report_id', 'status'))
+    assert entries == {pending.pk: 'escalated', reviewed.pk: 'escalated', in_time.pk: 'pending'}
+    latest = CaseStatusTransition.objects.filter(case_report=reviewed).latest('at')
+    assert (latest.from_status, latest.to_status, latest.at) == ('under_review', 'escalated', NOW)
+    assert latest.seconds_in_from_status == 80 * 3600
+
+
+def test_sector_vets_get_one_notification_for_their_district(make_user):
+    nyagatare_vet = make_user('sector_vet', district='Nyagatare')
+    gatsibo_vet = make_user('sector_vet', district='Gatsibo')
+    national_vet = make_user('sector_vet', district='')
+    idle_vet = make_user('sector_vet', district='Kirehe')
+    make_user('sector_vet', district='Nyagatare', is_active=False)
+    nyagatare = [_case('urgent', 5), _case('high', 30)]
+    gatsibo = _case('urgent', 6, district='Gatsibo')
+
+    result = escalate_stale_cases(now=NOW)
+
+    assert result.notifications == 3
+    sent = {n.recipient_id: n for n in Notification.objects.filter(title='Cases escalated')}
+    assert set(sent) == {nyagatare_vet.pk, gatsibo_vet.pk, national_vet.pk}
+    assert idle_vet.pk not in sent
+    assert sent[nyagatare_vet.pk].message.startswith('2 case(s)')
+    assert sent[nyagatare_vet.pk].related_case_id is None
+    assert sent[gatsibo_vet.pk].related_case_id == gatsibo.pk
+    assert gatsibo.case_id in sent[gatsibo_vet.pk].message
+    assert sent[national_vet.pk].message.startswith('3 case(s)')
+    assert all(case.case_id in sent[nyagatare_vet.pk].message for case in nyagatare)
+
+
+def test_sweep_logs_changes_and_pushes_notifications(make_user, django_capture_on_commit_callbacks):
+    vet = make_user('sector_vet', district='Nyagatare')
+    case = _case('urgent', 5)
+    assert unread.unread_count(vet.pk) == 0
+    last_change = ChangeLogEntry.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        escalate_stale_cases(now=NOW)
+
+    notification = Notification.objects.get(recipient=vet)
+    changes = set(ChangeLogEntry.objects.filter(pk__gt=last_change).values_list('user_id', 'model', 'object_id'))
+    assert changes == {(case.reporter_id, 'case_report', case.pk), (vet.pk, 'notification', notification.pk)}
+    assert cache.get(unread._cache_key(vet.pk)) == 1
+    assert cache.get(_sequence_key(vet.pk)) == 1
+
+
+def test_a_second_sweep_escalates_nothing(make_user):
+    make_user('sector_vet', district='Nyagatare')
+    _case('urgent', 5)
+    _case('low', 200, status='under_review')
+    assert escalate_stale_cases(now=NOW).escalated == 2
+
+    result = escalate_stale_cases(now=NOW + timedelta(hours=1))
+
+    assert (result.escalated, result.notifications) == (0, 0)
+    assert CaseEscalation.objects.count() == 2
+    assert Notification.objects.filter(title='Cases escalated').count() == 1
@@ -0,0 +1,47 @@
+"""
+Streaming exports: each dataset exports the rows its list endpoint shows the
+requesting user.
+"""
+
+import csv
+import io
+import json
+import pytest
+
+from .factories import CaseReportFactory, FarmerFactory
+
+
+def _content(response):
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+def test_case_export_is_scoped_like_the_case_list(make_user, api_client_for):
+    farmer = make_user('farmer')
+    own = CaseReportFactory(reporter=farmer)
+    CaseReportFactory(reporter=FarmerFactory())
+
+    response = api_client_for(farmer).get('/api/exports/cases.csv')
+
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(_content(response))))
+    assert [row['case_id'] for row in rows] == [own.case_id]
+    assert rows[0]['reporter_phone'] == farmer.phone_number
+    assert rows[0]['livestock_type'] == own.livestock.livestock_type.name
+
+
+@pytest.mark.django_db
+def test_sector_vet_exports_every_case_as_ndjson(make_user, api_client_for):
+    cases = CaseReportFactory.create_batch(3)
+
+    response = api_client_for(make_user('sector_vet')).get('/api/exports/cases.ndjson')
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in _content(response).splitlines()]
+    assert sorted(line['case_id'] for line in lines) == sorted(case.case_id for case in cases)
+
+
+@pytest.mark.django_db
+def test_unknown_dataset_is_404(make_user, api_client_for):
+    response = api_client_for(make_user('admin')).get('/api/exports/unknown.csv')
+    assert response.status_code == 404
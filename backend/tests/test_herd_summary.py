@@ -0,0 +1,210 @@
+"""
+Herd summaries move with each livestock and vaccination change and always
+agree with what rebuild() recomputes from the livestock tables.
+"""
+
+from datetime import date, timedelta
+import pytest
+
+from accounts.models import FarmerProfile
+from livestock import herd
+from livestock.models import HerdSummary, Livestock
+from .factories import CaseReportFactory, FarmerFactory, LivestockFactory, LivestockTypeFactory, VaccinationRecordFactory
+
+TODAY = date.today()
+FIELDS = (
+    'total_livestock', 'by_status', 'by_type', 'expected_deliveries', 'next_expected_delivery',
+    'next_vaccination_due', 'next_vaccination_livestock_id',
+)
+
+
+def _summary(owner):
+    row = HerdSummary.objects.filter(pk=owner.pk).first()
+    return {name: getattr(row, name) for name in FIELDS} if row else None
+
+
+def _assert_rebuilt(*owners):
+    """rebuild() writes back exactly what the incremental updates left."""
+    incremental = {owner.pk: _summary(owner) for owner in owners}
+    herd.rebuild([owner.pk for owner in owners])
+    assert {owner.pk: _summary(owner) for owner in owners} == incremental
+    for owner in owners:
+        assert FarmerProfile.objects.get(user=owner).total_livestock_count == incremental[owner.pk]['total_livestock']
+
+
+def _reload(animal):
+    return Livestock.objects.get(pk=animal.pk)
+
+
+@pytest.fixture
+def farmer(db):
+    return FarmerFactory()
+
+
+@pytest.fixture
+def cattle(db):
+    return LivestockTypeFactory(name='Cattle')
+
+
+def test_new_livestock_is_counted(farmer, cattle):
+    goats = LivestockTypeFactory(name='Goat')
+    LivestockFactory.create_batch(2, owner=farmer, livestock_type=cattle)
+    LivestockFactory(owner=farmer, livestock_type=goats, status='sick')
+
+    summary = _summary(farmer)
+    assert summary['total_livestock'] == 3
+    assert summary['by_status'] == {'healthy': 2, 'sick': 1}
+    assert summary['by_type'] == {str(cattle.pk): 2, str(goats.pk): 1}
+    _assert_rebuilt(farmer)
+
+
+def test_status_moves_animals_out_of_and_back_into_the_herd(farmer, cattle):
+    cow = LivestockFactory(owner=farmer, livestock_type=cattle)
+    LivestockFactory(owner=farmer, livestock_type=cattle)
+
+    cow = _reload(cow)
+    cow.status = 'sold'
+    cow.save()
+    summary = _summary(farmer)
+    assert (summary['total_livestock'], summary['by_type']) == (1, {str(cattle.pk): 1})
+    # Out-of-herd animals are still counted by status
+    assert summary['by_status'] == {'healthy': 1, 'sold': 1}
+    _assert_rebuilt(farmer)
+
+    cow = _reload(cow)
+    cow.status = 'deceased'
+    cow.save()
+    assert _summary(farmer)['by_status'] == {'healthy': 1, 'deceased': 1}
+    assert _summary(farmer)['total_livestock'] == 1
+
+    cow = _reload(cow)
+    cow.status = 'healthy'
+    cow.save()
+    assert _summary(farmer)['total_livestock'] == 2
+    assert _summary(farmer)['by_type'] == {str(cattle.pk): 2}
+    _assert_rebuilt(farmer)
+
+
+def test_owner_change_moves_the_animal_between_herds(farmer, cattle):
+    buyer = FarmerFactory()
+    cow = LivestockFactory(owner=farmer, livestock_type=cattle, is_pregnant=True,
+                           expected_delivery_date=TODAY + timedelta(days=30))
+    VaccinationRecordFactory(livestock=cow, next_due_date=TODAY + timedelta(days=10))
+    LivestockFactory(owner=farmer, livestock_type=cattle)
+
+    cow = _reload(cow)
+    cow.owner = buyer
+    cow.save()
+
+    seller, bought = _summary(farmer), _summary(buyer)
+    assert (seller['total_livestock'], seller['expected_deliveries'], seller['next_expected_delivery']) == (1, 0, None)
+    assert seller['next_vaccination_due'] is None
+    assert (bought['total_livestock'], bought['expected_deliveries']) == (1, 1)
+    assert bought['next_expected_delivery'] == TODAY + timedelta(days=30)
+    assert (bought['next_vaccination_due'], bought['next_vaccination_livestock_id']) == (TODAY + timedelta(days=10), cow.pk)
+    _assert_rebuilt(farmer, buyer)
+
+
+def test_delete_takes_the_animal_off_the_summary(farmer, cattle):
+    early = LivestockFactory(owner=farmer, livestock_type=cattle, is_pregnant=True,
+                             expected_delivery_date=TODAY + timedelta(days=5))
+    later = LivestockFactory(owner=farmer, livestock_type=cattle, is_pregnant=True,
+                             expected_delivery_date=TODAY + timedelta(days=50))
+    VaccinationRecordFactory(livestock=early, next_due_date=TODAY + timedelta(days=3))
+    VaccinationRecordFactory(livestock=later, next_due_date=TODAY + timedelta(days=40))
+
+    _reload(early).delete()
+
+    summary = _summary(farmer)
+    assert (summary['total_livestock'], summary['expected_deliveries']) == (1, 1)
+    assert summary['next_expected_delivery'] == TODAY + timedelta(days=50)
+    assert (summary['next_vaccination_due'], summary['next_vaccination_livestock_id']) == (TODAY + timedelta(days=40), later.pk)
+    _assert_rebuilt(farmer)
+
+    _reload(later).delete()
+    assert _summary(farmer) == {
+        'total_livestock': 0, 'by_status': {}, 'by_type': {}, 'expected_deliveries': 0,
+        'next_expected_delivery': None, 'next_vaccination_due': None, 'next_vaccination_livestock_id': None,
+    }
+    _assert_rebuilt(farmer)
+
+
+def test_delivery_date_changes_move_the_next_delivery(farmer, cattle):
+    cow = LivestockFactory(owner=farmer, livestock_type=cattle)
+    heifer = LivestockFactory(owner=farmer, livestock_type=cattle, is_pregnant=True,
+                              expected_delivery_date=TODAY + timedelta(days=60))
+
+    cow = _reload(cow)
+    cow.is_pregnant = True
+    cow.expected_delivery_date = TODAY + timedelta(days=20)
+    cow.save()
+    assert (_summary(farmer)['expected_deliveries'], _summary(farmer)['next_expected_delivery']) == (2, TODAY + timedelta(days=20))
+
+    cow = _reload(cow)
+    cow.expected_delivery_date = TODAY + timedelta(days=90)
+    cow.save()
+    assert _summary(farmer)['next_expected_delivery'] == TODAY + timedelta(days=60)
+    _assert_rebuilt(farmer)
+
+    # A sold animal's delivery no longer counts
+    heifer = _reload(heifer)
+    heifer.status = 'sold'
+    heifer.save()
+    assert (_summary(farmer)['expected_deliveries'], _summary(farmer)['next_expected_delivery']) == (1, TODAY + timedelta(days=90))
+
+    cow = _reload(cow)
+    cow.is_pregnant = False
+    cow.save()
+    assert (_summary(farmer)['expected_deliveries'], _summary(farmer)['next_expected_delivery']) == (0, None)
+    _assert_rebuilt(farmer)
+
+
+def test_next_vaccination_follows_each_animal_latest_vaccination(farmer, cattle):
+    cow = LivestockFactory(owner=farmer, livestock_type=cattle)
+    goat = LivestockFactory(owner=farmer, livestock_type=cattle)
+    VaccinationRecordFactory(livestock=cow, vaccination_date=TODAY - timedelta(days=200),
+                             next_due_date=TODAY - timedelta(days=20))
+    VaccinationRecordFactory(livestock=goat, next_due_date=TODAY + timedelta(days=30))
+    assert _summary(farmer)['next_vaccination_due'] == TODAY - timedelta(days=20)
+
+    # A later vaccination replaces the overdue one
+    booster = VaccinationRecordFactory(livestock=cow, next_due_date=TODAY + timedelta(days=90))
+    assert (_summary(farmer)['next_vaccination_due'], _summary(farmer)['next_vaccination_livestock_id']) == (TODAY + timedelta(days=30), goat.pk)
+    _assert_rebuilt(farmer)
+
+    booster.delete()
+    assert _summary(farmer)['next_vaccination_livestock_id'] == cow.pk
+    _assert_rebuilt(farmer)
+
+
+def test_rebuild_matches_the_incremental_path_across_farmers(cattle):
+    farmers = FarmerFactory.create_batch(3)
+    for index, owner in enumerate(farmers):
+        for n in range(index + 1):
+            LivestockFactory(owner=owner, livestock_type=cattle, status=('healthy', 'sick', 'sold')[n],
+                             is_pregnant=n == 0, expected_delivery_date=TODAY + timedelta(days=10 * (index + 1)))
+    incremental = {owner.pk: _summary(owner) for owner in farmers}
+    HerdSummary.objects.all().delete()
+    FarmerProfile.objects.update(total_livestock_count=0)
+
+    assert herd.rebuild() == 3
+
+    assert {owner.pk: _summary(owner) for owner in farmers} == incremental
+    assert FarmerProfile.objects.get(user=farmers[2]).total_livestock_count == 2
+
+
+def test_herd_summary_endpoint(farmer, cattle, make_user, api_client_for):
+    LivestockFactory.create_batch(2, owner=farmer, livestock_type=cattle)
+
+    response = api_client_for(farmer).get('/api/livestock/herd_summary/')
+    assert response.status_code == 200
+    assert response.data['total_livestock'] == 2
+    assert response.data['by_type'] == [{'id': cattle.pk, 'name': 'Cattle', 'count': 2}]
+
+    vet = make_user('local_vet')
+    url = f'/api/livestock/herd_summary/?owner_id={farmer.pk}'
+    assert api_client_for(vet).get(url).status_code == 403
+    CaseReportFactory(reporter=farmer, assigned_veterinarian=vet)
+    assert api_client_for(vet).get(url).data['total_livestock'] == 3
+    # Farmers without livestock get an empty summary
+    assert api_client_for(make_user('farmer')).get('/api/livestock/herd_summary/').data['total_livestock'] == 0
@@ -0,0 +1,52 @@
+"""
+Phone and email logins (PhoneOrEmailBackend) hash the password exactly once,
+whether the account exists, the password is wrong or the login succeeds.
+"""
+
+from unittest import mock
+import pytest
+from django.contrib.auth.hashers import MD5PasswordHasher
+
+URL = '/api/auth/login/'
+PASSWORD = 'kigali-2024'
+
+
+@pytest.fixture
+def farmer(make_user, settings):
+    # A fast hasher; the tests count hashes rather than time them
+    settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+    farmer = make_user('farmer', email='keza@example.com')
+    farmer.set_password(PASSWORD)
+    farmer.save()
+    return farmer
+
+
+@pytest.mark.parametrize('payload, expected_status', [
+    ({'phone_number': '{phone}', 'password': PASSWORD}, 200),
+    ({'phone_number': '{phone}', 'password': 'wrong'}, 401),
+    ({'phone_number': '0780000001', 'password': PASSWORD}, 401),
+    ({'email': 'keza@example.com', 'password': PASSWORD}, 200),
+    ({'email': 'keza@example.com', 'password': 'wrong'}, 401),
+    ({'email': 'nobody@example.com', 'password': PASSWORD}, 401),
+])
+def test_each_login_hashes_once(farmer, client, django_assert_max_num_queries, payload, expected_status):
+    payload = {key: value.format(phone=farmer.phone_number) for key, value in payload.items()}
+
+    with mock.patch.object(MD5PasswordHasher, 'encode', autospec=True, side_effect=MD5PasswordHasher.encode) as encode:
+        with django_assert_max_num_queries(3):
+            response = client.post(URL, payload, content_type='application/json')
+
+    assert response.status_code == expected_status
+    assert encode.call_count == 1
+    if expected_status == 200:
+        assert response.json()['user']['id'] == farmer.pk
+
+
+def test_inactive_accounts_are_told_why(farmer, client):
+    farmer.is_active = False
+    farmer.save()
+
+    response = client.post(URL, {'email': 'keza@example.com', 'password': PASSWORD}, content_type='application/json')
+
+    assert response.status_code == 403
+    assert 'deactivated' in response.json()['error']
@@ -0,0 +1,69 @@
+"""
+One-time codes behave the same whether they are kept in a shared cache or,
+without one, in the OTPVerification rows.
+"""
+
+import pytest
+from django.test import override_settings
+
+from accounts import otp
+from accounts.models import OTPVerification
+
+PHONE = '+250788000111'
+
+
+@pytest.fixture(params=[True, False], ids=['cache', 'database'])
+def store(request, db):
+    with override_settings(OTP_CACHE_CODES=request.param):
+        yield request.param
+
+
+def test_code_is_single_use(store):
+    code = otp.issue_code('verify', PHONE)
+
+    assert otp.check_code('verify', PHONE, code, consume=False)
+    assert otp.check_code('verify', PHONE, code)
+    assert not otp.check_code('verify', PHONE, code)
+    assert OTPVerification.objects.get(phone_number=PHONE).is_used
+
+
+def test_new_code_replaces_the_previous_one(store):
+    first = otp.issue_code('password_reset', PHONE)
+    second = otp.issue_code('password_reset', PHONE)
+
+    if first != second:
+        assert not otp.check_code('password_reset', PHONE, first, consume=False)
+    assert otp.check_code('password_reset', PHONE, second)
+
+
+def test_codes_are_kept_per_purpose(store):
+    code = otp.issue_code('verify', PHONE)
+    assert not otp.check_code('password_reset', PHONE, code)
+
+
+def test_wrong_guesses_void_the_code(store):
+    code = otp.issue_code('verify', PHONE)
+    wrong = '000000' if code != '000000' else '111111'
+
+    for _ in range(otp.OTP_MAX_ATTEMPTS - 1):
+        assert not otp.check_code('verify', PHONE, wrong)
+    with pytest.raises(otp.OTPRateLimited):
+        otp.check_code('verify', PHONE, wrong)
+    assert not otp.check_code('verify', PHONE, code)
+
+
+def test_sends_are_limited_per_window(store):
+    for _ in range(otp.OTP_MAX_SENDS):
+        otp.issue_code('verify', PHONE)
+    with pytest.raises(otp.OTPRateLimited):
+        otp.issue_code('verify', PHONE)
+    otp.issue_code('verify', '+250788000222')
+
+
+def test_database_store_survives_the_cache(db):
+    # A per-process cache is empty in the worker that checks the code
+    from django.core.cache import cache
+    with override_settings(OTP_CACHE_CODES=False):
+        code = otp.issue_code('verify', PHONE)
+        cache.clear()
+        assert otp.check_code('verify', PHONE, code)
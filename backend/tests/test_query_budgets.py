@@ -0,0 +1,204 @@
+"""
+Query budgets: list and retrieve endpoints must run the same number of
+queries whatever the number of rows they serialize.
+
+Each endpoint is seeded with N rows the requesting user may see, requested,
+seeded with 9N more and requested again. A different query count means a
+serializer field or queryset hits the database per row; the failure lists
+the statements that were repeated.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+import pytest
+
+from accounts.models import User
+from community.models import Conversation
+from .factories import (
+    UserFactory, FarmerFactory, LocalVetFactory, LivestockTypeFactory, BreedFactory,
+    LivestockFactory, HealthRecordFactory, VaccinationRecordFactory, DiseaseFactory,
+    CaseReportFactory, PostFactory, CommentFactory, PostLikeFactory, ConversationFactory,
+    MessageFactory, CategoryFactory, ProductFactory, NotificationFactory, BroadcastMessageFactory,
+)
+from .queries import capture_queries, query_diff
+
+N = 2
+SCALE = 10
+
+USER_TYPES = [code for code, label in User.USER_TYPE_CHOICES]
+MANAGERS = ('sector_vet', 'admin')
+
+
+@dataclass
+class Endpoint:
+    name: str
+    url: str
+    # seed(viewer, n) creates n rows and returns the pks of those the viewer may retrieve
+    seed: Callable
+    # User types that see the seeded rows; the others must still get a 200
+    visible_to: tuple = tuple(USER_TYPES)
+    params: Optional[Callable] = None
+    detail: bool = True
+    marks: list = field(default_factory=list)
+
+    def query_params(self, viewer):
+        return self.params(viewer) if self.params else {}
+
+
+def pks(objects):
+    return [obj.pk for obj in objects]
+
+
+def seed_users(viewer, n):
+    approver = UserFactory(user_type='sector_vet')
+    farmers = FarmerFactory.create_batch(n - n // 2, approved_by=approver)
+    vets = LocalVetFactory.create_batch(n // 2, approved_by=approver)
+    return pks(farmers + vets)
+
+
+def seed_farmers(viewer, n):
+    return pks(FarmerFactory.create_batch(n, approved_by=UserFactory(user_type='sector_vet')))
+
+
+def seed_veterinarians(viewer, n):
+    return pks(LocalVetFactory.create_batch(n, approved_by=UserFactory(user_type='sector_vet')))
+
+
+def seed_cases(viewer, n):
+    if viewer.user_type == 'farmer':
+        kwargs = {'reporter': viewer}
+    elif viewer.user_type in ('local_vet', 'field_officer'):
+        kwargs = {'assigned_veterinarian': viewer}
+    else:
+        kwargs = {}
+    return pks(CaseReportFactory.create_batch(n, **kwargs))
+
+
+def seed_livestock(viewer, n):
+    if viewer.user_type == 'local_vet':
+        # Local vets see the animals of cases assigned to them
+        return [case.livestock_id for case in CaseReportFactory.create_batch(n, assigned_veterinarian=viewer)]
+    if viewer.user_type in MANAGERS:
+        return pks(LivestockFactory.create_batch(n))
+    return pks(LivestockFactory.create_batch(n, owner=viewer))
+
+
+def seed_posts(viewer, n):
+    posts = PostFactory.create_batch(n)
+    for post in posts:
+        CommentFactory(post=post)
+        PostLikeFactory(post=post, user=viewer)
+    # The first post's comment thread grows too, for the retrieve budget
+    hub = type(posts[0]).objects.order_by('pk').first()
+    CommentFactory.create_batch(n, post=hub)
+    return pks(posts)
+
+
+def _hub_conversation(viewer):
+    return Conversation.objects.filter(participant1=viewer).order_by('pk').first()
+
+
+def seed_conversations(viewer, n):
+    conversations = ConversationFactory.create_batch(n, participant1=viewer)
+    for conversation in conversations:
+        MessageFactory.create_batch(2, conversation=conversation)
+    MessageFactory.create_batch(n, conversation=_hub_conversation(viewer))
+    return pks(conversations)
+
+
+def seed_messages(viewer, n):
+    conversation = _hub_conversation(viewer) or ConversationFactory(participant1=viewer)
+    return pks(MessageFactory.create_batch(n, conversation=conversation))
+
+
+def seed_notifications(viewer, n):
+    return pks(NotificationFactory.create_batch(n, recipient=viewer))
+
+
+def batch(factory):
+    return lambda viewer, n: pks(factory.create_batch(n))
+
+
+ENDPOINTS = [
+    Endpoint('users', '/api/users/', seed_users),
+    Endpoint('farmers', '/api/farmers/', seed_farmers),
+    Endpoint('veterinarians', '/api/veterinarians/', seed_veterinarians),
+    Endpoint('cases', '/api/cases/reports/', seed_cases),
+    Endpoint('diseases', '/api/cases/diseases/', batch(DiseaseFactory)),
+    Endpoint('livestock', '/api/livestock/', seed_livestock),
+    Endpoint('livestock-types', '/api/livestock/types/', batch(LivestockTypeFactory)),
+    Endpoint('breeds', '/api/livestock/breeds/', batch(BreedFactory)),
+    # Only reachable nested under an animal, which no route provides yet
+    Endpoint('health-records', '/api/livestock/health-records/', batch(HealthRecordFactory), visible_to=(), detail=False),
+    Endpoint('vaccinations', '/api/livestock/vaccinations/', batch(VaccinationRecordFactory), visible_to=(), detail=False),
+    Endpoint('posts', '/api/community/posts/', seed_posts),
+    Endpoint('comments', '/api/community/comments/', batch(CommentFactory)),
+    Endpoint('conversations', '/api/community/conversations/', seed_conversations),
+    Endpoint('messages', '/api/community/messages/', seed_messages,
+             params=lambda viewer: {'conversation_id': _hub_conversation(viewer).pk}),
+    Endpoint('products', '/api/marketplace/products/', batch(ProductFactory)),
+    Endpoint('categories', '/api/marketplace/categories/', batch(CategoryFactory)),
+    Endpoint('notifications', '/api/notifications/', seed_notifications),
+    Endpoint('broadcasts', '/api/broadcasts/', batch(BroadcastMessageFactory), visible_to=MANAGERS),
+]
+
+
+def _cases(detail):
+    for endpoint in ENDPOINTS:
+        if detail and not endpoint.detail:
+            continue
+        for user_type in USER_TYPES:
+            if detail and user_type not in endpoint.visible_to:
+                continue
+            yield pytest.param(endpoint, user_type, id=f'{endpoint.name}-{user_type}', marks=endpoint.marks)
+
+
+def _get(client, url, params):
+    response = client.get(url, params)
+    assert response.status_code == 200, f'GET {url} returned {response.status_code}: {response.content[:500]}'
+    return response
+
+
+def _size(data):
+    return data['count'] if isinstance(data, dict) and 'count' in data else len(data)
+
+
+def _assert_same_queries(small, large, label):
+    if len(large) != len(small):
+        pytest.fail(f'{label}: {query_diff(small, large)}', pytrace=False)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('endpoint,user_type', list(_cases(detail=False)))
+def test_list_queries_do_not_grow_with_rows(endpoint, user_type, make_user, api_client_for):
+    viewer = make_user(user_type)
+    client = api_client_for(viewer)
+
+    endpoint.seed(viewer, N)
+    small_response, small = capture_queries(
+        lambda: _get(client, endpoint.url, endpoint.query_params(viewer))
+    )
+    endpoint.seed(viewer, N * (SCALE - 1))
+    large_response, large = capture_queries(
+        lambda: _get(client, endpoint.url, endpoint.query_params(viewer))
+    )
+
+    if user_type in endpoint.visible_to:
+        # Guard against comparing two empty pages
+        assert _size(large_response.json()) > _size(small_response.json()) > 0
+    _assert_same_queries(small, large, f'GET {endpoint.url} as {user_type}')
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('endpoint,user_type', list(_cases(detail=True)))
+def test_retrieve_queries_do_not_grow_with_rows(endpoint, user_type, make_user, api_client_for):
+    viewer = make_user(user_type)
+    client = api_client_for(viewer)
+
+    pk = endpoint.seed(viewer, N)[0]
+    url = f'{endpoint.url}{pk}/'
+    _, small = capture_queries(lambda: _get(client, url, endpoint.query_params(viewer)))
+    endpoint.seed(viewer, N * (SCALE - 1))
+    _, large = capture_queries(lambda: _get(client, url, endpoint.query_params(viewer)))
+
+    _assert_same_queries(small, large, f'GET {url} as {user_type}')
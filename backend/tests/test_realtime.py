@@ -0,0 +1,87 @@
+"""
+Realtime endpoints authenticate with the JWT header or, for EventSource,
+a short-lived stream ticket in the URL; never with the access token there.
+"""
+
+import asyncio
+import time
+from unittest import mock
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from accounts.authentication import ClaimsRefreshToken
+from realtime.tickets import REALTIME_TICKET_SECONDS
+
+
+@pytest.fixture
+def farmer(make_user):
+    return make_user('farmer')
+
+
+def _ticket(api_client_for, user):
+    response = api_client_for(user).post('/api/realtime/ticket/')
+    assert response.status_code == 200
+    return response.json()['ticket']
+
+
+def test_stream_opens_with_a_ticket(farmer, api_client_for, client):
+    ticket = _ticket(api_client_for, farmer)
+
+    response = client.get('/api/realtime/stream/', {'ticket': ticket})
+
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'text/event-stream'
+
+
+def test_poll_accepts_a_ticket(farmer, api_client_for, client):
+    response = client.get('/api/realtime/poll/', {'ticket': _ticket(api_client_for, farmer)})
+    assert response.status_code == 200
+    assert 'last_event_id' in response.json()
+
+
+@pytest.mark.parametrize('timeout', ['nan', 'inf', 'soon'])
+def test_poll_refuses_a_timeout_that_is_not_a_finite_number(farmer, api_client_for, timeout):
+    ticket = _ticket(api_client_for, farmer)
+
+    async def poll():
+        # Under ASGI the poll waits, so a nan deadline would never pass
+        return await asyncio.wait_for(
+            AsyncClient().get('/api/realtime/poll/', {'ticket': ticket, 'since': '0', 'timeout': timeout}), 5
+        )
+
+    response = async_to_sync(poll)()
+    assert response.status_code == 400
+    assert response.json() == {'error': 'timeout must be a number of seconds.'}
+
+
+def test_poll_waits_out_a_short_timeout(farmer, api_client_for):
+    ticket = _ticket(api_client_for, farmer)
+
+    async def poll():
+        return await asyncio.wait_for(
+            AsyncClient().get('/api/realtime/poll/', {'ticket': ticket, 'since': '0', 'timeout': '0.2'}), 5
+        )
+
+    response = async_to_sync(poll)()
+    assert response.status_code == 200
+    assert response.json() == {'events': [], 'last_event_id': 0}
+
+
+def test_access_token_in_the_url_is_refused(farmer, client):
+    token = str(ClaimsRefreshToken.for_user(farmer).access_token)
+    assert client.get('/api/realtime/stream/', {'access_token': token}).status_code == 401
+    # Nor is an access token accepted as a ticket
+    assert client.get('/api/realtime/stream/', {'ticket': token}).status_code == 401
+
+
+def test_tickets_expire(farmer, api_client_for, client):
+    ticket = _ticket(api_client_for, farmer)
+    later = time.time() + REALTIME_TICKET_SECONDS + 1
+    with mock.patch('django.core.signing.time.time', return_value=later):
+        assert client.get('/api/realtime/stream/', {'ticket': ticket}).status_code == 401
+
+
+def test_ticket_needs_a_bearer_token(client, db):
+    assert client.post('/api/realtime/ticket/').status_code == 401
+    assert client.get('/api/realtime/ticket/').status_code == 405
@@ -0,0 +1,64 @@
+"""
+Reference lists and the bundle follow the generation row in the database,
+so a change made in one worker reaches the others without a shared cache.
+"""
+
+import pytest
+
+from livestock.models import LivestockType
+from reference import bundle, data
+from reference.models import ReferenceGeneration
+from .factories import BreedFactory, LivestockTypeFactory
+
+
+def _type_names():
+    return [row['name'] for row in data.rows('livestock_types')]
+
+
+@pytest.mark.django_db
+def test_reference_changes_bump_the_generation():
+    start = data.generation()
+    livestock_type = LivestockTypeFactory(name='Cattle')
+    assert data.generation() > start
+
+    before = data.generation()
+    BreedFactory(livestock_type=livestock_type)
+    assert data.generation() > before
+
+
+@pytest.mark.django_db
+def test_rows_follow_a_change_committed_by_another_worker():
+    LivestockTypeFactory(name='Cattle')
+    assert _type_names() == ['Cattle']
+
+    # Another worker's change (bulk_create sends no signals here), then its
+    # generation bump; this worker's cache still holds the old rows
+    LivestockType.objects.bulk_create([LivestockType(name='Goat')])
+    assert _type_names() == ['Cattle']
+    ReferenceGeneration.objects.update(value=data.generation() + 1)
+
+    assert _type_names() == ['Cattle', 'Goat']
+
+
+@pytest.mark.django_db
+def test_bundle_is_rebuilt_for_a_new_generation():
+    LivestockTypeFactory(name='Cattle')
+    first = bundle.current_bundle()
+    assert bundle.current_bundle() is first
+
+    ReferenceGeneration.objects.update(value=first.generation + 1)
+    LivestockType.objects.bulk_create([LivestockType(name='Goat')])
+    rebuilt = bundle.current_bundle()
+
+    assert rebuilt is not first
+    assert rebuilt.version != first.version
+
+
+@pytest.mark.django_db
+def test_unchanged_bundle_revalidates_with_one_query(client, django_assert_num_queries):
+    LivestockTypeFactory(name='Cattle')
+    etag = client.get('/api/reference/')['ETag']
+
+    with django_assert_num_queries(1):
+        response = client.get('/api/reference/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
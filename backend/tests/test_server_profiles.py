@@ -0,0 +1,75 @@
+"""
+The I/O-bound endpoints are DRF views by default and plain async views under
+the asgi server profile, with the same responses either way.
+"""
+
+import importlib
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import clear_url_caches, resolve
+from rest_framework.views import APIView
+
+from .factories import NotificationFactory
+
+URLCONFS = ('weather.urls', 'files.urls', 'notifications.urls', 'animalguardian.urls')
+
+
+def _reload_urls():
+    for name in URLCONFS:
+        importlib.reload(importlib.import_module(name))
+    clear_url_caches()
+
+
+@pytest.fixture(params=['gthread', 'asgi'])
+def profile(request, settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    with override_settings(SERVER_PROFILE=request.param):
+        _reload_urls()
+        yield request.param
+    _reload_urls()
+
+
+def test_views_follow_the_profile(profile):
+    drf = profile != 'asgi'
+    for url in ('/api/weather/', '/api/files/upload/', '/api/notifications/unread_count/'):
+        view = resolve(url).func
+        assert bool(getattr(view, 'cls', None) and issubclass(view.cls, APIView)) == drf, url
+
+
+def test_weather(profile, make_user, api_client_for):
+    client = api_client_for(make_user('farmer'))
+    response = client.get('/api/weather/', {'lat': '-2', 'lon': '29.5'})
+    assert response.status_code == 200
+    assert response.json()['location'] == {'city': 'Kigali', 'country': 'Rwanda', 'lat': -2.0, 'lon': 29.5}
+    assert client.get('/api/weather/', {'lat': 'north'}).status_code == 400
+
+
+def test_upload(profile, make_user, api_client_for):
+    client = api_client_for(make_user('farmer'))
+    image = SimpleUploadedFile('cow.png', b'\x89PNG\r\n', content_type='image/png')
+    response = client.post('/api/files/upload/', {'file': image, 'type': 'image', 'related_object': 'case'})
+    assert response.status_code == 201
+    assert response.json()['file_size'] == 6
+    assert response.json()['related_object'] == 'case'
+
+    text = SimpleUploadedFile('notes.txt', b'hello', content_type='text/plain')
+    response = client.post('/api/files/upload/', {'file': text, 'type': 'image'})
+    assert response.status_code == 400
+    assert response.json()['error'].startswith('Invalid image type.')
+
+
+def test_notifications(profile, make_user, api_client_for):
+    farmer = make_user('farmer')
+    NotificationFactory.create_batch(2, recipient=farmer, status='sent')
+    client = api_client_for(farmer)
+
+    listed = client.get('/api/notifications/')
+    assert listed.status_code == 200
+    assert listed.json()['count'] == 2
+    assert client.get('/api/notifications/unread_count/').json() == {'unread_count': 2}
+
+
+def test_anonymous_requests_are_refused(profile, client, db):
+    assert client.get('/api/weather/').status_code == 401
+    assert client.get('/api/notifications/unread_count/').status_code == 401
@@ -0,0 +1,141 @@
+"""
+Offline mutation batches (POST /api/sync/batch/): replayed keys answer from
+the key store, $ref links records created offline, and a constraint failure
+falls back to per-row savepoints so only the offending row is refused.
+"""
+
+from datetime import date, timedelta
+import pytest
+
+from cases.models import CaseListEntry, CaseReport, CaseStatusTransition
+from livestock.models import HerdSummary, Livestock, VaccinationRecord
+from sync.models import ChangeLogEntry, IdempotencyKey
+from .factories import LivestockFactory, LivestockTypeFactory
+
+URL = '/api/sync/batch/'
+
+
+@pytest.fixture
+def farmer(make_user):
+    return make_user('farmer')
+
+
+@pytest.fixture
+def cattle(db):
+    return LivestockTypeFactory(name='Cattle')
+
+
+@pytest.fixture
+def send(farmer, api_client_for):
+    client = api_client_for(farmer)
+
+    def send(*mutations):
+        response = client.post(URL, {'mutations': list(mutations)}, format='json')
+        assert response.status_code == 200, response.data
+        return response.data['results']
+    return send
+
+
+def _animal(key, cattle, **data):
+    return {'key': key, 'type': 'livestock.create', 'data': {'livestock_type_id': cattle.pk, 'gender': 'F', **data}}
+
+
+def _case(key, livestock_id):
+    return {'key': key, 'type': 'case_report.create', 'data': {
+        'livestock_id': livestock_id, 'symptoms_observed': 'Not eating', 'urgency': 'high',
+    }}
+
+
+def test_replayed_keys_answer_the_stored_outcome(farmer, cattle, send):
+    first = send(_animal('cow-1', cattle, name='Keza'))
+    assert (first[0]['status'], first[0]['replayed']) == (201, False)
+    assert first[0]['data']['name'] == 'Keza'
+
+    again = send(_animal('cow-1', cattle, name='Keza'), _animal('cow-2', cattle))
+
+    assert again[0] == {'key': 'cow-1', 'type': 'livestock.create', 'status': 201, 'id': first[0]['id'], 'replayed': True}
+    assert (again[1]['status'], again[1]['replayed']) == (201, False)
+    assert Livestock.objects.filter(owner=farmer).count() == 2
+    assert IdempotencyKey.objects.filter(user=farmer).count() == 2
+
+
+def test_refused_mutations_can_be_resent_under_the_same_key(farmer, cattle, send):
+    refused = send({'key': 'cow-1', 'type': 'livestock.create', 'data': {'gender': 'X'}})
+    assert refused[0]['status'] == 400
+    assert not IdempotencyKey.objects.filter(user=farmer).exists()
+
+    assert send(_animal('cow-1', cattle))[0]['status'] == 201
+
+
+def test_malformed_mutations_are_refused_one_by_one(cattle, send):
+    results = send(
+        {'type': 'livestock.create', 'data': {}},
+        {'key': 'a', 'type': 'livestock.delete', 'data': {}},
+        {'key': 'b', 'type': 'livestock.create', 'data': 'cow'},
+        _animal('c', cattle),
+        _animal('c', cattle),
+    )
+    assert [result['status'] for result in results] == [400, 400, 400, 201, 400]
+    assert results[4]['errors'] == {'key': ['Duplicate key in batch.']}
+
+
+def test_refs_link_records_created_offline(farmer, cattle, send):
+    results = send(
+        # Queued before the animal; stages insert livestock first
+        _case('case-1', {'$ref': 'cow-1'}),
+        {'key': 'vac-1', 'type': 'vaccination.create', 'data': {
+            'livestock': {'$ref': 'cow-1'}, 'vaccine_name': 'FMD',
+            'vaccination_date': str(date.today()), 'next_due_date': str(date.today() + timedelta(days=90)),
+        }},
+        _animal('cow-1', cattle),
+    )
+    assert [result['status'] for result in results] == [201, 201, 201]
+    cow_id = results[2]['id']
+    case = CaseReport.objects.get(pk=results[0]['id'])
+    assert (case.livestock_id, case.reporter_id) == (cow_id, farmer.pk)
+    assert case.case_id.startswith('CR')
+    assert VaccinationRecord.objects.get(pk=results[1]['id']).livestock_id == cow_id
+
+    # bulk_create skipped the signals, so the batch kept the derived rows itself
+    assert CaseListEntry.objects.get(pk=case.pk).livestock_id == cow_id
+    assert CaseStatusTransition.objects.filter(case_report=case, to_status='pending').exists()
+    summary = HerdSummary.objects.get(pk=farmer.pk)
+    assert (summary.total_livestock, summary.next_vaccination_livestock_id) == (1, cow_id)
+    assert set(ChangeLogEntry.objects.filter(user=farmer).values_list('model', 'object_id')) >= {
+        ('livestock', cow_id), ('case_report', case.pk), ('vaccination', results[1]['id']),
+    }
+
+    # A later batch may reference a key stored earlier
+    later = send(_case('case-2', {'$ref': 'cow-1'}), _case('case-3', {'$ref': 'cow-9'}))
+    assert later[0]['status'] == 201
+    assert CaseReport.objects.get(pk=later[0]['id']).livestock_id == cow_id
+    assert later[1] == {
+        'key': 'case-3', 'type': 'case_report.create', 'status': 400,
+        'errors': {'livestock_id': ['Unknown reference "cow-9".']},
+    }
+
+
+def test_records_for_someone_elses_animal_are_refused(cattle, send):
+    other = LivestockFactory(livestock_type=cattle)
+
+    result = send(_case('case-1', other.pk))[0]
+
+    assert (result['status'], result['errors']) == (400, {'livestock': ['Livestock not found.']})
+    assert not CaseReport.objects.filter(livestock=other).exists()
+
+
+def test_a_conflicting_row_falls_back_to_per_row_savepoints(farmer, cattle, send):
+    results = send(
+        _animal('cow-1', cattle, tag_number='RW-001'),
+        _animal('cow-2', cattle, tag_number='RW-001'),
+        _animal('cow-3', cattle, tag_number='RW-003'),
+        _case('case-1', {'$ref': 'cow-3'}),
+    )
+
+    assert [result['status'] for result in results] == [201, 409, 201, 201]
+    assert results[1]['errors']['error'] == 'Conflicts with an existing record.'
+    assert sorted(Livestock.objects.filter(owner=farmer).values_list('tag_number', flat=True)) == ['RW-001', 'RW-003']
+    assert HerdSummary.objects.get(pk=farmer.pk).total_livestock == 2
+    # Only the applied mutations are remembered; the conflicting one can be corrected
+    assert set(IdempotencyKey.objects.filter(user=farmer).values_list('key', flat=True)) == {'cow-1', 'cow-3', 'case-1'}
+    assert send(_animal('cow-2', cattle, tag_number='RW-002'))[0]['status'] == 201
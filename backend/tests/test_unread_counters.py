@@ -0,0 +1,88 @@
+"""
+Cached unread counters: moved by adjust() once the transaction commits,
+rebuilt from the notifications table when missing, and never left stale by
+an adjustment that lands while they are rebuilt.
+"""
+
+from unittest import mock
+import pytest
+from django.core.cache import cache
+
+from notifications import unread
+from .factories import NotificationFactory
+
+
+@pytest.fixture
+def farmer(make_user):
+    return make_user('farmer')
+
+
+def _cached(user):
+    return cache.get(unread._cache_key(user.id))
+
+
+def test_missing_counter_is_rebuilt_from_the_table(farmer):
+    NotificationFactory.create_batch(2, recipient=farmer, status='sent')
+    NotificationFactory(recipient=farmer, status='read')
+    cache.clear()
+
+    assert unread.unread_count(farmer.id) == 2
+    assert _cached(farmer) == 2
+
+
+def test_adjust_applies_on_commit(farmer, django_capture_on_commit_callbacks):
+    assert unread.unread_count(farmer.id) == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        unread.adjust({farmer.id: 3})
+        assert _cached(farmer) == 0
+    assert _cached(farmer) == 3
+
+    with django_capture_on_commit_callbacks(execute=True):
+        unread.adjust({farmer.id: -1})
+    assert unread.unread_count(farmer.id) == 2
+
+
+def test_adjust_never_creates_or_drives_a_counter_negative(farmer, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        unread.adjust({farmer.id: 1})
+    assert _cached(farmer) is None
+
+    unread.unread_count(farmer.id)
+    with django_capture_on_commit_callbacks(execute=True):
+        unread.adjust({farmer.id: -1})
+    # Drifted below zero: dropped, and recounted on the next read
+    assert _cached(farmer) is None
+    assert unread.unread_count(farmer.id) == 0
+
+
+def test_adjustment_during_a_rebuild_is_not_lost(farmer):
+    NotificationFactory(recipient=farmer, status='sent')
+    cache.clear()
+    count = unread._count
+
+    def count_then_concurrent_write(user_id):
+        counted = count(user_id)
+        # Another request commits a notification after this count was taken;
+        # its adjustment finds no counter to move
+        NotificationFactory(recipient=farmer, status='sent')
+        unread._apply({farmer.id: 1})
+        return counted
+
+    with mock.patch.object(unread, '_count', side_effect=count_then_concurrent_write):
+        assert unread.unread_count(farmer.id) == 1
+
+    assert unread.unread_count(farmer.id) == 2
+
+
+def test_notification_endpoints_keep_the_counter(farmer, api_client_for, django_capture_on_commit_callbacks):
+    notifications = NotificationFactory.create_batch(3, recipient=farmer, status='sent')
+    client = api_client_for(farmer)
+    assert client.get('/api/notifications/unread_count/').json() == {'unread_count': 3}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        client.patch(f'/api/notifications/{notifications[0].pk}/mark_as_read/')
+    assert _cached(farmer) == 2
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post('/api/notifications/mark_all_read/')
+    assert client.get('/api/notifications/unread_count/').json() == {'unread_count': 0}
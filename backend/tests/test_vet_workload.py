@@ -0,0 +1,115 @@
+"""
+Vet case counters (VetWorkload) move with each case change and always
+agree with what reconcile() recomputes from the cases.
+"""
+
+import pytest
+
+from accounts.models import VeterinarianProfile
+from cases import workload
+from cases.models import CaseReport, VetWorkload
+from .factories import CaseReportFactory, LocalVetFactory
+
+COUNTERS = ('open_cases', 'cases_handled', 'confirmed_completions', 'resolved_this_month', 'resolutions_timed')
+
+
+def _counters(vet):
+    row = VetWorkload.objects.filter(pk=vet.pk).first()
+    return {name: getattr(row, name) if row else 0 for name in COUNTERS}
+
+
+def _online_vet():
+    return LocalVetFactory(vet_profile__is_available=True)
+
+
+def _assert_reconciled():
+    # The incremental counters need no correction
+    assert workload.reconcile() == 0
+
+
+@pytest.fixture
+def sector_vet(make_user):
+    return make_user('sector_vet')
+
+
+@pytest.fixture
+def case(db):
+    return CaseReportFactory(assigned_veterinarian=None, assigned_by=None, status='pending')
+
+
+def test_assign_and_unassign_move_the_open_case(case, sector_vet, api_client_for):
+    vet, other = _online_vet(), _online_vet()
+    client = api_client_for(sector_vet)
+
+    response = client.post(f'/api/cases/reports/{case.pk}/assign/', {'veterinarian_id': vet.pk})
+    assert response.status_code == 200
+    assert _counters(vet)['open_cases'] == 1
+
+    reassigned = CaseReport.objects.get(pk=case.pk)
+    reassigned.assigned_veterinarian = other
+    reassigned.save()
+    assert _counters(vet)['open_cases'] == 0
+    assert _counters(other)['open_cases'] == 1
+
+    response = client.post(f'/api/cases/reports/{case.pk}/unassign/')
+    assert response.status_code == 200
+    assert _counters(other)['open_cases'] == 0
+    _assert_reconciled()
+
+
+def test_resolve_and_confirm_count_for_the_vet(case, sector_vet, api_client_for):
+    vet = _online_vet()
+    api_client_for(sector_vet).post(f'/api/cases/reports/{case.pk}/assign/', {'veterinarian_id': vet.pk})
+
+    response = api_client_for(vet).patch(f'/api/cases/reports/{case.pk}/', {'status': 'resolved'}, format='json')
+    assert response.status_code == 200
+    assert _counters(vet) == {
+        'open_cases': 0, 'cases_handled': 1, 'confirmed_completions': 0,
+        'resolved_this_month': 1, 'resolutions_timed': 1,
+    }
+    assert VeterinarianProfile.objects.get(user=vet).total_cases_handled == 1
+
+    response = api_client_for(case.reporter).post(f'/api/cases/reports/{case.pk}/confirm_completion/')
+    assert response.status_code == 200
+    assert _counters(vet)['confirmed_completions'] == 1
+    _assert_reconciled()
+
+    reopened = CaseReport.objects.get(pk=case.pk)
+    reopened.status = 'under_review'
+    reopened.save()
+    assert _counters(vet)['cases_handled'] == 0
+    assert _counters(vet)['resolved_this_month'] == 0
+    assert _counters(vet)['open_cases'] == 1
+    _assert_reconciled()
+
+
+def test_deleting_a_case_takes_it_off_the_counters(db):
+    vet = LocalVetFactory()
+    open_case = CaseReportFactory(assigned_veterinarian=vet, status='under_review')
+    resolved = CaseReportFactory(assigned_veterinarian=vet, status='under_review')
+    resolved.status = 'resolved'
+    resolved.save()
+    assert _counters(vet)['open_cases'] == 1
+    assert _counters(vet)['resolved_this_month'] == 1
+
+    CaseReport.objects.get(pk=open_case.pk).delete()
+    CaseReport.objects.get(pk=resolved.pk).delete()
+
+    assert _counters(vet) == dict.fromkeys(COUNTERS, 0)
+    assert VetWorkload.objects.get(pk=vet.pk).resolution_seconds == 0
+    _assert_reconciled()
+
+
+def test_reconcile_corrects_drift(db):
+    vet = LocalVetFactory()
+    CaseReportFactory.create_batch(2, assigned_veterinarian=vet, status='under_review')
+    VetWorkload.objects.filter(pk=vet.pk).update(open_cases=7, cases_handled=3)
+    stale = LocalVetFactory()
+    VetWorkload.objects.create(veterinarian=stale, open_cases=4, updated_at=vet.date_joined)
+
+    assert workload.reconcile() == 2
+
+    assert _counters(vet)['open_cases'] == 2
+    assert _counters(vet)['cases_handled'] == 0
+    assert _counters(stale)['open_cases'] == 0
+    _assert_reconciled()
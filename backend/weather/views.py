@@ -1,27 +1,21 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-import requests
-from django.conf import settings
+from rest_framework import status
+from django.http import HttpResponseNotAllowed, JsonResponse
+from accounts.authentication import async_jwt_required
 
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def weather_current(request):
-    """Get current weather information."""
-    
-    # Default location (Kigali, Rwanda) - can be customized based on user location
-    lat = request.query_params.get('lat', '-1.9441')
-    lon = request.query_params.get('lon', '30.0619')
-    
+def current_weather(lat, lon):
+    """Current conditions, short forecast and livestock advice for a location."""
     # For now, return mock data since we don't have a weather API key
     # In production, integrate with OpenWeatherMap or similar service
-    weather_data = {
+    return {
         'location': {
             'city': 'Kigali',
             'country': 'Rwanda',
-            'lat': float(lat),
-            'lon': float(lon),
+            'lat': lat,
+            'lon': lon,
         },
         'current': {
             'temperature': 22,
@@ -52,6 +46,39 @@ def weather_current(request):
             'disease_risk': 'Low risk of weather-related diseases.',
         },
     }
+
+
+def _location(params):
+    """(lat, lon) of the request; Kigali, Rwanda by default."""
+    return float(params.get('lat', '-1.9441')), float(params.get('lon', '30.0619'))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def weather_current(request):
+    """Get current weather information."""
+    try:
+        lat, lon = _location(request.query_params)
+    except ValueError:
+        return Response({'error': 'lat and lon must be numbers.'}, status=status.HTTP_400_BAD_REQUEST)
     
-    return Response(weather_data)
+    return Response(current_weather(lat, lon))
 
+
+@async_jwt_required
+async def weather_current_async(request):
+    """weather_current for the asgi server profile.
+
+    Async so that a slow upstream weather API will not hold a worker thread
+    under asgi.py.
+    """
+    # require_GET only wraps async views from Django 5.0
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    try:
+        lat, lon = _location(request.GET)
+    except ValueError:
+        return JsonResponse({'error': 'lat and lon must be numbers.'}, status=400)
+    
+    return JsonResponse(current_weather(lat, lon))